@@ -0,0 +1,234 @@
+"""
+Banc d'essai de bout en bout hors ligne: Proxycurl et Gemini sont remplacés par des serveurs
+HTTP locaux (benchmarks/stand_ins.py) qui rejouent des réponses enregistrées
+
+Usage:
+    python benchmarks/e2e_benchmark.py
+    python benchmarks/e2e_benchmark.py --profiles 100 --concurrency 1,8,32 --gemini-latency 1.5 --error-rate 0.02
+    python benchmarks/e2e_benchmark.py --targets process_multiple_profiles --json
+
+Pour chaque cible et chaque niveau de concurrence, le banc d'essai mesure la latence de
+chaque profil (p50/p95/p99) et le débit global (profils par seconde). Les caches sont
+placés dans un dossier temporaire et vidés avant chaque mesure.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("PROXYCURL_API_KEY", "benchmark")
+
+from stand_ins import (  # noqa: E402
+    StandInServer,
+    gemini_stand_in,
+    install_stand_ins,
+    load_fixture,
+    personalize_profile,
+    proxycurl_stand_in
+)
+
+# scrape_linkedin (et main) sont importés dans les fonctions, après le choix du dossier
+# temporaire des caches par main(): ils lisent CACHE_PATH à l'import
+
+TARGETS = ["process_linkedin_profile", "analyze_with_gemini", "process_multiple_profiles"]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Percentile q (0-100) par interpolation linéaire"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def timed(call: Callable[[], bool]) -> Tuple[float, bool]:
+    """Exécute un appel et retourne (durée en secondes, succès)"""
+    started = time.perf_counter()
+    try:
+        ok = call()
+    except Exception:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def run_threaded(calls: List[Callable[[], bool]], concurrency: int) -> List[Tuple[float, bool]]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed, calls))
+
+
+def bench_process_linkedin_profile(urls: List[str], profiles: List[Dict], concurrency: int) -> List[Tuple[float, bool]]:
+    """Pipeline synchrone complet (Proxycurl + Gemini), un thread par profil en cours"""
+    import scrape_linkedin
+    calls = [
+        (lambda url=url: bool(scrape_linkedin.process_linkedin_profile(url, use_cache=False)))
+        for url in urls
+    ]
+    return run_threaded(calls, concurrency)
+
+
+def bench_analyze_with_gemini(urls: List[str], profiles: List[Dict], concurrency: int) -> List[Tuple[float, bool]]:
+    """Analyse Gemini seule (compaction, prompt, appel, parsing) sur des profils déjà extraits"""
+    import scrape_linkedin
+    calls = [
+        (lambda profile=profile: "error" not in scrape_linkedin.analyze_with_gemini(profile, use_cache=False))
+        for profile in profiles
+    ]
+    return run_threaded(calls, concurrency)
+
+
+def bench_process_multiple_profiles(urls: List[str], profiles: List[Dict], concurrency: int) -> List[Tuple[float, bool]]:
+    """Traitement par lot asynchrone de main.py (moteur proxycurl, max_concurrency = concurrence)"""
+    import main
+    from src import http_client
+
+    measures: List[Tuple[float, bool]] = []
+    process_profile = main.process_profile
+
+    async def timed_process_profile(url, *args, **kwargs):
+        started = time.perf_counter()
+        result = await process_profile(url, *args, **kwargs)
+        measures.append((time.perf_counter() - started, bool(result.get("success"))))
+        return result
+
+    async def run() -> None:
+        try:
+            await main.process_multiple_profiles(urls, None, "proxycurl", concurrency)
+        finally:
+            await http_client.close_async_session()
+
+    main.process_profile = timed_process_profile
+    try:
+        asyncio.run(run())
+    finally:
+        main.process_profile = process_profile
+    return measures
+
+
+BENCHMARKS = {
+    "process_linkedin_profile": bench_process_linkedin_profile,
+    "analyze_with_gemini": bench_analyze_with_gemini,
+    "process_multiple_profiles": bench_process_multiple_profiles
+}
+
+
+def run_benchmark(target: str, count: int, concurrency: int, profiles_fixture: List[Dict], gemini: StandInServer) -> Dict:
+    """
+    Mesure une cible à un niveau de concurrence donné
+
+    Chaque profil doit donner lieu à exactement un appel Gemini: des profils confondus par le
+    pipeline (cache, analyse partagée) fausseraient la comparaison entre niveaux de concurrence.
+    """
+    import scrape_linkedin
+    urls = [f"https://www.linkedin.com/in/bench-profile-{index}/" for index in range(count)]
+    profiles = [
+        personalize_profile(profiles_fixture[index % len(profiles_fixture)], f"bench-profile-{index}")
+        for index in range(count)
+    ]
+    scrape_linkedin.proxycurl_cache().clear()
+    scrape_linkedin.gemini_cache().clear()
+
+    gemini_requests = gemini.requests
+    started = time.perf_counter()
+    measures = BENCHMARKS[target](urls, profiles, concurrency)
+    elapsed = time.perf_counter() - started
+
+    # Un profil en échec (erreurs simulées par --error-rate) peut ne jamais atteindre Gemini
+    errors = sum(1 for _, ok in measures if not ok)
+    gemini_calls = gemini.requests - gemini_requests
+    if gemini_calls != count and not errors:
+        raise RuntimeError(f"{target} (concurrence {concurrency}): {gemini_calls} appels Gemini pour {count} profils")
+
+    latencies = [duration * 1000 for duration, _ in measures]
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "profiles": count,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "profiles_per_s": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "duration_s": round(elapsed, 3)
+    }
+
+
+def print_table(rows: List[Dict]) -> None:
+    header = f"{'cible':<28}{'conc.':>6}{'profils':>9}{'erreurs':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'profils/s':>11}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['target']:<28}{row['concurrency']:>6}{row['profiles']:>9}{row['errors']:>9}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['profiles_per_s']:>11.2f}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Banc d'essai hors ligne avec Proxycurl et Gemini simulés")
+    parser.add_argument("--targets", default=",".join(TARGETS), help=f"Cibles mesurées, séparées par des virgules ({', '.join(TARGETS)})")
+    parser.add_argument("--concurrency", default="1,4,16", help="Niveaux de concurrence, séparés par des virgules (défaut: 1,4,16)")
+    parser.add_argument("--profiles", type=int, default=40, help="Nombre de profils par mesure (défaut: 40)")
+    parser.add_argument("--proxycurl-latency", type=float, default=0.3, help="Latence moyenne de Proxycurl en secondes (défaut: 0.3)")
+    parser.add_argument("--gemini-latency", type=float, default=1.0, help="Latence moyenne de Gemini en secondes (défaut: 1.0)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Écart maximal autour des latences, en secondes (défaut: 0.1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Proportion de réponses 503 de chaque serveur (défaut: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine des tirages aléatoires (défaut: 42)")
+    parser.add_argument("--fixtures", default=None, help="Dossier de réponses enregistrées (proxycurl_profiles.json, gemini_analysis.json)")
+    parser.add_argument("--json", action="store_true", help="Afficher les résultats au format JSON")
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = parse_args()
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    unknown = [target for target in targets if target not in BENCHMARKS]
+    if unknown:
+        print(f"Cibles inconnues: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    fixtures = {"fixtures_dir": args.fixtures} if args.fixtures else {}
+    profiles_fixture = load_fixture("proxycurl_profiles.json", **fixtures)
+    analysis_fixture = load_fixture("gemini_analysis.json", **fixtures)
+
+    # Les journaux de main.py (un message par profil) sont limités aux avertissements; ceux de
+    # scrape_linkedin (erreurs simulées par --error-rate comprises) fausseraient les mesures dans un terminal
+    logging.getLogger("main").setLevel(logging.WARNING)
+    logging.getLogger("scrape_linkedin").setLevel(logging.CRITICAL)
+
+    common = {"jitter": args.jitter, "error_rate": args.error_rate, "seed": args.seed}
+    # Caches isolés dans un dossier supprimé en fin de mesure: le banc d'essai ne lit ni n'écrase les caches réels
+    with tempfile.TemporaryDirectory(prefix="linkedin-bench-") as cache_dir, \
+            proxycurl_stand_in(profiles_fixture, latency=args.proxycurl_latency, **common) as proxycurl, \
+            gemini_stand_in(analysis_fixture, latency=args.gemini_latency, **common) as gemini:
+        os.environ["CACHE_PATH"] = os.path.join(cache_dir, "cache.sqlite3")
+        import scrape_linkedin
+        install_stand_ins(scrape_linkedin, proxycurl.base_url, gemini.base_url)
+        rows = [
+            run_benchmark(target, args.profiles, concurrency, profiles_fixture, gemini)
+            for target in targets
+            for concurrency in concurrency_levels
+        ]
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        print_table(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
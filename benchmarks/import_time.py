@@ -0,0 +1,133 @@
+"""
+Mesure du temps de démarrage (import) de chaque point d'entrée, via python -X importtime
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 5 --top 15
+    python benchmarks/import_time.py --max-ms scrape_linkedin=500 --max-ms main=700
+
+Chaque module est importé dans un interpréteur neuf; le meilleur temps sur --repeat
+exécutions est retenu. Avec --max-ms, le script se termine en erreur si un point
+d'entrée dépasse son seuil (détection des régressions en intégration continue).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+# Racine du dépôt (les points d'entrée en sont importés comme depuis la ligne de commande)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Points d'entrée mesurés par défaut
+ENTRY_POINTS = ["scrape_linkedin", "main", "linkedin_score_app"]
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """
+    Importe un module dans un interpréteur neuf avec -X importtime
+
+    Returns:
+        Tuple[float, list]: Temps total d'import (ms) et (module, propre ms, cumulé ms) de chaque import
+    """
+    # Dossier de travail temporaire: les fichiers créés à l'import (caches, journaux) ne
+    # polluent pas le dépôt; les modules sont trouvés via PYTHONPATH
+    pythonpath = os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", PYTHONPATH=pythonpath)
+    with tempfile.TemporaryDirectory(prefix="linkedin-importtime-") as cwd:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {module}:\n{completed.stderr.strip().splitlines()[-1]}")
+
+    imports = []
+    total_ms = 0.0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+        if name.strip() == module:
+            total_ms = int(cumulative_us) / 1000
+    return total_ms, imports
+
+
+def benchmark(modules: List[str], repeat: int) -> Dict[str, Dict]:
+    """Mesure chaque point d'entrée repeat fois et conserve la meilleure exécution"""
+    report = {}
+    for module in modules:
+        try:
+            runs = [measure_import(module) for _ in range(repeat)]
+        except RuntimeError as e:
+            report[module] = {"error": str(e)}
+            continue
+        total_ms, imports = min(runs, key=lambda run: run[0])
+        report[module] = {
+            "total_ms": round(total_ms, 1),
+            "runs_ms": [round(run[0], 1) for run in runs],
+            "heaviest": sorted(imports, key=lambda item: item[1], reverse=True)
+        }
+    return report
+
+
+def parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        module, _, limit = value.partition("=")
+        thresholds[module] = float(limit)
+    return thresholds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Temps d'import des points d'entrée du projet")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Modules à mesurer")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de mesures par module (défaut: 3)")
+    parser.add_argument("--top", type=int, default=10, help="Nombre d'imports les plus coûteux affichés (défaut: 10)")
+    parser.add_argument("--json", action="store_true", help="Afficher le rapport au format JSON")
+    parser.add_argument(
+        "--max-ms",
+        action="append",
+        default=[],
+        metavar="MODULE=MS",
+        help="Seuil de temps d'import d'un module, en millisecondes (répétable)"
+    )
+    args = parser.parse_args()
+
+    report = benchmark(args.modules, args.repeat)
+    thresholds = parse_thresholds(args.max_ms)
+
+    if args.json:
+        print(json.dumps(
+            {module: {**data, "heaviest": data.get("heaviest", [])[:args.top]} for module, data in report.items()},
+            ensure_ascii=False,
+            indent=2
+        ))
+    else:
+        for module, data in report.items():
+            if "error" in data:
+                print(f"\n{module}: ❌ {data['error']}")
+                continue
+            print(f"\n{module}: {data['total_ms']:.1f} ms (mesures: {', '.join(f'{ms:.1f}' for ms in data['runs_ms'])})")
+            for name, self_ms, cumulative_ms in data["heaviest"][:args.top]:
+                print(f"    {self_ms:8.1f} ms propres  {cumulative_ms:8.1f} ms cumulés  {name}")
+
+    exceeded = [
+        f"{module}: {report[module].get('total_ms', float('inf')):.1f} ms > {limit:.1f} ms"
+        for module, limit in thresholds.items()
+        if module in report and report[module].get("total_ms", float("inf")) > limit
+    ]
+    failed = [module for module, data in report.items() if "error" in data]
+    for message in exceeded:
+        print(f"❌ Seuil dépassé - {message}", file=sys.stderr)
+    return 1 if exceeded or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
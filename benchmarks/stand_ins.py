@@ -0,0 +1,254 @@
+"""
+Serveurs HTTP locaux simulant Proxycurl et Gemini, pour mesurer les performances sans clés ni réseau
+
+Chaque serveur rejoue des réponses enregistrées (benchmarks/fixtures) avec une latence,
+une gigue et un taux d'erreur configurables.
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Chemin de l'API Proxycurl simulée et du point d'appel Gemini simulé
+PROXYCURL_PATH = "/proxycurl/api/v2/linkedin"
+GEMINI_PATH = "/generate"
+
+# Signature d'un gestionnaire: respond(méthode, chemin, paramètres, corps) -> (statut, type de contenu, corps)
+Responder = Callable[[str, str, Dict[str, List[str]], bytes], Tuple[int, str, bytes]]
+
+
+def load_fixture(name: str, fixtures_dir: str = FIXTURES_DIR) -> Any:
+    """Charge une réponse enregistrée (JSON) du dossier de fixtures"""
+    with open(os.path.join(fixtures_dir, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StandInServer:
+    """
+    Serveur HTTP local exécuté dans un thread, qui simule une API distante
+
+    Chaque requête attend latency ± jitter secondes; une proportion error_rate des
+    requêtes reçoit une erreur 503 (corps texte, comme une passerelle indisponible).
+    """
+
+    def __init__(
+        self,
+        respond: Responder,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            respond: Construit la réponse d'une requête réussie
+            latency (float): Latence moyenne simulée, en secondes
+            jitter (float): Écart maximal autour de la latence moyenne, en secondes
+            error_rate (float): Proportion de requêtes en erreur (0-1)
+            seed (int, optional): Graine du tirage aléatoire (mesures reproductibles)
+        """
+        self.respond = respond
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _draw(self) -> Tuple[float, bool]:
+        """Tire la latence et l'échec éventuel d'une requête"""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def start(self) -> str:
+        """Démarre le serveur sur un port libre et retourne son URL de base"""
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1: connexions keep-alive, comme avec les vraies API
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                delay, failed = stand_in._draw()
+                time.sleep(delay)
+
+                if failed:
+                    status, content_type, payload = 503, "text/plain; charset=utf-8", "Service indisponible (simulé)".encode("utf-8")
+                else:
+                    url = urlparse(self.path)
+                    status, content_type, payload = stand_in.respond(self.command, url.path, parse_qs(url.query), body)
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Arrête le serveur"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def _json_response(data: Any) -> Tuple[int, str, bytes]:
+    return 200, "application/json", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def personalize_profile(profile: Dict[str, Any], slug: str) -> Dict[str, Any]:
+    """
+    Copie d'une réponse enregistrée propre à un identifiant de profil
+
+    Le nom complet fait partie du profil compacté (clé du cache et de l'analyse partagée des
+    analyses Gemini): deux profils personnalisés ne sont jamais confondus par le pipeline.
+    """
+    personalized = dict(profile)
+    personalized["public_identifier"] = slug
+    personalized["full_name"] = f"{profile.get('full_name', '')} ({slug})"
+    return personalized
+
+
+def proxycurl_stand_in(profiles: List[Dict[str, Any]], **options: Any) -> StandInServer:
+    """
+    Simule l'API Proxycurl: chaque profil demandé reçoit l'une des réponses enregistrées,
+    personnalisée avec l'identifiant de l'URL (profils distincts pour les caches)
+
+    Args:
+        profiles (list): Réponses Proxycurl enregistrées
+        **options: latency, jitter, error_rate, seed (voir StandInServer)
+    """
+    def respond(method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        if path != PROXYCURL_PATH or "url" not in query:
+            return 404, "text/plain; charset=utf-8", b"Not found"
+        slug = query["url"][0].rstrip("/").rsplit("/", 1)[-1]
+        return _json_response(personalize_profile(profiles[sum(map(ord, slug)) % len(profiles)], slug))
+
+    return StandInServer(respond, **options)
+
+
+def gemini_stand_in(analysis: Dict[str, Any], **options: Any) -> StandInServer:
+    """
+    Simule Gemini: répond à chaque prompt avec l'analyse enregistrée (au format JSON structuré),
+    ou avec un tableau d'analyses pour un prompt multi-profils
+
+    Args:
+        analysis (dict): Analyse Gemini enregistrée (schéma GeminiAnalysis)
+        **options: latency, jitter, error_rate, seed (voir StandInServer)
+    """
+    def respond(method: str, path: str, query: Dict[str, List[str]], body: bytes) -> Tuple[int, str, bytes]:
+        if path != GEMINI_PATH:
+            return 404, "text/plain; charset=utf-8", b"Not found"
+        prompt = json.loads(body or b"{}").get("prompt", "")
+        profile_ids = re.findall(r"### Profil (p\d+)", prompt)
+        if profile_ids:
+            text = json.dumps([{"id": profile_id, **analysis} for profile_id in profile_ids], ensure_ascii=False)
+        else:
+            text = json.dumps(analysis, ensure_ascii=False)
+        return _json_response({"text": text})
+
+    return StandInServer(respond, **options)
+
+
+def _usage_metadata(prompt: str, text: str) -> SimpleNamespace:
+    """Métadonnées d'usage estimées (~4 caractères par token), au format des réponses Gemini"""
+    return SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=len(text) // 4)
+
+
+class StandInGeminiModel:
+    """
+    Remplaçant de genai.GenerativeModel qui interroge le serveur Gemini simulé
+    (generate_content, y compris en flux, et generate_content_async)
+
+    Une erreur 503 simulée lève ConnectionError: comme ServiceUnavailable avec le SDK réel,
+    c'est une erreur d'acheminement (voir scrape_linkedin.is_transport_error).
+    """
+
+    def __init__(self, base_url: str, stream_chunk_chars: int = 200):
+        self.url = base_url + GEMINI_PATH
+        self.stream_chunk_chars = stream_chunk_chars
+        self._session = requests.Session()
+
+    def generate_content(self, prompt: str, stream: bool = False) -> Any:
+        response = self._session.post(self.url, json={"prompt": prompt}, timeout=60)
+        if response.status_code != 200:
+            raise ConnectionError(f"Gemini simulé: HTTP {response.status_code}")
+        text = response.json()["text"]
+        usage = _usage_metadata(prompt, text)
+        if stream:
+            # Comme l'API réelle, seul le dernier fragment porte les métadonnées d'usage
+            starts = range(0, len(text), self.stream_chunk_chars)
+            return [
+                SimpleNamespace(
+                    text=text[start:start + self.stream_chunk_chars],
+                    usage_metadata=usage if start == starts[-1] else None
+                )
+                for start in starts
+            ]
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    async def generate_content_async(self, prompt: str) -> Any:
+        from src import http_client
+
+        session = await http_client.get_async_session()
+        async with session.post(self.url, json={"prompt": prompt}) as response:
+            if response.status != 200:
+                raise ConnectionError(f"Gemini simulé: HTTP {response.status}")
+            text = (await response.json())["text"]
+            return SimpleNamespace(text=text, usage_metadata=_usage_metadata(prompt, text))
+
+
+def install_stand_ins(scrape_linkedin: Any, proxycurl_url: str, gemini_url: str) -> None:
+    """
+    Redirige le module scrape_linkedin vers les serveurs simulés: point d'appel Proxycurl,
+    client Gemini, et limites de débit désactivées
+    """
+    scrape_linkedin.API_ENDPOINT = proxycurl_url + PROXYCURL_PATH
+    model = StandInGeminiModel(gemini_url)
+    scrape_linkedin.gemini_model = lambda *args, **kwargs: model
+    scrape_linkedin.proxycurl_limiter.set_rate(0)
+    scrape_linkedin.gemini_limiter.set_rate(0)
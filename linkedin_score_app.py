@@ -1,15 +1,39 @@
 import streamlit as st
+import streamlit.components.v1 as components
+import csv
+import io
 import json
+import logging
 import os
 import sys
 import re # Importer le module regex
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from dotenv import load_dotenv
-import pandas as pd
 import scrape_linkedin
+from src import metrics
+from src.cache import MemoryCache
+from src.job_queue import DONE, FAILED, JobQueue
+from src.linkedin_url import is_profile_url, profile_key
 
 # Chargement des variables d'environnement
 load_dotenv()
 
+# Journal du serveur Streamlit (problèmes d'infrastructure, hors interface)
+logger = logging.getLogger(__name__)
+
+# Nombre d'analyses complètes conservées en mémoire et partagées par toutes les sessions
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 256))
+
+# Nombre de profils analysés simultanément par la page d'analyse en lot
+BULK_MAX_WORKERS = int(os.getenv("BULK_MAX_WORKERS", 4))
+
+# File des analyses exécutées en arrière-plan (analyses approfondies et lots)
+JOBS_PATH = os.getenv("JOBS_PATH", "cache/jobs.sqlite")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+
 # Configuration de la page Streamlit avec thème par défaut
 st.set_page_config(
     page_title="LinkedIn Profile Scorer | Évaluation professionnelle",
@@ -23,9 +47,8 @@ st.set_page_config(
     }
 )
 
-# CSS personnalisé (optimisé pour thème clair)
-st.markdown("""
-<style>
+# CSS de l'application (optimisé pour thème clair), regroupé en une seule feuille de style
+APP_CSS = """
     /* Style de base */
     * {
         font-family: 'Inter', 'Segoe UI', Arial, sans-serif;
@@ -62,7 +85,7 @@ st.markdown("""
         margin-bottom: 1rem;
         padding-left: 10px;
     }
-    
+
     /* Style de cartes */
     .card {
         background-color: white;
@@ -79,7 +102,7 @@ st.markdown("""
         transform: translateY(-5px);
         box-shadow: 0 8px 20px rgba(0,0,0,0.12);
     }
-    
+
     /* Style des boutons */
     div.stButton > button {
         width: 100%;
@@ -103,7 +126,7 @@ st.markdown("""
         transform: translateY(-1px);
         box-shadow: 0 5px 10px rgba(255, 75, 75, 0.2);
     }
-    
+
     /* Style des champs de texte */
     div[data-baseweb="input"] {
         border-radius: 8px;
@@ -117,7 +140,7 @@ st.markdown("""
     div[data-baseweb="input"] > div:focus-within {
         box-shadow: 0 0 0 3px rgba(0, 0, 0, 0.1);
     }
-    
+
     /* Tabs stylisés */
     .stTabs [data-baseweb="tab-list"] {
         gap: 0;
@@ -134,7 +157,7 @@ st.markdown("""
         font-weight: 500;
         letter-spacing: 0.2px;
     }
-    
+
     /* Compteur de score */
     .score-container {
         display: flex;
@@ -193,7 +216,7 @@ st.markdown("""
         z-index: 2;
         color: #64748B;
     }
-    
+
     /* Métriques */
     .metric-container {
         display: flex;
@@ -221,7 +244,7 @@ st.markdown("""
         font-size: 0.9rem;
         font-weight: 500;
     }
-    
+
     /* Styles pour les expanders */
     .stExpander > div[data-testid="stExpanderDetails"] {
          background-color: #f8fafd;
@@ -232,7 +255,7 @@ st.markdown("""
     .stExpander > div[role="button"]:hover {
         background-color: rgba(151, 166, 195, 0.15);
     }
-    
+
     /* Améliorer le rendu markdown dans l'analyse détaillée */
     .detailed-analysis-content p,
     .detailed-analysis-content ul,
@@ -241,7 +264,7 @@ st.markdown("""
         line-height: 1.8;
         margin-bottom: 1.25rem;
     }
-    
+
     /* Animations */
     @keyframes fadeIn {
         from { opacity: 0; transform: translateY(10px); }
@@ -250,7 +273,7 @@ st.markdown("""
     .card {
         animation: fadeIn 0.5s ease-out;
     }
-    
+
     /* Justification du score avec meilleure lisibilité */
     .justification-box {
         padding: 1rem 1.25rem;
@@ -259,7 +282,7 @@ st.markdown("""
         line-height: 1.7;
         margin-top: 1.25rem;
     }
-    
+
     /* Améliorations pour la section "À propos de l'outil" */
     .feature-item {
         display: flex;
@@ -287,13 +310,8 @@ st.markdown("""
     .feature-item-text {
         font-weight: 500;
     }
-</style>
-""", unsafe_allow_html=True)
 
-def main():
-    # Appliquer un style visuel amélioré pour le thème clair
-    extra_styles = """
-    <style>
+    /* ===== Style visuel amélioré pour le thème clair ===== */
     /* Amélioration de la visibilité des feature-items */
     .feature-item {
         background-color: rgba(10, 77, 104, 0.1);
@@ -306,13 +324,13 @@ def main():
         background-color: #0A4D68;
         color: white;
     }
-    
+
     /* Amélioration des cartes */
     .card {
         border-left: 3px solid #0A4D68 !important;
         box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3) !important;
     }
-    
+
     /* Amélioration des boutons */
     div.stButton > button {
         background: linear-gradient(90deg, #0A4D68, #146C94) !important;
@@ -321,7 +339,7 @@ def main():
     div.stButton > button:hover {
         box-shadow: 0 10px 20px rgba(10, 77, 104, 0.4) !important;
     }
-    
+
     /* Amélioration des sliders */
     div.stSlider > div[data-baseweb="slider"] > div > div {
         background-color: rgba(10, 77, 104, 0.6);
@@ -331,9 +349,223 @@ def main():
         border: 2px solid white;
         box-shadow: 0 0 10px rgba(10, 77, 104, 0.5);
     }
-    </style>
+
+    /* ===== Bouton d'analyse ===== */
+    div.stButton > button {
+        width: 100%;
+        height: 3.5rem;
+        font-weight: 700;
+        font-size: 1.1rem;
+        border-radius: 10px;
+        border: none;
+        background: linear-gradient(90deg, #0A4D68, #146C94);
+        color: white;
+        text-transform: uppercase;
+        letter-spacing: 2px;
+        transition: all 0.3s ease;
+        box-shadow: 0 6px 15px rgba(10, 77, 104, 0.3);
+    }
+    div.stButton > button:hover {
+        transform: translateY(-3px);
+        box-shadow: 0 10px 20px rgba(10, 77, 104, 0.4);
+    }
+    div.stButton > button:active {
+        transform: translateY(-1px);
+        box-shadow: 0 5px 10px rgba(10, 77, 104, 0.2);
+    }
+
+    /* ===== Sliders ===== */
+    div.stSlider > div[data-baseweb="slider"] > div > div {
+        background-color: rgba(10, 77, 104, 0.6);
+    }
+    div.stSlider > div[data-baseweb="slider"] > div > div > div {
+        background-color: #0A4D68;
+        border: 2px solid white;
+        box-shadow: 0 0 10px rgba(10, 77, 104, 0.5);
+    }
+
+    /* ===== Info box ===== */
+    div.stAlert > div {
+        background-color: rgba(10, 77, 104, 0.1);
+        border: 1px solid rgba(10, 77, 104, 0.5);
+        border-radius: 8px;
+        padding: 1rem;
+    }
+
+    /* ===== Badges de statut ===== */
+    .status-badge-active {
+        display: inline-flex;
+        align-items: center;
+        background-color: rgba(80, 200, 120, 0.2);
+        color: #50C878;
+        padding: 0.4rem 0.8rem;
+        border-radius: 20px;
+        font-weight: 500;
+        font-size: 0.9rem;
+    }
+    .status-badge-inactive {
+        display: inline-flex;
+        align-items: center;
+        background-color: rgba(10, 77, 104, 0.2);
+        color: #0A4D68;
+        padding: 0.4rem 0.8rem;
+        border-radius: 20px;
+        font-weight: 500;
+        font-size: 0.9rem;
+    }
+    .model-badge {
+        display: inline-flex;
+        align-items: center;
+        background-color: rgba(20, 108, 148, 0.2);
+        color: #146C94;
+        padding: 0.4rem 0.8rem;
+        border-radius: 20px;
+        font-weight: 500;
+        font-size: 0.9rem;
+    }
+
+    /* ===== Résultats ===== */
+    /* Style pour les onglets */
+    .stTabs [data-baseweb="tab-list"] {
+        background-color: rgba(10, 77, 104, 0.05);
+    }
+    .stTabs [aria-selected="true"] {
+        background-color: rgba(10, 77, 104, 0.2);
+        color: #0A4D68;
+    }
+
+    /* Style pour le cercle de score */
+    .score-circle {
+        background: conic-gradient(#0A4D68 var(--score-angle), rgba(31, 41, 55, 0.4) 0) !important;
+    }
+    @keyframes glow {
+        0% { box-shadow: 0 0 10px rgba(10, 77, 104, 0.5); }
+        50% { box-shadow: 0 0 20px rgba(10, 77, 104, 0.8); }
+        100% { box-shadow: 0 0 10px rgba(10, 77, 104, 0.5); }
+    }
+    .score-circle {
+        animation: glow 3s infinite !important;
+    }
+
+    /* Style pour les métriques */
+    .metric-container {
+        border-left: 3px solid #0A4D68 !important;
+    }
+
+    /* ===== Sections du raisonnement détaillé ===== */
+    .detail-section {
+        background-color: rgba(10, 77, 104, 0.05);
+        border-radius: 8px;
+        padding: 1.25rem;
+        margin-bottom: 1.5rem;
+        border-left: 3px solid #0A4D68;
+    }
+    .detail-section h4 {
+        color: #0A4D68;
+        margin-bottom: 1rem;
+        font-size: 1.2rem;
+        display: flex;
+        align-items: center;
+    }
+    .detail-section p {
+        margin-bottom: 0.75rem;
+        line-height: 1.7;
+        color: #1E293B;
+    }
+    .detail-section-icon {
+        background-color: #0A4D68;
+        color: white;
+        width: 32px;
+        height: 32px;
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-right: 12px;
+        font-size: 16px;
+    }
+    .score-detail {
+        display: flex;
+        align-items: center;
+        margin-top: 1rem;
+        padding: 0.75rem;
+        background-color: rgba(10, 77, 104, 0.1);
+        border-radius: 6px;
+    }
+    .score-detail-number {
+        font-size: 1.5rem;
+        font-weight: 700;
+        color: #0A4D68;
+        margin-right: 1rem;
+        min-width: 50px;
+        text-align: center;
+    }
+    .score-detail-text {
+        flex-grow: 1;
+    }
+    .score-calculation {
+        background-color: #f8fafc;
+        border: 1px dashed #cbd5e1;
+        border-radius: 6px;
+        padding: 1rem;
+        margin: 1rem 0;
+        font-family: monospace;
+        line-height: 1.6;
+    }
+
+    /* ===== Boutons de téléchargement ===== */
+    div.stDownloadButton > button {
+        background-color: rgba(10, 77, 104, 0.1) !important;
+        color: #0A4D68 !important;
+        border: 1px solid rgba(10, 77, 104, 0.3) !important;
+        padding: 0.5rem 1rem !important;
+        border-radius: 8px !important;
+        font-weight: 600 !important;
+        transition: all 0.3s !important;
+    }
+    div.stDownloadButton > button:hover {
+        background-color: rgba(10, 77, 104, 0.2) !important;
+        box-shadow: 0 4px 8px rgba(10, 77, 104, 0.2) !important;
+    }
+"""
+
+def inject_css():
+    """
+    Injecte la feuille de style une seule fois par session
+    
+    La feuille est ajoutée à l'en-tête de la page principale (et non dans le flux des
+    éléments Streamlit): elle persiste d'une exécution du script à l'autre sans être
+    renvoyée au navigateur à chaque interaction.
     """
-    st.markdown(extra_styles, unsafe_allow_html=True)
+    if st.session_state.get("css_injected"):
+        return
+    components.html(
+        f"""
+        <script>
+        const doc = window.parent.document;
+        if (!doc.getElementById("linkedin-scorer-css")) {{
+            const style = doc.createElement("style");
+            style.id = "linkedin-scorer-css";
+            style.textContent = {json.dumps(APP_CSS)};
+            doc.head.appendChild(style);
+        }}
+        </script>
+        """,
+        height=0
+    )
+    st.session_state["css_injected"] = True
+
+def main():
+    # Feuille de style de l'application (envoyée une seule fois par session)
+    inject_css()
+    metrics_server()
+    
+    
+    # Navigation entre l'analyse d'un profil et l'analyse en lot
+    page = st.sidebar.radio("📂 Mode d'analyse", ["🔍 Analyse d'un profil", "📋 Analyse en lot"])
+    if page == "📋 Analyse en lot":
+        bulk_page()
+        return
     
     # Titre et description de l'application
     st.markdown("<h1>LinkedIn Profile Scorer</h1>", unsafe_allow_html=True)
@@ -359,54 +591,12 @@ def main():
                               placeholder="https://www.linkedin.com/in/exemple/",
                               label_visibility="collapsed")
         
-        # Bouton pour déclencher l'analyse avec style amélioré
-        button_style = """
-        <style>
-        div.stButton > button {
-            width: 100%;
-            height: 3.5rem;
-            font-weight: 700;
-            font-size: 1.1rem;
-            border-radius: 10px;
-            border: none;
-            background: linear-gradient(90deg, #0A4D68, #146C94);
-            color: white;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            transition: all 0.3s ease;
-            box-shadow: 0 6px 15px rgba(10, 77, 104, 0.3);
-        }
-        div.stButton > button:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 10px 20px rgba(10, 77, 104, 0.4);
-        }
-        div.stButton > button:active {
-            transform: translateY(-1px);
-            box-shadow: 0 5px 10px rgba(10, 77, 104, 0.2);
-        }
-        </style>
-        """
-        st.markdown(button_style, unsafe_allow_html=True)
         analyze_button = st.button("🔍 ANALYSER LE PROFIL", type="primary", use_container_width=True)
         
         # Paramètres de scoring
         with st.expander("⚙️ Paramètres d'évaluation"):
             st.markdown("<p style='margin-bottom: 1rem; font-weight: 500;'>Ajustez la pondération des critères d'évaluation:</p>", unsafe_allow_html=True)
             
-            # Style pour les sliders
-            slider_style = """
-            <style>
-            div.stSlider > div[data-baseweb="slider"] > div > div {
-                background-color: rgba(10, 77, 104, 0.6);
-            }
-            div.stSlider > div[data-baseweb="slider"] > div > div > div {
-                background-color: #0A4D68;
-                border: 2px solid white;
-                box-shadow: 0 0 10px rgba(10, 77, 104, 0.5);
-            }
-            </style>
-            """
-            st.markdown(slider_style, unsafe_allow_html=True)
             
             exp_weight = st.slider("💼 Expérience professionnelle", 0.1, 0.6, 0.4, 0.1)
             edu_weight = st.slider("🎓 Niveau d'études", 0.1, 0.6, 0.3, 0.1)
@@ -418,24 +608,20 @@ def main():
                                     index=0,
                                     help="L'analyse approfondie fournit une évaluation plus complète mais prend plus de temps.")
             
+            # Contournement du cache des analyses
+            force_refresh = st.checkbox("🔄 Forcer une nouvelle analyse (ignorer le cache)", value=False)
+            
+            # Scoring hiérarchisé: l'IA n'est sollicitée que pour les profils ambigus
+            tiered = st.checkbox("⚡ Scoring local d'abord (Gemini seulement si nécessaire)", value=False,
+                                 help="Les profils clairement structurés sont notés instantanément par des règles locales. "
+                                      "Sans effet en analyse approfondie.")
+            
             # Normaliser les poids pour qu'ils totalisent 1.0
             total = exp_weight + edu_weight + sector_weight
             exp_weight = round(exp_weight / total, 2)
             edu_weight = round(edu_weight / total, 2)
             sector_weight = round(sector_weight / total, 2)
             
-            # Style pour l'info box
-            info_style = """
-            <style>
-            div.stAlert > div {
-                background-color: rgba(10, 77, 104, 0.1);
-                border: 1px solid rgba(10, 77, 104, 0.5);
-                border-radius: 8px;
-                padding: 1rem;
-            }
-            </style>
-            """
-            st.markdown(info_style, unsafe_allow_html=True)
             st.info(f"Pondération ajustée : Expérience ({exp_weight}) · Éducation ({edu_weight}) · Secteur ({sector_weight})")
     
     with col2:
@@ -475,42 +661,6 @@ def main():
             "Modèle Gemini": os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
         }
         
-        # Affichage du statut avec badges personnalisés
-        status_style = """
-        <style>
-        .status-badge-active {
-            display: inline-flex;
-            align-items: center;
-            background-color: rgba(80, 200, 120, 0.2);
-            color: #50C878;
-            padding: 0.4rem 0.8rem;
-            border-radius: 20px;
-            font-weight: 500;
-            font-size: 0.9rem;
-        }
-        .status-badge-inactive {
-            display: inline-flex;
-            align-items: center;
-            background-color: rgba(10, 77, 104, 0.2);
-            color: #0A4D68;
-            padding: 0.4rem 0.8rem;
-            border-radius: 20px;
-            font-weight: 500;
-            font-size: 0.9rem;
-        }
-        .model-badge {
-            display: inline-flex;
-            align-items: center;
-            background-color: rgba(20, 108, 148, 0.2);
-            color: #146C94;
-            padding: 0.4rem 0.8rem;
-            border-radius: 20px;
-            font-weight: 500;
-            font-size: 0.9rem;
-        }
-        </style>
-        """
-        st.markdown(status_style, unsafe_allow_html=True)
         
         st.markdown(
             f"""
@@ -542,65 +692,336 @@ def main():
     
     # Section de résultats
     if analyze_button and linkedin_url:
-        if not linkedin_url or 'linkedin.com/in/' not in linkedin_url:
+        if not linkedin_url or not is_profile_url(linkedin_url):
             st.error("⚠️ Veuillez entrer une URL LinkedIn valide (ex: https://www.linkedin.com/in/nom-utilisateur/).")
+        elif detail_level == "approfondi":
+            # Analyse longue: exécutée en arrière-plan, elle survit aux interactions et aux rechargements de page
+            st.session_state.pop("result", None)
+            submit_profile_job(linkedin_url, exp_weight, edu_weight, sector_weight, detail_level, not force_refresh, tiered)
+            if "result" in st.session_state:
+                show_results()
+            else:
+                profile_job_status(exp_weight, edu_weight, sector_weight)
         else:
-            with st.spinner('🔄 Analyse en cours... Veuillez patienter.'):
-                try:
-                    # Appel au script d'analyse avec les paramètres de pondération
-                    st.session_state["result"] = scrape_linkedin.process_linkedin_profile(
-                        linkedin_url, 
-                        exp_weight=exp_weight,
-                        edu_weight=edu_weight,
-                        sector_weight=sector_weight,
-                        detail_level=detail_level
-                    )
-                    show_results()
-                except Exception as e:
-                    st.error(f"❌ Une erreur s'est produite lors de l'analyse: {str(e)}")
+            try:
+                # Appel au script d'analyse avec les paramètres de pondération (affichage progressif)
+                stream_analysis(
+                    linkedin_url,
+                    exp_weight,
+                    edu_weight,
+                    sector_weight,
+                    detail_level,
+                    use_cache=not force_refresh,
+                    tiered=tiered
+                )
+                show_results()
+            except Exception as e:
+                st.error(f"❌ Une erreur s'est produite lors de l'analyse: {str(e)}")
+    elif active_job_id("profile") is not None:
+        # Analyse en arrière-plan toujours en cours (lancée avant cette exécution du script)
+        profile_job_status(exp_weight, edu_weight, sector_weight)
     elif "result" in st.session_state:
+         # Recalcul local du score global si les pondérations ont changé (aucun appel API)
+         scrape_linkedin.reweight_result(st.session_state["result"], exp_weight, edu_weight, sector_weight)
          # Afficher les résultats précédents si disponibles
          show_results()
 
-def show_results():
-    """Affiche les résultats de l'analyse"""
-    if "result" not in st.session_state:
-        return
+def score_gauge_html(score):
+    """Construit la jauge circulaire du score global"""
+    # Déterminer les couleurs en fonction du score
+    label = ""
     
-    result = st.session_state["result"]
+    if score >= 8:
+        label = "Excellent"
+    elif score >= 6:
+        label = "Bon"
+    elif score >= 4:
+        label = "Moyen"
+    else:
+        label = "Faible"
+        
+    # Calcul de l'angle pour le gradient conique
+    angle = score * 36  # 360 degrés / 10 = 36 degrés par point
     
-    # Style pour les résultats
-    score_style = """
-    <style>
-    /* Style pour les onglets */
-    .stTabs [data-baseweb="tab-list"] {
-        background-color: rgba(10, 77, 104, 0.05);
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: rgba(10, 77, 104, 0.2);
-        color: #0A4D68;
+    # Amélioration du contraste
+    return f"""
+    <div style="background: rgba(243, 244, 246, 0.7); border-radius: 12px; padding: 1.5rem; display: flex; flex-direction: column; align-items: center; justify-content: center; box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1); height: 100%; border-left: 3px solid #0A4D68;">
+        <h3 style="margin-bottom: 1rem; text-align: center; font-size: 1.25rem; color: #1E293B;">Score global</h3>
+        <div class="score-container">
+            <div class="score-circle" style="--score-angle: {angle}deg;">
+                <div style="display: flex; flex-direction: column; align-items: center;">
+                    <p class="score-value" style="color: #0A4D68;">{score}</p>
+                    <p class="score-label" style="color: #475569;">/10</p>
+                </div>
+            </div>
+            <div style="background-color: #0A4D68; color: white; padding: 0.4rem 1rem; border-radius: 20px; font-weight: 600; margin-top: 0.5rem;">
+                {label}
+            </div>
+        </div>
+    </div>
+    """
+
+@st.cache_resource
+def analysis_results_cache():
+    """Cache des résultats d'analyse, commun à toutes les sessions du serveur"""
+    results_cache = MemoryCache(ANALYSIS_CACHE_MAX_ENTRIES)
+    metrics.register_cache("streamlit_analyses", results_cache)
+    return results_cache
+
+@st.cache_resource
+def metrics_server():
+    """Point d'exposition des métriques (METRICS_PORT), démarré une seule fois par processus serveur"""
+    try:
+        return metrics.start_metrics_server()
+    except OSError as e:
+        logger.warning(f"Point de métriques indisponible sur le port {metrics.METRICS_PORT}: {e}")
+        return None
+
+@st.cache_resource
+def job_queue():
+    """File de tâches persistante, dont les workers sont démarrés une seule fois par processus serveur"""
+    results_cache = analysis_results_cache()
+    handlers = {
+        "profile": partial(run_profile_job, results_cache=results_cache),
+        "bulk": partial(run_bulk_job, results_cache=results_cache)
     }
+    queue = JobQueue(JOBS_PATH, handlers, workers=JOB_WORKERS)
+    queue.start()
+    return queue
+
+def active_job_id(kind):
+    """
+    Identifiant de la tâche en arrière-plan suivie par la session, retrouvé au besoin dans
+    l'URL de la page (après un rechargement du navigateur)
+    """
+    state_key = f"{kind}_job_id"
+    if state_key not in st.session_state and kind in st.query_params:
+        st.session_state[state_key] = st.query_params[kind]
+    return st.session_state.get(state_key)
+
+def track_job(kind, job_id):
+    """Mémorise la tâche suivie dans la session et dans l'URL de la page (None pour arrêter le suivi)"""
+    if job_id is None:
+        st.session_state.pop(f"{kind}_job_id", None)
+        if kind in st.query_params:
+            del st.query_params[kind]
+    else:
+        st.session_state[f"{kind}_job_id"] = job_id
+        st.query_params[kind] = job_id
+
+def run_profile_job(params, report_progress, results_cache):
+    """Traitement d'une tâche "profile" (thread worker de la file)"""
+    cache_key = (profile_key(params["url"]), params["detail_level"], params["tiered"])
+    result = scrape_linkedin.process_linkedin_profile(
+        params["url"],
+        params["exp_weight"],
+        params["edu_weight"],
+        params["sector_weight"],
+        params["detail_level"],
+        use_cache=params["use_cache"],
+        tiered=params["tiered"]
+    )
+    results_cache.set(cache_key, result)
+    return result
+
+def submit_profile_job(linkedin_url, exp_weight, edu_weight, sector_weight, detail_level, use_cache, tiered):
+    """Soumet l'analyse d'un profil à la file de tâches (ou la sert depuis le cache partagé)"""
+    cache_key = (profile_key(linkedin_url), detail_level, tiered)
+    cached_result = analysis_results_cache().get(cache_key) if use_cache else None
+    if cached_result is not None:
+        set_result(scrape_linkedin.reweight_result(cached_result, exp_weight, edu_weight, sector_weight))
+        return
     
-    /* Style pour le cercle de score */
-    .score-circle {
-        background: conic-gradient(#0A4D68 var(--score-angle), rgba(31, 41, 55, 0.4) 0) !important;
-    }
-    @keyframes glow {
-        0% { box-shadow: 0 0 10px rgba(10, 77, 104, 0.5); }
-        50% { box-shadow: 0 0 20px rgba(10, 77, 104, 0.8); }
-        100% { box-shadow: 0 0 10px rgba(10, 77, 104, 0.5); }
-    }
-    .score-circle {
-        animation: glow 3s infinite !important;
-    }
+    track_job("profile", job_queue().submit("profile", {
+        "url": linkedin_url,
+        "exp_weight": exp_weight,
+        "edu_weight": edu_weight,
+        "sector_weight": sector_weight,
+        "detail_level": detail_level,
+        "use_cache": use_cache,
+        "tiered": tiered
+    }))
+
+@st.experimental_fragment(run_every=1)
+def profile_job_status(exp_weight, edu_weight, sector_weight):
+    """Suit l'analyse en arrière-plan de la session (rafraîchi chaque seconde) et affiche son résultat une fois terminée"""
+    job_id = active_job_id("profile")
+    if job_id is None:
+        return
     
-    /* Style pour les métriques */
-    .metric-container {
-        border-left: 3px solid #0A4D68 !important;
+    job = job_queue().get(job_id)
+    if job is None:
+        track_job("profile", None)
+        return
+    
+    if job["status"] == DONE:
+        track_job("profile", None)
+        set_result(scrape_linkedin.reweight_result(job["result"], exp_weight, edu_weight, sector_weight))
+        st.rerun()
+    elif job["status"] == FAILED:
+        track_job("profile", None)
+        st.error(f"❌ Une erreur s'est produite lors de l'analyse: {job['error']}")
+    else:
+        elapsed = time.time() - (job["started_at"] or job["created_at"])
+        state = "en cours" if job["started_at"] else "en attente"
+        st.info(f"⏳ Analyse approfondie {state} ({elapsed:.0f} s). Vous pouvez continuer à utiliser l'application ou recharger la page.")
+
+def stream_analysis(linkedin_url, exp_weight, edu_weight, sector_weight, detail_level, use_cache, tiered=False):
+    """
+    Lance l'analyse en mode flux: le raisonnement de l'IA s'affiche au fil de sa
+    génération et la jauge du score apparaît dès que les sous-scores sont connus
+    
+    Un profil déjà analysé avec les mêmes paramètres (par cette session ou une autre)
+    est servi depuis le cache partagé; seul le score global est recalculé avec les pondérations.
+    """
+    # Les pondérations ne font pas partie de la clé: le score global est recalculé localement
+    cache_key = (profile_key(linkedin_url), detail_level, tiered)
+    results_cache = analysis_results_cache()
+    if use_cache:
+        timings = metrics.StageTimings()
+        with timings.stage("cache_streamlit"):
+            cached_result = results_cache.get(cache_key)
+        if cached_result is not None:
+            # Les durées de l'analyse d'origine sont remplacées par celle de la lecture du cache
+            cached_result["timings"] = timings.finish()
+            set_result(scrape_linkedin.reweight_result(cached_result, exp_weight, edu_weight, sector_weight))
+            return
+    
+    live = st.empty()
+    with live.container():
+        col_text, col_score = st.columns([2, 1], gap="large")
+        with col_text:
+            st.markdown("<h3 style='color: #0A4D68; border-left: 3px solid #0A4D68; padding-left: 10px;'>🔍 Analyse détaillée</h3>", unsafe_allow_html=True)
+            text_placeholder = st.empty()
+        with col_score:
+            score_placeholder = st.empty()
+    
+    text_placeholder.info("🔄 Extraction du profil LinkedIn...")
+    score_placeholder.info("⏳ Score en cours de calcul...")
+    
+    streamed_text = ""
+    for event, value in scrape_linkedin.process_linkedin_profile_stream(
+        linkedin_url,
+        exp_weight=exp_weight,
+        edu_weight=edu_weight,
+        sector_weight=sector_weight,
+        detail_level=detail_level,
+        use_cache=use_cache,
+        tiered=tiered
+    ):
+        if event == "text":
+            streamed_text += value
+            text_placeholder.markdown(f'<div style="color: #1E293B; white-space: pre-line;">{streamed_text}</div>', unsafe_allow_html=True)
+        elif event == "score":
+            score_placeholder.markdown(score_gauge_html(value), unsafe_allow_html=True)
+        elif event == "result":
+            set_result(value)
+            results_cache.set(cache_key, value)
+    
+    # Remplacement de l'affichage progressif par les résultats complets
+    live.empty()
+
+# Mots-clés permettant de rattacher une phrase de la justification à chaque critère
+# (mots-clés recherchés, mots-clés des autres critères à exclure)
+SECTION_KEYWORDS = {
+    "experience": (["expérience", "carrière", "travaillé", "poste", "emploi", "fonction", "années"], ["éducation", "secteur"]),
+    "education": (["éducation", "formation", "diplôme", "master", "études", "école", "université", "niveau"], ["expérience", "secteur"]),
+    "secteur": (["secteur", "activité", "industrie", "domaine", "technologie", "marché"], ["expérience", "éducation"])
+}
+
+def _section_sentence(sentences, section):
+    """Première phrase courte de la justification consacrée à un seul critère"""
+    keywords, excluded = SECTION_KEYWORDS[section]
+    for sentence in sentences:
+        lowered = sentence.lower()
+        if any(keyword in lowered for keyword in keywords) and not any(other in lowered for other in excluded) and len(sentence) < 200:
+            return sentence + " "
+    return ""
+
+def build_result_view(result):
+    """
+    Prépare une seule fois tout ce que l'affichage dérive du résultat: résumés par critère,
+    raisonnement nettoyé, sérialisations JSON et CSV
+    """
+    details = result.get("details", {})
+    justification = result.get("justification", "")
+    sentences = re.split(r'(?<=[.!?])\s+', justification) if "justification" in result else []
+    
+    # Supprimer les délimiteurs de blocs de code JSON/Markdown du raisonnement
+    raisonnement = result.get("raisonnement") or ""
+    cleaned_raisonnement = re.sub(r"^```(?:json)?\n?|'''\n?$", '', raisonnement, flags=re.MULTILINE).strip() if raisonnement else ""
+    
+    csv_rows = [{
+        "URL": result.get("url", ""),
+        "Nom": details.get("nom", ""),
+        "Titre": details.get("titre", ""),
+        "Score": result.get("score", 0),
+        "Expérience (années)": details.get("experience_annees", ""),
+        "Niveau d'éducation": details.get("niveau_education", ""),
+        "Secteur d'activité": details.get("secteur_activite", "")
+    }]
+    csv_buffer = io.StringIO()
+    writer = csv.DictWriter(csv_buffer, fieldnames=list(csv_rows[0]))
+    writer.writeheader()
+    writer.writerows(csv_rows)
+    
+    return {
+        "justification_intro": justification.split("\n\n")[0],
+        "experience_text": f"Le candidat possède {details.get('experience_annees', 'N/A')} années d'expérience professionnelle. "
+                           + _section_sentence(sentences, "experience"),
+        "education_text": f"Le niveau d'éducation identifié est '{details.get('niveau_education', 'N/A')}'. "
+                          + _section_sentence(sentences, "education"),
+        "sector_text": f"Le secteur d'activité identifié est '{details.get('secteur_activite', 'N/A')}'. "
+                       + _section_sentence(sentences, "secteur"),
+        "raisonnement": cleaned_raisonnement,
+        "json": json.dumps(result, indent=2, ensure_ascii=False),
+        "csv_rows": csv_rows,
+        "csv": csv_buffer.getvalue(),
+        "timings_rows": [
+            {"Étape": name[:-len("_ms")], "Durée (ms)": duration}
+            for name, duration in result.get("timings", {}).items()
+        ]
     }
-    </style>
+
+def set_result(result):
+    """
+    Mémorise le résultat affiché par la session, avec un jeton propre à cette analyse
+    (id() d'un objet peut être réutilisé après sa libération et ne peut donc pas servir de clé)
+    """
+    st.session_state["result"] = result
+    st.session_state["result_token"] = uuid.uuid4().hex
+
+def result_view_model(result):
     """
-    st.markdown(score_style, unsafe_allow_html=True)
+    Vue du résultat mémorisée dans la session: elle n'est reconstruite que si le résultat
+    ou son score (pondérations modifiées) change, pas à chaque exécution du script
+    """
+    signature = (
+        st.session_state.get("result_token"),
+        result.get("score"),
+        tuple(result.get("ponderations", {}).items())
+    )
+    cached = st.session_state.get("result_view")
+    if cached is None or cached[0] != signature:
+        cached = (signature, build_result_view(result))
+        st.session_state["result_view"] = cached
+    return cached[1]
+
+def show_results():
+    """Affiche les résultats de l'analyse et mesure la durée de leur rendu"""
+    started = time.perf_counter()
+    render_results()
+    elapsed = time.perf_counter() - started
+    metrics.STAGE_DURATION.observe(elapsed, stage="rendu_streamlit")
+    st.session_state["render_ms"] = round(elapsed * 1000, 1)
+
+def render_results():
+    """Construit l'affichage des résultats de l'analyse (onglets)"""
+    if "result" not in st.session_state:
+        return
+    
+    result = st.session_state["result"]
+    view = result_view_model(result)
     
     # Séparation en tabs pour organiser les résultats
     tab1, tab2, tab3 = st.tabs(["📋 Synthèse", "🔍 Analyse détaillée", "🧩 Données techniques"])
@@ -658,38 +1079,8 @@ def show_results():
                 """, unsafe_allow_html=True)
             
         with col_score:
-            # Déterminer les couleurs en fonction du score
-            label = ""
-            
-            if score >= 8:
-                label = "Excellent"
-            elif score >= 6:
-                label = "Bon"
-            elif score >= 4:
-                label = "Moyen"
-            else:
-                label = "Faible"
-                
-            # Calcul de l'angle pour le gradient conique
-            angle = score * 36  # 360 degrés / 10 = 36 degrés par point
-            
-            # Visualisation du score avec une jauge personnalisée - Amélioration du contraste
-            st.markdown(f"""
-            <div style="background: rgba(243, 244, 246, 0.7); border-radius: 12px; padding: 1.5rem; display: flex; flex-direction: column; align-items: center; justify-content: center; box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1); height: 100%; border-left: 3px solid #0A4D68;">
-                <h3 style="margin-bottom: 1rem; text-align: center; font-size: 1.25rem; color: #1E293B;">Score global</h3>
-                <div class="score-container">
-                    <div class="score-circle" style="--score-angle: {angle}deg;">
-                        <div style="display: flex; flex-direction: column; align-items: center;">
-                            <p class="score-value" style="color: #0A4D68;">{score}</p>
-                            <p class="score-label" style="color: #475569;">/10</p>
-                        </div>
-                    </div>
-                    <div style="background-color: #0A4D68; color: white; padding: 0.4rem 1rem; border-radius: 20px; font-weight: 600; margin-top: 0.5rem;">
-                        {label}
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            # Visualisation du score avec une jauge personnalisée
+            st.markdown(score_gauge_html(score), unsafe_allow_html=True)
             
         # Justification dans une section dédiée et visuellement améliorée - Amélioration du contraste
         st.markdown(f"""
@@ -742,76 +1133,10 @@ def show_results():
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("<h3 style='color: #0A4D68; border-left: 3px solid #0A4D68; padding-left: 10px;'>Raisonnement détaillé de l'IA</h3>", unsafe_allow_html=True)
         
-        if "raisonnement" in result and result["raisonnement"]:
-            # Nettoyer le texte brut
-            raisonnement_text = result["raisonnement"]
-            # Supprimer les délimiteurs de blocs de code JSON/Markdown
-            cleaned_raisonnement = re.sub(r"^```(?:json)?\n?|'''\n?$", '', raisonnement_text, flags=re.MULTILINE).strip()
+        if view["raisonnement"]:
             
-            # Structure du raisonnement en sections
-            st.markdown("""
-            <style>
-            .detail-section {
-                background-color: rgba(10, 77, 104, 0.05);
-                border-radius: 8px;
-                padding: 1.25rem;
-                margin-bottom: 1.5rem;
-                border-left: 3px solid #0A4D68;
-            }
-            .detail-section h4 {
-                color: #0A4D68;
-                margin-bottom: 1rem;
-                font-size: 1.2rem;
-                display: flex;
-                align-items: center;
-            }
-            .detail-section p {
-                margin-bottom: 0.75rem;
-                line-height: 1.7;
-                color: #1E293B;
-            }
-            .detail-section-icon {
-                background-color: #0A4D68;
-                color: white;
-                width: 32px;
-                height: 32px;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                margin-right: 12px;
-                font-size: 16px;
-            }
-            .score-detail {
-                display: flex;
-                align-items: center;
-                margin-top: 1rem;
-                padding: 0.75rem;
-                background-color: rgba(10, 77, 104, 0.1);
-                border-radius: 6px;
-            }
-            .score-detail-number {
-                font-size: 1.5rem;
-                font-weight: 700;
-                color: #0A4D68;
-                margin-right: 1rem;
-                min-width: 50px;
-                text-align: center;
-            }
-            .score-detail-text {
-                flex-grow: 1;
-            }
-            .score-calculation {
-                background-color: #f8fafc;
-                border: 1px dashed #cbd5e1;
-                border-radius: 6px;
-                padding: 1rem;
-                margin: 1rem 0;
-                font-family: monospace;
-                line-height: 1.6;
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            # Sous-scores attribués par l'IA (indépendants des pondérations)
+            sous_scores = result.get("sous_scores", {})
             
             # Section score global
             st.markdown(f"""
@@ -823,11 +1148,11 @@ def show_results():
                 <p>Score final : <strong style="font-size: 1.2rem; color: #0A4D68;">{result.get('score', 0)}/10</strong></p>
                 <div class="score-calculation">
                     <strong>Méthode de calcul :</strong><br>
-                    - Expérience ({result.get('ponderations', {}).get('experience', 40)}%) : {result["details"].get("experience_annees", "N/A")} années<br>
-                    - Éducation ({result.get('ponderations', {}).get('education', 30)}%) : {result["details"].get("niveau_education", "N/A")}<br>
-                    - Secteur ({result.get('ponderations', {}).get('secteur', 30)}%) : {result["details"].get("secteur_activite", "N/A")}
+                    - Expérience ({result.get('ponderations', {}).get('experience', 40)}%) : {result["details"].get("experience_annees", "N/A")} années · sous-score {sous_scores.get("experience", "N/A")}/10<br>
+                    - Éducation ({result.get('ponderations', {}).get('education', 30)}%) : {result["details"].get("niveau_education", "N/A")} · sous-score {sous_scores.get("education", "N/A")}/10<br>
+                    - Secteur ({result.get('ponderations', {}).get('secteur', 30)}%) : {result["details"].get("secteur_activite", "N/A")} · sous-score {sous_scores.get("secteur", "N/A")}/10
                 </div>
-                <p>{result.get('justification', '').split('\n\n')[0]}</p>
+                <p>{view["justification_intro"]}</p>
             </div>
             """, unsafe_allow_html=True)
             
@@ -841,20 +1166,8 @@ def show_results():
                 </h4>
             """, unsafe_allow_html=True)
             
-            # Créer un paragraphe court pour l'expérience
-            experience_text = f"Le candidat possède {result['details'].get('experience_annees', 'N/A')} années d'expérience professionnelle. "
-            if "justification" in result:
-                # Extraire des phrases pertinentes sur l'expérience
-                justification = result.get('justification', '')
-                exp_keywords = ["expérience", "carrière", "travaillé", "poste", "emploi", "fonction", "années"]
-                sentences = re.split(r'(?<=[.!?])\s+', justification)
-                for sentence in sentences:
-                    if any(keyword in sentence.lower() for keyword in exp_keywords) and "éducation" not in sentence.lower() and "secteur" not in sentence.lower() and len(sentence) < 200:
-                        experience_text += sentence + " "
-                        break
-            
             st.markdown(f"""
-                <p>{experience_text}</p>
+                <p>{view["experience_text"]}</p>
                 <div class="score-detail">
                     <div class="score-detail-number">{result["details"].get("experience_annees", "N/A")}</div>
                     <div class="score-detail-text">années d'expérience professionnelle identifiées</div>
@@ -871,20 +1184,8 @@ def show_results():
                 </h4>
             """, unsafe_allow_html=True)
             
-            # Créer un paragraphe court pour l'éducation
-            education_text = f"Le niveau d'éducation identifié est '{result['details'].get('niveau_education', 'N/A')}'. "
-            if "justification" in result:
-                # Extraire des phrases pertinentes sur l'éducation
-                justification = result.get('justification', '')
-                edu_keywords = ["éducation", "formation", "diplôme", "master", "études", "école", "université", "niveau"]
-                sentences = re.split(r'(?<=[.!?])\s+', justification)
-                for sentence in sentences:
-                    if any(keyword in sentence.lower() for keyword in edu_keywords) and "expérience" not in sentence.lower() and "secteur" not in sentence.lower() and len(sentence) < 200:
-                        education_text += sentence + " "
-                        break
-            
             st.markdown(f"""
-                <p>{education_text}</p>
+                <p>{view["education_text"]}</p>
                 <div class="score-detail">
                     <div class="score-detail-number">{result["details"].get("niveau_education", "N/A")}</div>
                     <div class="score-detail-text">niveau d'éducation identifié</div>
@@ -901,20 +1202,8 @@ def show_results():
                 </h4>
             """, unsafe_allow_html=True)
             
-            # Créer un paragraphe court pour le secteur
-            sector_text = f"Le secteur d'activité identifié est '{result['details'].get('secteur_activite', 'N/A')}'. "
-            if "justification" in result:
-                # Extraire des phrases pertinentes sur le secteur
-                justification = result.get('justification', '')
-                sector_keywords = ["secteur", "activité", "industrie", "domaine", "technologie", "marché"]
-                sentences = re.split(r'(?<=[.!?])\s+', justification)
-                for sentence in sentences:
-                    if any(keyword in sentence.lower() for keyword in sector_keywords) and "expérience" not in sentence.lower() and "éducation" not in sentence.lower() and len(sentence) < 200:
-                        sector_text += sentence + " "
-                        break
-            
             st.markdown(f"""
-                <p>{sector_text}</p>
+                <p>{view["sector_text"]}</p>
                 <div class="score-detail">
                     <div class="score-detail-number">{result["details"].get("secteur_activite", "N/A")}</div>
                     <div class="score-detail-text">secteur d'activité identifié</div>
@@ -924,7 +1213,7 @@ def show_results():
             
             # Raisonnement complet (caché dans un expander)
             with st.expander("Voir le raisonnement complet de l'IA"):
-                st.markdown(f'<div class="detailed-analysis-content" style="color: #1E293B; white-space: pre-line;">{cleaned_raisonnement}</div>', unsafe_allow_html=True)
+                st.markdown(f'<div class="detailed-analysis-content" style="color: #1E293B; white-space: pre-line;">{view["raisonnement"]}</div>', unsafe_allow_html=True)
                 
         else:
             st.markdown('<div style="background-color: rgba(10, 77, 104, 0.05); padding: 1rem; border-radius: 8px; border-left: 3px solid #0A4D68;">', unsafe_allow_html=True)
@@ -938,67 +1227,275 @@ def show_results():
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("<h3 style='color: #0A4D68; border-left: 3px solid #0A4D68; padding-left: 10px;'>Données techniques</h3>", unsafe_allow_html=True)
         
-        # Style pour les boutons de téléchargement
-        download_button_style = """
-        <style>
-        div.stDownloadButton > button {
-            background-color: rgba(10, 77, 104, 0.1) !important;
-            color: #0A4D68 !important;
-            border: 1px solid rgba(10, 77, 104, 0.3) !important;
-            padding: 0.5rem 1rem !important;
-            border-radius: 8px !important;
-            font-weight: 600 !important;
-            transition: all 0.3s !important;
-        }
-        div.stDownloadButton > button:hover {
-            background-color: rgba(10, 77, 104, 0.2) !important;
-            box-shadow: 0 4px 8px rgba(10, 77, 104, 0.2) !important;
-        }
-        </style>
-        """
-        st.markdown(download_button_style, unsafe_allow_html=True)
+        # Durée de chaque étape de l'analyse (Proxycurl, prompt, Gemini, parsing...)
+        if view["timings_rows"]:
+            st.markdown("**⏱️ Durée des étapes**")
+            st.dataframe(view["timings_rows"], hide_index=True)
+        if "render_ms" in st.session_state:
+            st.caption(f"Rendu Streamlit de l'affichage précédent: {st.session_state['render_ms']} ms")
         
         # Tabs internes pour différents formats de téléchargement
         download_tabs = st.tabs(["📄 Format JSON", "📊 Format CSV"])
         
         with download_tabs[0]:
-            st.json(result)
+            # JSON sérialisé une seule fois par résultat (st.json le resérialiserait à chaque rerun)
+            st.code(view["json"], language="json")
             
-            # Option pour télécharger les résultats
-            json_str = json.dumps(result, indent=2, ensure_ascii=False)
+            # Option pour télécharger les résultats (sérialisation préparée une seule fois)
             st.download_button(
                 label="💾 Télécharger (JSON)",
-                data=json_str,
+                data=view["json"],
                 file_name="linkedin_profile_analysis.json",
                 mime="application/json"
             )
         
         with download_tabs[1]:
-            # Option pour télécharger en CSV
-            csv_data = {
-                "URL": [result.get("url", "")],
-                "Nom": [result["details"].get("nom", "")],
-                "Titre": [result["details"].get("titre", "")],
-                "Score": [result.get("score", 0)],
-                "Expérience (années)": [result["details"].get("experience_annees", "")],
-                "Niveau d'éducation": [result["details"].get("niveau_education", "")],
-                "Secteur d'activité": [result["details"].get("secteur_activite", "")]
-            }
-            csv_df = pd.DataFrame(csv_data)
-            
             # Affichage du tableau
-            st.dataframe(csv_df)
+            st.dataframe(view["csv_rows"], hide_index=True)
             
             # Bouton de téléchargement
-            csv = csv_df.to_csv(index=False)
             st.download_button(
                 label="💾 Télécharger (CSV)",
-                data=csv,
+                data=view["csv"],
                 file_name="linkedin_profile_analysis.csv",
                 mime="text/csv"
             )
             
         st.markdown('</div>', unsafe_allow_html=True)
 
+def read_profile_urls(uploaded_file):
+    """
+    Lit les URLs de profils d'un fichier CSV (colonne "url" ou première colonne) ou TXT (une URL par ligne)
+    
+    Returns:
+        tuple: (URLs valides sans doublons, nombre de lignes ignorées)
+    """
+    if uploaded_file.name.lower().endswith(".csv"):
+        import pandas as pd
+        df = pd.read_csv(uploaded_file, dtype=str)
+        url_columns = [col for col in df.columns if col.strip().lower() in ("url", "linkedin_url", "linkedin", "profil")]
+        values = df[url_columns[0] if url_columns else df.columns[0]].dropna().tolist()
+    else:
+        values = uploaded_file.getvalue().decode("utf-8", errors="ignore").splitlines()
+    
+    urls, seen, ignored = [], set(), 0
+    for value in (value.strip() for value in values):
+        if not value:
+            continue
+        if not is_profile_url(value):
+            ignored += 1
+            continue
+        key = profile_key(value)
+        if key not in seen:
+            seen.add(key)
+            urls.append(value)
+    return urls, ignored
+
+def score_profile_row(linkedin_url, exp_weight, edu_weight, sector_weight, detail_level, tiered, results_cache):
+    """
+    Analyse un profil pour l'analyse en lot (exécuté dans un thread du pool) et retourne une ligne du tableau de résultats
+    """
+    started_at = time.monotonic()
+    cache_key = (profile_key(linkedin_url), detail_level, tiered)
+    try:
+        result = results_cache.get(cache_key)
+        if result is None:
+            result = scrape_linkedin.process_linkedin_profile(
+                linkedin_url, exp_weight, edu_weight, sector_weight, detail_level, tiered=tiered
+            )
+            results_cache.set(cache_key, result)
+        else:
+            scrape_linkedin.reweight_result(result, exp_weight, edu_weight, sector_weight)
+        details = result.get("details", {})
+        sous_scores = result.get("sous_scores", {})
+        row = {
+            "URL": linkedin_url,
+            "Nom": details.get("nom", ""),
+            "Titre": details.get("titre", ""),
+            "Score": result.get("score", 0),
+            "Score expérience": sous_scores.get("experience"),
+            "Score éducation": sous_scores.get("education"),
+            "Score secteur": sous_scores.get("secteur"),
+            "Expérience (années)": details.get("experience_annees", ""),
+            "Niveau d'éducation": details.get("niveau_education", ""),
+            "Secteur d'activité": details.get("secteur_activite", ""),
+            "Moteur": result.get("moteur_scoring", "gemini"),
+            "Erreur": ""
+        }
+    except Exception as e:
+        row = {"URL": linkedin_url, "Score": None, "Erreur": str(e)}
+    row["Durée (s)"] = round(time.monotonic() - started_at, 2)
+    return row
+
+def run_bulk_job(params, report_progress, results_cache):
+    """
+    Traitement d'une tâche "bulk" (thread worker de la file): les profils sont répartis sur un pool
+    de threads borné et la progression est enregistrée au fil des profils terminés
+    """
+    urls = params["urls"]
+    rows = [None] * len(urls)
+    report_progress(0, len(urls))
+    with ThreadPoolExecutor(max_workers=params["max_workers"], thread_name_prefix="bulk-scoring") as executor:
+        futures = {
+            executor.submit(
+                score_profile_row, url, params["exp_weight"], params["edu_weight"], params["sector_weight"],
+                params["detail_level"], params["tiered"], results_cache
+            ): index
+            for index, url in enumerate(urls)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows[futures[future]] = future.result()
+            report_progress(done, len(urls))
+    return rows
+
+def start_bulk_job(urls, exp_weight, edu_weight, sector_weight, detail_level, tiered, max_workers):
+    """
+    Soumet le lot à la file de tâches et le fait suivre par la session
+
+    Le lot se poursuit en arrière-plan même si la page est rechargée.
+    """
+    track_job("bulk", job_queue().submit("bulk", {
+        "urls": urls,
+        "exp_weight": exp_weight,
+        "edu_weight": edu_weight,
+        "sector_weight": sector_weight,
+        "detail_level": detail_level,
+        "tiered": tiered,
+        "max_workers": max_workers
+    }))
+
+@st.experimental_fragment(run_every=1)
+def bulk_progress():
+    """Affiche la progression du lot en cours (rafraîchie chaque seconde sans relancer toute la page)"""
+    job = job_queue().get(active_job_id("bulk"))
+    if job is None or job["status"] in (DONE, FAILED):
+        # Affichage des résultats complets par une exécution normale de la page
+        st.rerun()
+    
+    done, total = job["progress_done"], job["progress_total"] or len(job["params"]["urls"])
+    if job["started_at"] is None:
+        st.info("⏳ Lot en attente de traitement...")
+        return
+    elapsed = time.time() - job["started_at"]
+    throughput = done / elapsed * 60 if elapsed > 0 else 0.0
+    st.progress(done / total if total else 0.0, text=f"{done}/{total} profils analysés · {throughput:.1f} profils/min")
+
+# Colonnes numériques du tableau des résultats: les valeurs manquantes ("" ou None) deviennent NaN à l'export
+BULK_NUMERIC_COLUMNS = ["Score", "Score expérience", "Score éducation", "Score secteur", "Expérience (années)", "Durée (s)"]
+
+def bulk_results_parquet(df):
+    """
+    Sérialise le tableau des résultats d'un lot au format Parquet
+    
+    Les colonnes numériques sont converties en nombres (NaN si absentes), les autres en texte:
+    pyarrow refuse les colonnes mêlant nombres et chaînes.
+    
+    Returns:
+        bytes: Fichier Parquet, ou None si pyarrow n'est pas installé ou si la conversion échoue
+    """
+    import pandas as pd
+    export = df.copy()
+    for column in export.columns:
+        if column in BULK_NUMERIC_COLUMNS:
+            export[column] = pd.to_numeric(export[column], errors="coerce")
+        elif export[column].dtype == object:
+            export[column] = export[column].astype("string")
+    
+    buffer = io.BytesIO()
+    try:
+        export.to_parquet(buffer, index=False)
+    except (ImportError, ValueError, TypeError, NotImplementedError):
+        # Exceptions pyarrow comprises (ArrowInvalid, ArrowTypeError...): l'export CSV reste disponible
+        return None
+    return buffer.getvalue()
+
+def bulk_results_dataframe(job):
+    """Construit le tableau des résultats d'un lot terminé, trié par score décroissant"""
+    import pandas as pd
+    df = pd.DataFrame(job["result"])
+    return df.sort_values("Score", ascending=False, na_position="last").reset_index(drop=True)
+
+def bulk_page():
+    """Page d'analyse en lot: import d'un fichier d'URLs, scoring parallèle et export des résultats"""
+    st.markdown("<h1>Analyse en lot</h1>", unsafe_allow_html=True)
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 2rem;">
+        <p style="font-size: 1.1rem; font-weight: 500;">
+            Importez un fichier CSV ou TXT d'URLs LinkedIn pour scorer plusieurs profils en parallèle
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    uploaded_file = st.file_uploader("Fichier d'URLs (CSV avec une colonne \"url\", ou TXT avec une URL par ligne)", type=["csv", "txt"])
+    
+    with st.expander("⚙️ Paramètres d'évaluation"):
+        exp_weight = st.slider("💼 Expérience professionnelle", 0.1, 0.6, 0.4, 0.1, key="bulk_exp_weight")
+        edu_weight = st.slider("🎓 Niveau d'études", 0.1, 0.6, 0.3, 0.1, key="bulk_edu_weight")
+        sector_weight = st.slider("🏢 Secteur d'activité", 0.1, 0.6, 0.3, 0.1, key="bulk_sector_weight")
+        detail_level = st.radio("📈 Niveau de détail de l'analyse:", ["standard", "approfondi"], index=0, key="bulk_detail_level")
+        tiered = st.checkbox("⚡ Scoring local d'abord (Gemini seulement si nécessaire)", value=True, key="bulk_tiered")
+        max_workers = st.slider("🧵 Profils analysés en parallèle", 1, 16, BULK_MAX_WORKERS, key="bulk_max_workers")
+        
+        # Normaliser les poids pour qu'ils totalisent 1.0
+        total = exp_weight + edu_weight + sector_weight
+        exp_weight = round(exp_weight / total, 2)
+        edu_weight = round(edu_weight / total, 2)
+        sector_weight = round(sector_weight / total, 2)
+    
+    job_id = active_job_id("bulk")
+    job = job_queue().get(job_id) if job_id else None
+    running = job is not None and job["status"] not in (DONE, FAILED)
+    
+    if uploaded_file is not None:
+        urls, ignored = read_profile_urls(uploaded_file)
+        st.caption(f"{len(urls)} profils distincts à analyser" + (f" · {ignored} lignes ignorées (URL invalide)" if ignored else ""))
+        if st.button("🚀 LANCER L'ANALYSE EN LOT", type="primary", use_container_width=True, disabled=running or not urls):
+            start_bulk_job(urls, exp_weight, edu_weight, sector_weight, detail_level, tiered, max_workers)
+            running = True
+    
+    if running:
+        bulk_progress()
+        return
+    
+    if job is None:
+        return
+    if job["status"] == FAILED:
+        st.error(f"❌ Le lot a échoué: {job['error']}")
+        return
+    
+    # Lot terminé: tableau triable (clic sur les en-têtes) et exports
+    df = bulk_results_dataframe(job)
+    duration = job["finished_at"] - job["started_at"]
+    errors = int((df["Erreur"] != "").sum()) if "Erreur" in df else 0
+    st.success(f"✅ {len(df)} profils traités en {duration:.1f} s ({len(df) / duration * 60 if duration > 0 else 0:.1f} profils/min), {errors} échecs")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    
+    col_csv, col_parquet = st.columns(2)
+    with col_csv:
+        st.download_button(
+            label="💾 Télécharger (CSV)",
+            data=df.to_csv(index=False),
+            file_name="linkedin_profiles_scores.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    
+    # Fichier Parquet préparé une seule fois par lot (pas à chaque réexécution de la page)
+    if st.session_state.get("bulk_parquet_job") != job_id:
+        st.session_state["bulk_parquet"] = bulk_results_parquet(df)
+        st.session_state["bulk_parquet_job"] = job_id
+    parquet_data = st.session_state["bulk_parquet"]
+    if parquet_data is not None:
+        with col_parquet:
+            st.download_button(
+                label="💾 Télécharger (Parquet)",
+                data=parquet_data,
+                file_name="linkedin_profiles_scores.parquet",
+                mime="application/octet-stream",
+                use_container_width=True
+            )
+    else:
+        col_parquet.caption("Export Parquet indisponible (pyarrow non installé ou colonnes non convertibles)")
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
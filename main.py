@@ -1,45 +1,96 @@
+import argparse
 import asyncio
 import json
 import logging
 import sys
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set
 
 from dotenv import load_dotenv
-from src.linkedin_scraper import LinkedInCrawl4AIScraper
+
+# Chargement des variables d'environnement (avant les modules src, qui lisent leur configuration à l'import)
+load_dotenv()
+
 from src.scoring_system import ProfileScorer
+from src import http_client
+from src import metrics
+from src.results_writer import JsonlResultsWriter, load_checkpoint, validate_jsonl_file
+from src.linkedin_url import dedupe_profile_urls, profile_key
+import scrape_linkedin
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('linkedin_agent.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Chargement des variables d'environnement
-load_dotenv()
+def configure_logging() -> None:
+    """
+    Configure le logging de la ligne de commande (stderr et linkedin_agent.log)
+    
+    Appelée au lancement du programme seulement: importer ce module (tests, bancs d'essai)
+    ne crée aucun fichier de log.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler('linkedin_agent.log')
+        ]
+    )
 
-async def process_profile(url: str) -> Dict:
+# Nombre maximal de profils traités simultanément en mode lot
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", 20))
+
+# Nombre de profils regroupés par appel Gemini (moteur proxycurl, 1 = un appel par profil)
+GEMINI_BATCH_SIZE = int(os.getenv("GEMINI_BATCH_SIZE", 1))
+
+async def process_profile(
+    url: str,
+    engine: str = "crawl4ai",
+    batcher=None,
+    confidence_threshold: Optional[float] = None,
+    local_batcher=None
+) -> Dict:
     """
     Traite un profil LinkedIn: extraction des données et calcul du score
     
     Args:
         url (str): URL du profil LinkedIn
+        engine (str): "crawl4ai" (scraping + scoring local) ou "proxycurl" (Proxycurl + Gemini, asynchrone)
+        batcher (AsyncMicroBatcher, optional): Regroupeur d'analyses Gemini (moteur proxycurl)
+        confidence_threshold (float, optional): Active le scoring hiérarchisé (moteur proxycurl):
+            Gemini n'est appelé que si la confiance du scoring local est inférieure à ce seuil
+        local_batcher (AsyncMicroBatcher, optional): Regroupeur du scoring local hiérarchisé
+            (une passe vectorisée pour les profils extraits simultanément)
         
     Returns:
-        Dict: Résultat complet (données du profil + score)
+        Dict: Résultat complet (données du profil + score), avec la durée de chaque étape
+        en millisecondes dans "timings"
     """
     try:
         logger.info(f"Traitement du profil: {url}")
         
-        # 1. Extraction des données du profil
-        scraper = LinkedInCrawl4AIScraper()
-        profile_data = await scraper.scrape_profile(url)
+        if engine == "proxycurl":
+            # Pipeline Proxycurl + Gemini entièrement asynchrone
+            tiered = {}
+            if confidence_threshold is not None:
+                tiered = {"tiered": True, "confidence_threshold": confidence_threshold, "local_batcher": local_batcher}
+            analysis = await scrape_linkedin.process_linkedin_profile_async(url, batcher=batcher, **tiered)
+            logger.info(f"✅ Traitement terminé pour {url} - Score: {analysis.get('score')}/10 ({analysis.get('moteur_scoring')})")
+            return {
+                "url": url,
+                "analysis": analysis,
+                "timings": analysis.pop("timings", {}),
+                "timestamp": datetime.now().isoformat(),
+                "success": True
+            }
+        
+        timings = metrics.StageTimings()
+        
+        # 1. Extraction des données du profil (import différé: crawl4ai et son navigateur ne sont chargés que pour ce moteur)
+        with timings.stage("scraping"):
+            from src.linkedin_scraper import LinkedInCrawl4AIScraper
+            scraper = LinkedInCrawl4AIScraper()
+            profile_data = await scraper.scrape_profile(url)
         
         if not profile_data:
             logger.error(f"❌ Échec de l'extraction pour {url}")
@@ -50,14 +101,17 @@ async def process_profile(url: str) -> Dict:
             }
         
         # 2. Calcul du score
-        scorer = ProfileScorer()
-        score_result = scorer.calculate_score(profile_data)
+        with timings.stage("scoring_local"):
+            scorer = ProfileScorer()
+            score_result = scorer.calculate_score(profile_data)
+        metrics.ANALYSES.inc(engine="crawl4ai", status="success")
         
         # 3. Combinaison des résultats
         result = {
             "url": url,
             "profile_data": profile_data,
             "score_result": score_result,
+            "timings": timings.finish(),
             "timestamp": datetime.now().isoformat(),
             "success": True
         }
@@ -74,24 +128,40 @@ async def process_profile(url: str) -> Dict:
             "success": False
         }
 
-async def process_multiple_profiles(urls: List[str], output_file: Optional[str] = None) -> List[Dict]:
+async def process_multiple_profiles(
+    urls: List[str],
+    output_file: Optional[str] = None,
+    engine: str = "crawl4ai",
+    max_concurrency: int = MAX_CONCURRENCY,
+    gemini_batch_size: int = GEMINI_BATCH_SIZE,
+    confidence_threshold: Optional[float] = None
+) -> List[Dict]:
     """
-    Traite plusieurs profils LinkedIn en parallèle
+    Traite plusieurs profils LinkedIn en parallèle, avec un nombre borné de
+    profils en cours de traitement
+    
+    Le débit vers chaque fournisseur (Proxycurl, Gemini) est en outre limité par
+    les seaux à jetons de scrape_linkedin.
     
     Args:
         urls (List[str]): Liste des URLs de profils LinkedIn
         output_file (str, optional): Chemin du fichier de sortie pour les résultats
+        engine (str): Moteur d'extraction et de scoring ("crawl4ai" ou "proxycurl")
+        max_concurrency (int): Nombre maximal de profils traités simultanément
+        gemini_batch_size (int): Nombre de profils regroupés par appel Gemini (moteur proxycurl)
+        confidence_threshold (float, optional): Seuil de confiance du scoring hiérarchisé (None = désactivé)
         
     Returns:
         List[Dict]: Liste des résultats pour chaque profil
     """
-    logger.info(f"Traitement de {len(urls)} profils...")
+    logger.info(f"Traitement de {len(urls)} profils (max {max_concurrency} en parallèle)...")
+    
+    results: List[Optional[Dict]] = [None] * len(urls)
     
-    # Création de toutes les tâches pour le traitement en parallèle
-    tasks = [process_profile(url) for url in urls]
+    def store(index: int, result: Dict) -> None:
+        results[index] = result
     
-    # Exécution de toutes les tâches de manière concurrente
-    results = await asyncio.gather(*tasks)
+    await _run_workers(urls, engine, max_concurrency, store, gemini_batch_size, confidence_threshold)
     
     # Enregistrement des résultats dans un fichier si demandé
     if output_file:
@@ -112,24 +182,244 @@ async def process_multiple_profiles(urls: List[str], output_file: Optional[str]
     error_count = len(results) - success_count
     
     logger.info(f"📊 Bilan: {success_count} profils traités avec succès, {error_count} échecs")
+    if confidence_threshold is not None:
+        tiers = _tier_counts(results)
+        logger.info(f"📊 Scoring hiérarchisé: {tiers['local']} profils scorés localement, {tiers['gemini']} transmis à Gemini (taux d'escalade: {tiers['escalation_rate']:.0%})")
     
     return results
 
+async def stream_multiple_profiles(
+    urls: List[str],
+    output_file: str,
+    engine: str = "crawl4ai",
+    max_concurrency: int = MAX_CONCURRENCY,
+    write_summary: bool = True,
+    append: bool = False,
+    gemini_batch_size: int = GEMINI_BATCH_SIZE,
+    confidence_threshold: Optional[float] = None
+) -> Dict:
+    """
+    Traite plusieurs profils LinkedIn en écrivant chaque résultat dès qu'il est
+    disponible dans un fichier JSON Lines, sans conserver les résultats en mémoire
+    
+    Args:
+        urls (List[str]): Liste des URLs de profils LinkedIn
+        output_file (str): Chemin du fichier .jsonl de sortie
+        engine (str): Moteur d'extraction et de scoring ("crawl4ai" ou "proxycurl")
+        max_concurrency (int): Nombre maximal de profils traités simultanément
+        write_summary (bool): Ajouter un enregistrement de synthèse en fin de fichier
+        append (bool): Compléter le fichier existant (reprise) au lieu de l'écraser
+        gemini_batch_size (int): Nombre de profils regroupés par appel Gemini (moteur proxycurl)
+        confidence_threshold (float, optional): Seuil de confiance du scoring hiérarchisé (None = désactivé)
+        
+    Returns:
+        Dict: Bilan du traitement (total, succès, échecs, durée et, en scoring hiérarchisé, taux d'escalade vers Gemini)
+    """
+    logger.info(f"Traitement de {len(urls)} profils en flux vers {output_file} (max {max_concurrency} en parallèle)...")
+    
+    started_at = datetime.now()
+    summary = {"total": len(urls), "success": 0, "errors": 0}
+    tiers = {"local": 0, "gemini": 0}
+    counted = set()
+    writer = JsonlResultsWriter(output_file, append=append)
+    
+    def write(index: int, result: Dict) -> None:
+        writer.write(result)
+        if result.get("success", False):
+            summary["success"] += 1
+            _count_tier(tiers, counted, result)
+        else:
+            summary["errors"] += 1
+    
+    try:
+        await _run_workers(urls, engine, max_concurrency, write, gemini_batch_size, confidence_threshold)
+    finally:
+        if confidence_threshold is not None:
+            summary["tiers"] = _escalation_summary(tiers)
+        summary["started_at"] = started_at.isoformat()
+        summary["finished_at"] = datetime.now().isoformat()
+        summary["duration_s"] = round((datetime.now() - started_at).total_seconds(), 3)
+        writer.close(summary if write_summary else None)
+    
+    logger.info(f"✅ Résultats enregistrés dans {output_file}")
+    logger.info(f"📊 Bilan: {summary['success']} profils traités avec succès, {summary['errors']} échecs")
+    
+    return summary
+
+def _escalation_summary(tiers: Dict[str, int]) -> Dict:
+    """Complète les compteurs par niveau de scoring avec le taux d'escalade vers Gemini"""
+    scored = tiers["local"] + tiers["gemini"]
+    return {**tiers, "escalation_rate": round(tiers["gemini"] / scored, 3) if scored else 0.0}
+
+def _count_tier(tiers: Dict[str, int], counted: Set[str], result: Dict) -> None:
+    """
+    Ajoute le niveau de scoring (local ou Gemini) d'un résultat réussi aux compteurs
+    
+    Les URLs d'un même profil (doublons regroupés par _run_workers) partagent un seul
+    traitement: le profil n'est compté qu'une fois.
+    """
+    tier = result.get("analysis", {}).get("moteur_scoring") if result.get("success") else None
+    key = profile_key(result.get("url", ""))
+    if tier in tiers and key not in counted:
+        counted.add(key)
+        tiers[tier] += 1
+
+def _tier_counts(results: List[Dict]) -> Dict:
+    """Compte les profils distincts scorés localement et ceux transmis à Gemini"""
+    tiers = {"local": 0, "gemini": 0}
+    counted = set()
+    for result in results:
+        _count_tier(tiers, counted, result)
+    return _escalation_summary(tiers)
+
+async def _run_workers(
+    urls: List[str],
+    engine: str,
+    max_concurrency: int,
+    on_result: Callable[[int, Dict], None],
+    gemini_batch_size: int = 1,
+    confidence_threshold: Optional[float] = None
+) -> None:
+    """
+    Exécute un nombre fixe de workers sur la liste d'URLs et transmet chaque
+    résultat à on_result(index, résultat) dès qu'il est disponible
+    
+    Les variantes d'une même URL de profil sont regroupées avant tout appel réseau:
+    le profil n'est traité qu'une fois et son résultat est transmis pour chaque URL d'origine.
+    """
+    groups = dedupe_profile_urls(urls)
+    if len(groups) < len(urls):
+        logger.info(f"🔗 {len(urls) - len(groups)} doublons regroupés ({len(groups)} profils distincts)")
+    pending = iter(groups)
+    
+    batcher = None
+    local_batcher = None
+    if engine == "proxycurl":
+        # Pool de connexions dimensionné selon la concurrence
+        await http_client.get_async_session(pool_size=max_concurrency)
+        if gemini_batch_size > 1:
+            # Plusieurs profils par appel Gemini pour amortir le coût fixe de chaque requête
+            batcher = scrape_linkedin.create_gemini_batcher(batch_size=min(gemini_batch_size, max_concurrency))
+        if confidence_threshold is not None:
+            # Scoring local des profils extraits simultanément en une seule passe vectorisée
+            local_batcher = scrape_linkedin.create_local_batcher(
+                confidence_threshold=confidence_threshold, batch_size=max_concurrency
+            )
+    
+    async def worker():
+        # Les workers se partagent le même itérateur: chaque URL n'est traitée qu'une fois
+        for url, indices in pending:
+            result = await process_profile(url, engine, batcher, confidence_threshold, local_batcher)
+            for index in indices:
+                on_result(index, {**result, "url": urls[index]})
+    
+    # Exécution d'un nombre fixe de workers au lieu d'une tâche par URL
+    await asyncio.gather(*(worker() for _ in range(max(1, min(max_concurrency, len(groups))))))
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        description="Extraction et scoring de profils LinkedIn",
+        epilog=(
+            "Exemples:\n"
+            "  1. Traiter un seul profil:  python main.py <url_linkedin>\n"
+            "  2. Traiter plusieurs profils:  python main.py --file <chemin_fichier_urls>"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("url", nargs="?", help="URL du profil LinkedIn à traiter")
+    source.add_argument("--file", help="Fichier contenant une URL de profil par ligne")
+    parser.add_argument(
+        "--engine",
+        choices=["crawl4ai", "proxycurl"],
+        default="crawl4ai",
+        help="Moteur d'extraction et de scoring (proxycurl = Proxycurl + Gemini asynchrone)"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENCY,
+        help=f"Nombre maximal de profils traités simultanément (défaut: {MAX_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="Écrire chaque résultat dès qu'il est disponible (JSON Lines) au lieu d'un JSON unique en fin de lot"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="FICHIER_JSONL",
+        help="Reprendre un lot interrompu: ignore les URLs déjà traitées avec succès dans ce fichier et y ajoute les nouveaux résultats"
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Avec --resume, retraiter aussi les URLs en échec"
+    )
+    parser.add_argument(
+        "--gemini-batch-size",
+        type=int,
+        default=GEMINI_BATCH_SIZE,
+        help=f"Nombre de profils analysés par appel Gemini avec --engine proxycurl (défaut: {GEMINI_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--tiered",
+        nargs="?",
+        type=float,
+        const=scrape_linkedin.LOCAL_CONFIDENCE_THRESHOLD,
+        metavar="SEUIL",
+        help=(
+            "Scoring hiérarchisé avec --engine proxycurl: scoring local d'abord, Gemini seulement si la confiance "
+            f"est inférieure au seuil (défaut: {scrape_linkedin.LOCAL_CONFIDENCE_THRESHOLD})"
+        )
+    )
+    parser.add_argument("--proxycurl-rps", type=float, help="Requêtes/seconde maximum vers Proxycurl (0 = illimité)")
+    parser.add_argument("--gemini-rps", type=float, help="Requêtes/seconde maximum vers Gemini (0 = illimité)")
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=metrics.METRICS_PORT,
+        help="Port local exposant les métriques au format Prometheus (GET /metrics) pendant l'exécution (0 = désactivé)"
+    )
+    args = parser.parse_args(argv)
+    
+    # Options de reprise: uniquement en mode lot, et sur un fichier JSON Lines existant
+    if args.resume and not args.file:
+        parser.error("--resume nécessite une liste d'URLs (--file)")
+    if args.retry_failed and not args.resume:
+        parser.error("--retry-failed nécessite --resume")
+    # Le scoring hiérarchisé n'existe que dans le pipeline Proxycurl + Gemini
+    if args.tiered is not None and args.engine != "proxycurl":
+        parser.error("--tiered nécessite --engine proxycurl")
+    if args.resume:
+        try:
+            validate_jsonl_file(args.resume)
+        except ValueError as e:
+            parser.error(f"--resume: {e}")
+    return args
+
 async def main():
     """Fonction principale du script"""
+    args = parse_args()
+    
+    # Limites de débit par fournisseur
+    if args.proxycurl_rps is not None:
+        scrape_linkedin.proxycurl_limiter.set_rate(args.proxycurl_rps)
+    if args.gemini_rps is not None:
+        scrape_linkedin.gemini_limiter.set_rate(args.gemini_rps)
+    
+    if args.metrics_port:
+        metrics.start_metrics_server(args.metrics_port)
+        logger.info(f"📈 Métriques exposées sur http://{metrics.METRICS_HOST}:{args.metrics_port}/metrics")
+    
     try:
-        # Vérification des arguments de la ligne de commande
-        if len(sys.argv) < 2:
-            print("Usage:")
-            print(f"  1. Traiter un seul profil:  python {sys.argv[0]} <url_linkedin>")
-            print(f"  2. Traiter plusieurs profils:  python {sys.argv[0]} --file <chemin_fichier_urls>")
-            sys.exit(1)
-        
         # Déterminer le mode d'exécution
-        if sys.argv[1] == "--file" and len(sys.argv) >= 3:
+        if args.file:
             # Mode traitement par lot depuis un fichier
-            input_file = sys.argv[2]
-            output_file = f"output/results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            input_file = args.file
+            extension = "jsonl" if args.jsonl else "json"
+            output_file = f"output/results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
             
             if not os.path.exists(input_file):
                 logger.error(f"❌ Fichier d'entrée introuvable: {input_file}")
@@ -139,18 +429,41 @@ async def main():
             with open(input_file, 'r', encoding='utf-8') as f:
                 urls = [line.strip() for line in f if line.strip()]
             
-            # Traitement des profils
-            results = await process_multiple_profiles(urls, output_file)
-            
-            # Affichage des résultats en sortie standard
-            print(json.dumps(results, ensure_ascii=False, indent=2))
+            if args.resume:
+                # Reprise: seules les URLs non encore traitées sont envoyées aux API
+                succeeded, failed = load_checkpoint(args.resume)
+                done = succeeded if args.retry_failed else succeeded | failed
+                done_keys = {profile_key(url) for url in done}
+                remaining = [url for url in urls if profile_key(url) not in done_keys]
+                logger.info(f"🔁 Reprise depuis {args.resume}: {len(urls) - len(remaining)} profils déjà traités, {len(remaining)} restants")
+                
+                summary = await stream_multiple_profiles(
+                    remaining, args.resume, args.engine, args.max_concurrency,
+                    append=True, gemini_batch_size=args.gemini_batch_size, confidence_threshold=args.tiered
+                )
+                print(json.dumps(summary, ensure_ascii=False, indent=2))
+            elif args.jsonl:
+                # Traitement en flux: seul le bilan est affiché, les résultats sont dans le fichier
+                summary = await stream_multiple_profiles(
+                    urls, output_file, args.engine, args.max_concurrency,
+                    gemini_batch_size=args.gemini_batch_size, confidence_threshold=args.tiered
+                )
+                print(json.dumps(summary, ensure_ascii=False, indent=2))
+            else:
+                # Traitement des profils
+                results = await process_multiple_profiles(
+                    urls, output_file, args.engine, args.max_concurrency, args.gemini_batch_size, args.tiered
+                )
+                
+                # Affichage des résultats en sortie standard
+                print(json.dumps(results, ensure_ascii=False, indent=2))
             
         else:
             # Mode traitement d'un seul profil
-            url = sys.argv[1]
+            url = args.url
             
             # Traitement du profil
-            result = await process_profile(url)
+            result = await process_profile(url, args.engine, confidence_threshold=args.tiered)
             
             # Affichage du résultat en sortie standard
             print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -158,7 +471,12 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Erreur globale: {str(e)}")
         sys.exit(1)
+    finally:
+        # Libération des connexions des clients HTTP partagés
+        http_client.close_session()
+        await http_client.close_async_session()
 
 if __name__ == "__main__":
     # Point d'entrée du programme
+    configure_logging()
     asyncio.run(main()) 
\ No newline at end of file
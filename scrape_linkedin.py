@@ -1,88 +1,342 @@
 import requests
+import copy
 import json
 import sys
-import google.generativeai as genai
 import re
 import os
+import hashlib
+import asyncio
+import logging
+import threading
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Chargement des variables d'environnement
+# Chargement des variables d'environnement (avant les modules src, qui lisent leur configuration à l'import)
 load_dotenv()
 
+from src.cache import PersistentCache, SingleFlight
+from src.linkedin_url import canonical_profile_url, profile_key
+from src import http_client
+from src import metrics
+from src.rate_limit import AsyncTokenBucket
+from src.batching import AsyncMicroBatcher
+from src.schemas import GEMINI_ANALYSIS_SCHEMA, GeminiAnalysis
+from src.profile_compaction import DATE_DERIVED_FIELDS, compact_profile
+from src.scoring_system import ProfileScorer
+from pydantic import ValidationError
+
+# Journal du module: stdout reste réservé aux résultats (sortie JSON de main.py)
+logger = logging.getLogger(__name__)
+
 # Configuration Proxycurl
 API_KEY = os.getenv("PROXYCURL_API_KEY")
 API_ENDPOINT = "https://nubela.co/proxycurl/api/v2/linkedin"
 HEADERS = {"Authorization": f"Bearer {API_KEY}"}
 
+# Cache persistant des réponses Proxycurl (évite de repayer un appel pour un profil déjà extrait)
+CACHE_PATH = os.getenv("CACHE_PATH", "cache/linkedin_cache.sqlite3")
+PROXYCURL_CACHE_TTL = float(os.getenv("PROXYCURL_CACHE_TTL", 7 * 24 * 3600))
+PROXYCURL_CACHE_MAX_ENTRIES = int(os.getenv("PROXYCURL_CACHE_MAX_ENTRIES", 5000))
+
+# Limites de débit par fournisseur (requêtes/seconde, 0 = illimité) pour le mode asynchrone
+PROXYCURL_RPS = float(os.getenv("PROXYCURL_RPS", 5))
+GEMINI_RPS = float(os.getenv("GEMINI_RPS", 5))
+proxycurl_limiter = AsyncTokenBucket(PROXYCURL_RPS)
+gemini_limiter = AsyncTokenBucket(GEMINI_RPS)
+
+# Scoring hiérarchisé: Gemini n'est appelé que si la confiance du scoring local est inférieure à ce seuil
+LOCAL_CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_CONFIDENCE_THRESHOLD", 0.8))
+
 # Configuration Gemini
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-genai.configure(api_key=GEMINI_API_KEY)
+# Sortie JSON structurée (response_mime_type) conforme au schéma GeminiAnalysis, si le SDK installé
+# la prend en charge (voir structured_output_enabled); désactivée par défaut: mode texte
+GEMINI_STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "false").lower() == "true"
+
+# Cache des analyses Gemini (clé = contenu du profil + paramètres de scoring + modèle)
+GEMINI_CACHE_TTL = float(os.getenv("GEMINI_CACHE_TTL", 30 * 24 * 3600))
+GEMINI_CACHE_MAX_ENTRIES = int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", 5000))
 
-def extract_linkedin_data(linkedin_url):
+# Analyses Gemini en cours, par clé de cache: un profil demandé simultanément par plusieurs
+# threads ou tâches (file de tâches, analyse en lot) n'est soumis qu'une fois à Gemini
+gemini_in_flight = SingleFlight()
+
+# Caches persistants, par table, ouverts au premier usage: l'import du module ne crée aucun fichier
+_caches = {}
+_caches_lock = threading.Lock()
+
+def _persistent_cache(table, ttl, max_entries):
+    """
+    Retourne le cache persistant d'une table de CACHE_PATH, créé au premier appel
+    
+    Ses statistiques sont alors exposées sur le point de métriques (voir src/metrics.py).
+    """
+    cache = _caches.get(table)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(table)
+            if cache is None:
+                cache = PersistentCache(CACHE_PATH, table, ttl=ttl, max_entries=max_entries)
+                metrics.register_cache(table, cache)
+                _caches[table] = cache
+    return cache
+
+def proxycurl_cache():
+    """Cache persistant des réponses Proxycurl"""
+    return _persistent_cache("proxycurl", PROXYCURL_CACHE_TTL, PROXYCURL_CACHE_MAX_ENTRIES)
+
+def gemini_cache():
+    """Cache persistant des analyses Gemini"""
+    return _persistent_cache("gemini", GEMINI_CACHE_TTL, GEMINI_CACHE_MAX_ENTRIES)
+
+# Lignes "Score expérience: X.XX/10" demandées à Gemini, détectables au fil du flux
+SUB_SCORE_PATTERN = re.compile(r'Score (exp[ée]rience|[ée]ducation|secteur)\s*:\s*(\d+(?:[\.,]\d+)?)\s*\/\s*10', re.IGNORECASE)
+
+# Analyse de secours en une seule passe: lignes de sous-scores, champs de détail et débuts d'objets JSON
+RESPONSE_SCAN_PATTERN = re.compile(
+    r'Score (?P<criterion>exp[ée]rience|[ée]ducation|secteur)\s*:\s*(?P<score>\d+(?:[\.,]\d+)?)\s*\/\s*10'
+    r'|"?(?P<field>experience_annees|niveau_education|secteur_activite)"?\s*:\s*"?(?P<value>[^",\n}]+)'
+    r'|(?P<brace>\{)',
+    re.IGNORECASE
+)
+JSON_DECODER = json.JSONDecoder()
+
+def extract_linkedin_data(linkedin_url, use_cache=True):
     """
     Extrait les données d'un profil LinkedIn via l'API Proxycurl
+    
+    Args:
+        linkedin_url (str): URL du profil LinkedIn
+        use_cache (bool): Utiliser le cache persistant des réponses Proxycurl
+    
+    Returns:
+        dict: Données du profil, ou None en cas d'échec (réponse autre que 200 comprise)
     """
-    print(f"Extraction des données du profil: {linkedin_url}")
+    logger.info(f"Extraction des données du profil: {linkedin_url}")
+    
+    cache_key = profile_key(linkedin_url)
+    if use_cache:
+        cached_data = proxycurl_cache().get(cache_key)
+        if cached_data is not None:
+            logger.info(f"Profil trouvé dans le cache ({proxycurl_cache().stats()})")
+            return cached_data
     
     params = {
-        "url": linkedin_url,
+        "url": canonical_profile_url(linkedin_url) or linkedin_url,
         "fallback_to_cache": "on-error",
         "use_cache": "if-present"
     }
     
     try:
-        response = requests.get(API_ENDPOINT, params=params, headers=HEADERS)
+        # Client HTTP partagé: keep-alive, timeouts et nouvelles tentatives sur 429/5xx
+        response = http_client.get(API_ENDPOINT, params=params, headers=HEADERS)
         
         # Affichage des détails de la requête et de la réponse pour le debugging
-        print("\n===== DÉTAILS DE LA REQUÊTE =====")
-        print(f"URL: {response.request.url}")
-        print(f"Headers: {dict(response.request.headers)}")  # Masque l'API key
+        logger.debug(f"Requête: {response.request.url}")
+        logger.debug(f"Réponse: status {response.status_code}, headers {dict(response.headers)}")
         
-        print("\n===== DÉTAILS DE LA RÉPONSE =====")
-        print(f"Status Code: {response.status_code}")
-        print(f"Headers: {dict(response.headers)}")
+        # Profil introuvable, quota dépassé, ou 429/5xx persistant après les nouvelles tentatives:
+        # le corps de la réponse (message d'erreur) n'est pas un profil
+        if response.status_code != 200:
+            logger.error(f"Réponse Proxycurl en erreur pour {linkedin_url} (status {response.status_code}): {response.text[:500]}")
+            return None
         
         # Tenter de parser le JSON pour vérifier sa validité
         try:
             data = response.json()
-            print("\n===== CONTENU DE LA RÉPONSE (JSON) =====")
-            print(json.dumps(data, indent=2, ensure_ascii=False))
+            logger.debug("Contenu de la réponse (JSON):\n%s", json.dumps(data, indent=2, ensure_ascii=False))
+            
+            # Seules les réponses valides sont mises en cache
+            if data:
+                proxycurl_cache().set(cache_key, data)
             return data
         except json.JSONDecodeError:
-            print("\n===== CONTENU DE LA RÉPONSE (RAW) =====")
-            print(response.text[:2000])  # Afficher les 2000 premiers caractères pour éviter une sortie trop longue
-            print("..." if len(response.text) > 2000 else "")
-            print("\n[ERREUR] La réponse n'est pas au format JSON valide")
+            # Seuls les 2000 premiers caractères sont journalisés pour éviter une sortie trop longue
+            logger.error(f"La réponse n'est pas au format JSON valide: {response.text[:2000]}{'...' if len(response.text) > 2000 else ''}")
             return None
         
     except requests.exceptions.HTTPError as http_err:
-        print(f"Erreur HTTP: {http_err}")
+        logger.error(f"Erreur HTTP: {http_err}")
         return None
     except requests.exceptions.ConnectionError as conn_err:
-        print(f"Erreur de connexion: {conn_err}")
+        logger.error(f"Erreur de connexion: {conn_err}")
         return None
     except requests.exceptions.Timeout as timeout_err:
-        print(f"Erreur de timeout: {timeout_err}")
+        logger.error(f"Erreur de timeout: {timeout_err}")
         return None
     except requests.exceptions.RequestException as req_err:
-        print(f"Erreur de requête: {req_err}")
+        logger.error(f"Erreur de requête: {req_err}")
         return None
     except Exception as e:
-        print(f"Erreur inconnue: {e}")
+        logger.error(f"Erreur inconnue: {e}")
         return None
 
-def analyze_with_gemini(profile_data, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard"):
+async def extract_linkedin_data_async(linkedin_url, use_cache=True):
+    """
+    Variante asynchrone de extract_linkedin_data (client aiohttp partagé),
+    sans affichage détaillé de la requête pour rester lisible en mode lot
+    
+    Args:
+        linkedin_url (str): URL du profil LinkedIn
+        use_cache (bool): Utiliser le cache persistant des réponses Proxycurl
+    """
+    cache_key = profile_key(linkedin_url)
+    if use_cache:
+        # Accès SQLite exécutés hors de la boucle d'événements
+        cached_data = await asyncio.to_thread(proxycurl_cache().get, cache_key)
+        if cached_data is not None:
+            return cached_data
+    
+    params = {
+        "url": canonical_profile_url(linkedin_url) or linkedin_url,
+        "fallback_to_cache": "on-error",
+        "use_cache": "if-present"
+    }
+    
+    try:
+        status, data = await http_client.get_json_async(
+            API_ENDPOINT,
+            limiter=proxycurl_limiter,
+            params=params,
+            headers=HEADERS
+        )
+    except Exception as e:
+        logger.error(f"Erreur lors de l'extraction de {linkedin_url}: {e}")
+        return None
+    
+    # Profil introuvable, quota dépassé, ou 429/5xx persistant après les nouvelles tentatives
+    if status != 200:
+        logger.error(f"Réponse Proxycurl en erreur pour {linkedin_url} (status {status}): {data}")
+        return None
+    
+    if data is None:
+        logger.error(f"Réponse Proxycurl non JSON pour {linkedin_url} (status {status})")
+        return None
+    
+    # Seules les réponses valides sont mises en cache
+    if data:
+        await asyncio.to_thread(proxycurl_cache().set, cache_key, data)
+    return data
+
+def gemini_cache_key(profile_data, detail_level, model_name=None):
+    """
+    Calcule la clé de cache d'une analyse Gemini: empreinte SHA-256 du profil
+    canonicalisé et du niveau de détail, préfixée par le nom du modèle
+    
+    Les pondérations n'en font pas partie: Gemini ne renvoie que des sous-scores
+    indépendants, le score global étant recalculé localement. Les champs dépendant
+    de la date du jour (DATE_DERIVED_FIELDS) non plus: un profil inchangé garde sa clé
+    d'un mois sur l'autre, ses expériences brutes restant, elles, dans l'empreinte.
+    """
+    model_name = model_name or GEMINI_MODEL
+    stable_profile = {key: value for key, value in profile_data.items() if key not in DATE_DERIVED_FIELDS}
+    canonical = json.dumps(
+        {
+            "profile": stable_profile,
+            "detail_level": detail_level
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+def invalidate_gemini_cache(model_name=None):
+    """
+    Supprime les analyses en cache produites par un modèle donné
+    (toutes les analyses si model_name est None)
+    
+    Returns:
+        int: Nombre d'entrées supprimées
+    """
+    if model_name is None:
+        removed = gemini_cache().stats()["size"]
+        gemini_cache().clear()
+        return removed
+    return gemini_cache().delete_prefix(f"{model_name}:")
+
+def compute_global_score(sous_scores, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3):
+    """
+    Calcule localement le score global (0-10) à partir des sous-scores de Gemini
+    
+    Args:
+        sous_scores (dict): Sous-scores 0-10 ("experience", "education", "secteur")
+        exp_weight (float): Poids pour l'expérience professionnelle (0-1)
+        edu_weight (float): Poids pour le niveau d'éducation (0-1)
+        sector_weight (float): Poids pour le secteur d'activité (0-1)
+    
+    Returns:
+        float: Score global pondéré avec deux décimales
+    """
+    total_weight = exp_weight + edu_weight + sector_weight
+    if total_weight <= 0:
+        return 0.0
+    
+    weighted = (
+        float(sous_scores.get("experience", 0)) * exp_weight
+        + float(sous_scores.get("education", 0)) * edu_weight
+        + float(sous_scores.get("secteur", 0)) * sector_weight
+    )
+    return round(weighted / total_weight, 2)
+
+def reweight_result(result, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3):
+    """
+    Recalcule le score global d'un résultat existant avec de nouvelles pondérations,
+    sans nouvel appel à Proxycurl ni à Gemini
+    
+    Args:
+        result (dict): Résultat contenant des "sous_scores"
+        exp_weight (float): Poids pour l'expérience professionnelle (0-1)
+        edu_weight (float): Poids pour le niveau d'éducation (0-1)
+        sector_weight (float): Poids pour le secteur d'activité (0-1)
+    
+    Returns:
+        dict: Le même résultat, mis à jour
+    """
+    sous_scores = result.get("sous_scores")
+    if sous_scores:
+        result["score"] = compute_global_score(sous_scores, exp_weight, edu_weight, sector_weight)
+    
+    result["ponderations"] = {
+        "experience": int(round(exp_weight * 100)),
+        "education": int(round(edu_weight * 100)),
+        "secteur": int(round(sector_weight * 100))
+    }
+    return result
+
+def reweight_results(results, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3):
+    """
+    Recalcule localement le score global d'une liste de résultats (shortlist, lot)
+    
+    Returns:
+        list: Les résultats mis à jour, triés par score décroissant
+    """
+    for result in results:
+        reweight_result(result, exp_weight, edu_weight, sector_weight)
+    return sorted(results, key=lambda r: r.get("score", 0), reverse=True)
+
+def analyze_with_gemini(profile_data, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", use_cache=True):
     """
     Utilise Gemini Flash Thinking pour analyser le profil et générer un score
     basé sur l'expérience, l'éducation et le secteur d'activité avec les pondérations spécifiées
     
+    Gemini attribue trois sous-scores indépendants (0-10); le score global est
+    ensuite calculé localement avec les pondérations, si bien qu'un changement de
+    pondération ne nécessite aucun nouvel appel.
+    
+    Les analyses réussies sont mémorisées: un profil identique analysé avec le même
+    niveau de détail et le même modèle est servi directement depuis le cache. Un profil
+    déjà en cours d'analyse par un autre appel attend le résultat de celui-ci.
+    
     Args:
         profile_data (dict): Données du profil LinkedIn
         exp_weight (float): Poids pour l'expérience professionnelle (0-1)
         edu_weight (float): Poids pour le niveau d'éducation (0-1)
         sector_weight (float): Poids pour le secteur d'activité (0-1)
         detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+        use_cache (bool): Utiliser le cache des analyses (False pour forcer un nouvel appel)
     """
     if not profile_data:
         return {
@@ -95,6 +349,140 @@ def analyze_with_gemini(profile_data, exp_weight=0.4, edu_weight=0.3, sector_wei
             }
         }
     
+    # Seuls les champs utiles au scoring sont transmis (et servent de clé de cache)
+    with metrics.stage("compaction"):
+        profile_data, compaction = compact_profile(profile_data)
+    logger.info(f"Profil compacté: {compaction['bytes_saved']} octets et ~{compaction['tokens_saved']} tokens économisés")
+    
+    with metrics.stage("cache"):
+        cache_key = gemini_cache_key(profile_data, detail_level)
+        cached_result = gemini_cache().get(cache_key) if use_cache else None
+    if cached_result is not None:
+        logger.info(f"Analyse trouvée dans le cache ({gemini_cache().stats()})")
+        return reweight_result(cached_result, exp_weight, edu_weight, sector_weight)
+    
+    future, shared = _lead_or_wait(cache_key)
+    if future is None:
+        return _shared_analysis(shared, exp_weight, edu_weight, sector_weight)
+    
+    try:
+        result = _generate_gemini_analysis(profile_data, detail_level)
+        result["compaction"] = compaction
+        metrics.GEMINI_TOKENS_SAVED.inc(compaction["tokens_saved"])
+        result = _store_analysis(cache_key, result, exp_weight, edu_weight, sector_weight)
+    except BaseException as e:
+        gemini_in_flight.finish(cache_key, future, exception=e)
+        raise
+    gemini_in_flight.finish(cache_key, future, copy.deepcopy(result))
+    return result
+
+async def analyze_with_gemini_async(profile_data, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", use_cache=True, batcher=None):
+    """
+    Variante asynchrone de analyze_with_gemini, basée sur l'API asynchrone de Gemini
+    (ne bloque pas la boucle d'événements pendant l'appel)
+    
+    Si un regroupeur (create_gemini_batcher) est fourni, les profils absents du cache
+    sont analysés par lots de plusieurs profils par appel.
+    """
+    if not profile_data:
+        return analyze_with_gemini(profile_data)
+    
+    with metrics.stage("compaction"):
+        profile_data, compaction = compact_profile(profile_data)
+    
+    with metrics.stage("cache"):
+        cache_key = gemini_cache_key(profile_data, detail_level)
+        cached_result = await asyncio.to_thread(gemini_cache().get, cache_key) if use_cache else None
+    if cached_result is not None:
+        return reweight_result(cached_result, exp_weight, edu_weight, sector_weight)
+    
+    future, shared = await _lead_or_wait_async(cache_key)
+    if future is None:
+        return _shared_analysis(shared, exp_weight, edu_weight, sector_weight)
+    
+    try:
+        if batcher is not None:
+            # Attente du lot comprise; le lot lui-même est exécuté hors du profil en cours
+            # (sa tâche, créée pendant submit, hérite du contexte sans mesure active)
+            with metrics.stage("gemini_lot"), metrics.track_stages(None):
+                result = await batcher.submit(profile_data)
+        else:
+            result = await _generate_gemini_analysis_async(profile_data, detail_level)
+        result["compaction"] = compaction
+        metrics.GEMINI_TOKENS_SAVED.inc(compaction["tokens_saved"])
+        result = await asyncio.to_thread(_store_analysis, cache_key, result, exp_weight, edu_weight, sector_weight)
+    except BaseException as e:
+        gemini_in_flight.finish(cache_key, future, exception=e)
+        raise
+    gemini_in_flight.finish(cache_key, future, copy.deepcopy(result))
+    return result
+
+class AnalysisInterrupted(Exception):
+    """Analyse en flux abandonnée par son appelant avant la fin (les appels en attente la relancent)"""
+
+def _lead_or_wait(cache_key):
+    """
+    Inscrit l'appelant comme responsable de l'analyse de cette clé, ou attend le résultat
+    de l'analyse déjà en cours
+    
+    Returns:
+        tuple: (future, None) si l'appelant doit effectuer l'analyse puis publier son résultat
+        (gemini_in_flight.finish), (None, analyse partagée) sinon
+    """
+    while True:
+        future, leader = gemini_in_flight.begin(cache_key)
+        if leader:
+            return future, None
+        logger.info("Analyse du profil déjà en cours, attente de son résultat")
+        try:
+            with metrics.stage("gemini_attente"):
+                return None, future.result()
+        except AnalysisInterrupted:
+            # Analyse en flux abandonnée: l'un des appels en attente la reprend
+            continue
+
+async def _lead_or_wait_async(cache_key):
+    """Variante asynchrone de _lead_or_wait (attente sans bloquer la boucle d'événements)"""
+    while True:
+        future, leader = gemini_in_flight.begin(cache_key)
+        if leader:
+            return future, None
+        try:
+            # shield: l'annulation de cette tâche ne doit pas annuler l'analyse partagée
+            with metrics.stage("gemini_attente"):
+                return None, await asyncio.shield(asyncio.wrap_future(future))
+        except AnalysisInterrupted:
+            continue
+
+def _shared_analysis(shared, exp_weight, edu_weight, sector_weight):
+    """
+    Copie d'une analyse effectuée par un appel concurrent, avec le score global
+    recalculé selon les pondérations de l'appelant
+    """
+    result = copy.deepcopy(shared)
+    if "error" not in result:
+        reweight_result(result, exp_weight, edu_weight, sector_weight)
+    return result
+
+def _store_analysis(cache_key, result, exp_weight, edu_weight, sector_weight):
+    """
+    Met en cache une analyse réussie puis calcule son score global
+    """
+    # Seules les analyses réussies sont mises en cache
+    if "error" not in result:
+        gemini_cache().set(cache_key, result)
+        reweight_result(result, exp_weight, edu_weight, sector_weight)
+    
+    return result
+
+def gemini_generation_config(detail_level, structured=False):
+    """
+    Retourne la configuration de génération Gemini adaptée au niveau de détail
+    
+    Args:
+        detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+        structured (bool): Exiger une réponse JSON (response_mime_type)
+    """
     # Configuration du modèle Gemini
     generation_config = {
         "temperature": 0.2 if detail_level == "standard" else 0.3,
@@ -102,17 +490,68 @@ def analyze_with_gemini(profile_data, exp_weight=0.4, edu_weight=0.3, sector_wei
         "top_k": 0,
         "max_output_tokens": 2048 if detail_level == "standard" else 4096,
     }
+    if structured:
+        generation_config["response_mime_type"] = "application/json"
+    return generation_config
+
+@lru_cache(maxsize=1)
+def gemini_sdk():
+    """
+    Importe et configure le SDK Gemini au premier usage
     
-    # Utilisation du modèle Gemini 2.0 Flash Thinking
-    model = genai.GenerativeModel(
-        model_name=GEMINI_MODEL,
-        generation_config=generation_config
-    )
+    L'import de google.generativeai représente l'essentiel du temps de démarrage du module:
+    il n'est payé que par les exécutions qui appellent réellement Gemini.
+    """
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
+
+@lru_cache(maxsize=1)
+def structured_output_enabled():
+    """
+    Indique si les réponses JSON structurées (response_mime_type) sont demandées à Gemini
     
-    # Construction du prompt pour le LLM avec demande explicite de score facilement extractible
+    Nécessite GEMINI_STRUCTURED_OUTPUT=true et une version du SDK dont la configuration de
+    génération connaît ce champ (ce n'est pas le cas de google-generativeai 0.5.0); à défaut,
+    les analyses sont demandées en mode texte, dont la réponse est analysée par parse_gemini_response.
+    """
+    if not GEMINI_STRUCTURED_OUTPUT:
+        return False
+    try:
+        from google.ai import generativelanguage as glm
+        supported = "response_mime_type" in glm.GenerationConfig.meta.fields
+    except (ImportError, AttributeError):
+        supported = False
+    if not supported:
+        logger.warning("GEMINI_STRUCTURED_OUTPUT ignoré: le SDK Gemini installé ne prend pas en charge response_mime_type")
+    return supported
+
+@lru_cache(maxsize=32)
+def gemini_model(detail_level, structured=False, max_output_tokens=None, model_name=None):
+    """
+    Retourne le client Gemini correspondant à une configuration de génération
+    
+    Un seul client est créé par configuration et partagé par tout le processus
+    (appels successifs, threads et sessions Streamlit).
+    
+    Args:
+        detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+        structured (bool): Exiger une réponse JSON (response_mime_type)
+        max_output_tokens (int, optional): Remplace la limite de tokens de sortie par défaut
+        model_name (str, optional): Modèle Gemini (GEMINI_MODEL par défaut)
+    """
+    generation_config = gemini_generation_config(detail_level, structured=structured)
+    if max_output_tokens is not None:
+        generation_config["max_output_tokens"] = max_output_tokens
+    return gemini_sdk().GenerativeModel(model_name=model_name or GEMINI_MODEL, generation_config=generation_config)
+
+def gemini_detail_instructions(detail_level):
+    """
+    Retourne les consignes d'analyse propres au niveau de détail demandé
+    """
     detail_instructions = """
     Pour l'analyse standard:
-    - Calcule le nombre total d'années d'expérience (même si les dates sont incomplètes, estime au mieux)
+    - Reprends le nombre total d'années d'expérience du champ "experience_annees_calculee" (déjà calculé, chevauchements de postes fusionnés); ne l'estime toi-même que si ce champ vaut 0 alors que le profil mentionne des expériences
     - Détermine le niveau d'éducation (Doctorat, Master, Licence, BTS/DUT, Baccalauréat, Aucun)
     - Identifie le secteur d'activité (Technologie, Finance, Santé, Production, Commerce, Éducation, Autre)
     """
@@ -150,120 +589,582 @@ def analyze_with_gemini(profile_data, exp_weight=0.4, edu_weight=0.3, sector_wei
            - Présence internationale et expérience multiculturelle
            - Activités annexes (bénévolat, mentorat, publications)
         """
-        
+    return detail_instructions
+
+def build_gemini_prompt(profile_data, detail_level, structured=False):
+    """
+    Construit le prompt d'analyse d'un profil pour Gemini
+    
+    Args:
+        profile_data (dict): Données du profil LinkedIn
+        detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+        structured (bool): Demander un objet JSON seul, conforme au schéma GeminiAnalysis
+    """
+    # Construction du prompt pour le LLM avec demande explicite de score facilement extractible
+    detail_instructions = gemini_detail_instructions(detail_level)
+    
     prompt = f"""
-    Analyse le profil LinkedIn suivant et génère un score de 0 à 10 basé sur:
-    1. Les années d'expérience professionnelle ({int(exp_weight*100)}% du score)
-    2. Le niveau d'éducation ({int(edu_weight*100)}% du score)
-    3. Le secteur d'activité ({int(sector_weight*100)}% du score)
+    Analyse le profil LinkedIn suivant et attribue trois sous-scores indépendants de 0 à 10:
+    1. Les années d'expérience professionnelle
+    2. Le niveau d'éducation
+    3. Le secteur d'activité
+    
+    Chaque sous-score doit être évalué séparément, sans tenir compte des deux autres critères.
     
-    Voici le profil à analyser (au format JSON):
-    {json.dumps(profile_data, indent=2, ensure_ascii=False)}
+    Voici le profil à analyser (au format JSON compact):
+    {json.dumps(profile_data, ensure_ascii=False, separators=(',', ':'))}
     
     {detail_instructions}
     
-    IMPORTANT: Dans ta réponse, toujours inclure une ligne clairement identifiable "Score final: X.XX/10" 
-    pour faciliter l'extraction du score, même si le reste du JSON est mal formaté.
+    {_structured_output_instructions() if structured else _text_output_instructions()}
+    """
+    return prompt
+
+def _structured_output_instructions():
+    """
+    Consignes de réponse en mode JSON structuré
+    """
+    return f"""
+    Réponds uniquement avec un objet JSON conforme au schéma JSON suivant:
+    {GEMINI_ANALYSIS_SCHEMA}
+    
+    - "sous_scores": les trois sous-scores (0-10) avec deux décimales
+    - "justification": une justification détaillée des sous-scores
+    - "details": années d'expérience estimées, niveau d'éducation identifié, secteur d'activité déterminé
+    - "raisonnement": ton raisonnement étape par étape
+    """
+
+def _text_output_instructions():
+    """
+    Consignes de réponse en mode texte (raisonnement libre suivi d'un JSON)
+    """
+    return """
+    IMPORTANT: Dans ta réponse, toujours inclure trois lignes clairement identifiables
+    "Score expérience: X.XX/10", "Score éducation: X.XX/10" et "Score secteur: X.XX/10"
+    pour faciliter l'extraction des sous-scores, même si le reste du JSON est mal formaté.
     
     Montre ton raisonnement étape par étape puis réponds avec un JSON contenant:
-    1. Un score global (0-10) avec deux décimales
-    2. Une justification détaillée du score
+    1. Les trois sous-scores (0-10) avec deux décimales
+    2. Une justification détaillée des sous-scores
     3. Les détails de l'analyse (années d'expérience estimées, niveau d'éducation identifié, secteur d'activité déterminé)
     
     Le JSON doit suivre exactement ce format (en remplaçant les exemples par tes vraies valeurs):
-    {{
-        "score": 7.25,
-        "justification": "Explication du score...",
-        "details": {{
+    {
+        "sous_scores": {
+            "experience": 7.50,
+            "education": 8.00,
+            "secteur": 6.25
+        },
+        "justification": "Explication des sous-scores...",
+        "details": {
             "experience_annees": 8,
             "niveau_education": "Master",
             "secteur_activite": "Technologie"
-        }}
-    }}
+        }
+    }
+    """
+
+def parse_gemini_response(gemini_response):
     """
+    Extrait le résultat d'analyse de la réponse textuelle de Gemini
     
-    try:
-        # Appel à l'API Gemini pour l'analyse
-        response = model.generate_content(prompt)
-        
-        # Extraction de la réponse
-        gemini_response = response.text
-        
-        # Amélioration de l'extraction JSON - recherche de plusieurs façons
-        
-        # 1. Tentative d'extraction directe du JSON entier
-        json_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-        json_matches = re.findall(json_pattern, gemini_response, re.DOTALL)
+    En mode structuré, la réponse est directement validée par le schéma GeminiAnalysis.
+    Sinon, un parcours unique du texte recherche le premier objet JSON conforme au schéma
+    tout en relevant les lignes de sous-scores et les champs de détail, utilisés en
+    dernier recours si aucun JSON valide n'est trouvé.
+    """
+    # 1. Réponse JSON structurée
+    text = gemini_response.strip()
+    if text.startswith("{"):
+        try:
+            return _analysis_result(GeminiAnalysis.model_validate_json(text), gemini_response)
+        except ValidationError:
+            pass
+    
+    # 2. Parcours unique du texte
+    sous_scores = {}
+    details = {}
+    position = 0
+    while True:
+        match = RESPONSE_SCAN_PATTERN.search(gemini_response, position)
+        if match is None:
+            break
+        position = match.end()
         
-        for json_str in json_matches:
+        if match.group("brace"):
             try:
-                result = json.loads(json_str)
-                if "score" in result:
-                    # JSON valide avec score trouvé
-                    result["raisonnement"] = gemini_response
-                    return result
-            except json.JSONDecodeError:
+                candidate, _ = JSON_DECODER.raw_decode(gemini_response, match.start())
+                return _analysis_result(GeminiAnalysis.model_validate(candidate), gemini_response)
+            except (json.JSONDecodeError, ValidationError):
                 continue
+        elif match.group("criterion"):
+            criterion = _sub_score_criterion(match.group("criterion"))
+            sous_scores.setdefault(criterion, float(match.group("score").replace(',', '.')))
+        else:
+            details.setdefault(match.group("field").lower(), match.group("value").strip())
+    
+    # 3. Résultat reconstruit à partir des extractions partielles
+    if len(sous_scores) == 3:
+        return {
+            "sous_scores": sous_scores,
+            "justification": "Sous-scores extraits directement du texte de l'analyse.",
+            "details": {
+                "experience_annees": details.get("experience_annees", "Non déterminé"),
+                "niveau_education": details.get("niveau_education", "Non déterminé"),
+                "secteur_activite": details.get("secteur_activite", "Non déterminé")
+            },
+            "raisonnement": gemini_response
+        }
         
-        # 2. Recherche de JSON sans backticks
-        json_start = gemini_response.find('{')
-        json_end = gemini_response.rfind('}') + 1
-        
-        if json_start >= 0 and json_end > json_start:
-            json_str = gemini_response[json_start:json_end]
-            try:
-                # Tentative de parsing du JSON
-                result = json.loads(json_str)
-                
-                # Ajout du raisonnement complet pour référence
-                result["raisonnement"] = gemini_response
-                
-                return result
-            except json.JSONDecodeError:
-                pass  # Continue vers la méthode suivante
+    # Si aucun JSON ou score n'a pu être extrait
+    return {
+        "error": "Impossible d'extraire un score ou un JSON valide de la réponse.",
+        "raw_response": gemini_response
+    }
+
+def _analysis_result(analysis, gemini_response):
+    """
+    Convertit une analyse validée en dictionnaire de résultat
+    """
+    result = analysis.model_dump()
+    if not result.get("raisonnement"):
+        # Réponse en mode texte: le raisonnement est le texte complet
+        result["raisonnement"] = gemini_response
+    return result
+
+def _sub_score_criterion(label):
+    """
+    Associe le libellé d'une ligne de sous-score au critère correspondant
+    """
+    label = label.lower()
+    if label.startswith("exp"):
+        return "experience"
+    if label.startswith("sec"):
+        return "secteur"
+    return "education"
 
-        # 3. Extraction directe des valeurs clés si le JSON n'est pas valide
-        score_pattern = r'Score final:\s*(\d+[\.,]\d+)\/10'
-        score_match = re.search(score_pattern, gemini_response)
+def stream_gemini_analysis(profile_data, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", use_cache=True):
+    """
+    Analyse un profil avec Gemini en mode flux (stream=True)
+    
+    Générateur d'événements (type, valeur):
+        - ("text", fragment): texte de la réponse, dès sa réception
+        - ("score", score): score global, dès que les trois sous-scores ont été détectés dans le flux
+        - ("result", résultat): résultat final, identique à celui de analyze_with_gemini
+    
+    Une analyse déjà en cache, ou déjà en cours pour le même profil, est restituée sous forme
+    d'un unique événement "result".
+    """
+    if not profile_data:
+        yield "result", analyze_with_gemini(profile_data)
+        return
+    
+    with metrics.stage("compaction"):
+        profile_data, compaction = compact_profile(profile_data)
+    
+    with metrics.stage("cache"):
+        cache_key = gemini_cache_key(profile_data, detail_level)
+        cached_result = gemini_cache().get(cache_key) if use_cache else None
+    if cached_result is not None:
+        yield "result", reweight_result(cached_result, exp_weight, edu_weight, sector_weight)
+        return
+    
+    future, shared = _lead_or_wait(cache_key)
+    if future is None:
+        yield "result", _shared_analysis(shared, exp_weight, edu_weight, sector_weight)
+        return
+    
+    try:
+        result = yield from _stream_gemini_response(profile_data, exp_weight, edu_weight, sector_weight, detail_level)
+        result["compaction"] = compaction
+        metrics.GEMINI_TOKENS_SAVED.inc(compaction["tokens_saved"])
+        result = _store_analysis(cache_key, result, exp_weight, edu_weight, sector_weight)
+    except GeneratorExit:
+        # Flux abandonné par l'appelant (ex. rerun Streamlit): les appels en attente reprennent l'analyse
+        gemini_in_flight.finish(cache_key, future, exception=AnalysisInterrupted())
+        raise
+    except BaseException as e:
+        gemini_in_flight.finish(cache_key, future, exception=e)
+        raise
+    gemini_in_flight.finish(cache_key, future, copy.deepcopy(result))
+    yield "result", result
+
+def _stream_gemini_response(profile_data, exp_weight, edu_weight, sector_weight, detail_level):
+    """
+    Diffuse la réponse de Gemini en flux (événements "text" et "score" de stream_gemini_analysis)
+    
+    Returns:
+        dict: Analyse extraite de la réponse complète (sans passer par le cache)
+    """
+    # Mode texte: les lignes de sous-scores permettent d'afficher le score avant la fin du flux
+    model = gemini_model(detail_level)
+    
+    gemini_response = ""
+    sous_scores = {}
+    scan_from = 0
+    
+    usage = None
+    
+    try:
+        with metrics.stage("prompt"):
+            prompt = build_gemini_prompt(profile_data, detail_level)
         
-        exp_pattern = r'(?:années|annees|expérience|experience)[^\d]*(\d+)'
-        exp_match = re.search(exp_pattern, gemini_response, re.IGNORECASE)
+        # Seule l'attente des fragments est mesurée, pas leur affichage par l'appelant
+        with metrics.stage("gemini"):
+            response = model.generate_content(prompt, stream=True)
         
-        edu_pattern = r'(?:niveau|education)[^:]*:\s*["\']*([^"\',.]+)'
-        edu_match = re.search(edu_pattern, gemini_response, re.IGNORECASE)
+        for chunk in metrics.iterate_stage(response, "gemini"):
+            # Les métadonnées d'usage sont portées par les derniers fragments
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            text = chunk.text
+            if not text:
+                continue
+            gemini_response += text
+            yield "text", text
+            
+            if len(sous_scores) < 3:
+                # Recherche incrémentale: seule la fin du texte (avec un recouvrement) est réexaminée
+                for match in SUB_SCORE_PATTERN.finditer(gemini_response, scan_from):
+                    sous_scores.setdefault(_sub_score_criterion(match.group(1)), float(match.group(2).replace(',', '.')))
+                scan_from = max(0, len(gemini_response) - 64)
+                
+                if len(sous_scores) == 3:
+                    yield "score", compute_global_score(sous_scores, exp_weight, edu_weight, sector_weight)
         
-        sector_pattern = r'(?:secteur|activite|activité)[^:]*:\s*["\']*([^"\',.]+)'
-        sector_match = re.search(sector_pattern, gemini_response, re.IGNORECASE)
+        record_gemini_usage(usage)
+        with metrics.stage("parsing"):
+            return parse_gemini_response(gemini_response)
+    
+    except Exception as e:
+        logger.error(f"Erreur lors de l'analyse avec Gemini: {e}")
+        return {
+            "error": f"Erreur lors de l'analyse avec Gemini: {str(e)}",
+            "score": 0
+        }
+
+def _generate_gemini_analysis(profile_data, detail_level):
+    """
+    Appelle Gemini et extrait le score de sa réponse (sans passer par le cache)
+    """
+    # Utilisation du modèle Gemini 2.0 Flash Thinking
+    structured = structured_output_enabled()
+    model = gemini_model(detail_level, structured=structured)
+    
+    try:
+        with metrics.stage("prompt"):
+            prompt = build_gemini_prompt(profile_data, detail_level, structured=structured)
         
-        if score_match:
-            score = float(score_match.group(1).replace(',', '.'))
-            
-            # Création d'un résultat structuré à partir des extractions partielles
-            return {
-                "score": score,
-                "justification": "Score extrait directement du texte de l'analyse.",
-                "details": {
-                    "experience_annees": exp_match.group(1) if exp_match else "Non déterminé",
-                    "niveau_education": edu_match.group(1) if edu_match else "Non déterminé",
-                    "secteur_activite": sector_match.group(1) if sector_match else "Non déterminé"
-                },
-                "raisonnement": gemini_response
-            }
-            
-        # Si aucun JSON ou score n'a pu être extrait
+        # Appel à l'API Gemini pour l'analyse
+        with metrics.stage("gemini"):
+            response = model.generate_content(prompt)
+        record_gemini_usage(getattr(response, "usage_metadata", None))
+        
+        with metrics.stage("parsing"):
+            return parse_gemini_response(response.text)
+
+    except Exception as e:
+        logger.error(f"Erreur lors de l'analyse avec Gemini: {e}")
         return {
-            "error": "Impossible d'extraire un score ou un JSON valide de la réponse.",
-            "raw_response": gemini_response
+            "error": f"Erreur lors de l'analyse avec Gemini: {str(e)}",
+            "score": 0
         }
 
+async def _generate_gemini_analysis_async(profile_data, detail_level):
+    """
+    Variante asynchrone de _generate_gemini_analysis (generate_content_async)
+    """
+    structured = structured_output_enabled()
+    model = gemini_model(detail_level, structured=structured)
+    
+    try:
+        with metrics.stage("prompt"):
+            prompt = build_gemini_prompt(profile_data, detail_level, structured=structured)
+        
+        with metrics.stage("limite_debit"):
+            await gemini_limiter.acquire()
+        with metrics.stage("gemini"):
+            response = await model.generate_content_async(prompt)
+        record_gemini_usage(getattr(response, "usage_metadata", None))
+        
+        with metrics.stage("parsing"):
+            return parse_gemini_response(response.text)
+
     except Exception as e:
-        print(f"Erreur lors de l'analyse avec Gemini: {e}")
+        logger.error(f"Erreur lors de l'analyse avec Gemini: {e}")
         return {
             "error": f"Erreur lors de l'analyse avec Gemini: {str(e)}",
             "score": 0
         }
 
-def process_linkedin_profile(linkedin_url, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard"):
+def record_gemini_usage(usage):
+    """
+    Comptabilise les tokens consommés par un appel Gemini (métrique linkedin_gemini_tokens_total)
+    
+    Args:
+        usage: Métadonnées d'usage de la réponse (usage_metadata), None si non fournies
+    """
+    if usage is None:
+        return
+    metrics.GEMINI_TOKENS.inc(getattr(usage, "prompt_token_count", 0) or 0, type="prompt")
+    metrics.GEMINI_TOKENS.inc(getattr(usage, "candidates_token_count", 0) or 0, type="sortie")
+
+def build_gemini_batch_prompt(profiles, detail_level):
+    """
+    Construit un prompt unique pour analyser plusieurs profils en un seul appel
+    
+    Args:
+        profiles (dict): Données des profils indexées par identifiant ("p0", "p1"...)
+        detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+    """
+    profiles_block = "\n".join(
+        f"### Profil {profile_id}\n{json.dumps(profile_data, ensure_ascii=False, separators=(',', ':'))}"
+        for profile_id, profile_data in profiles.items()
+    )
+    
+    prompt = f"""
+    Analyse les {len(profiles)} profils LinkedIn suivants. Pour chaque profil, attribue trois sous-scores indépendants de 0 à 10:
+    1. Les années d'expérience professionnelle
+    2. Le niveau d'éducation
+    3. Le secteur d'activité
+    
+    Chaque profil est évalué séparément des autres, et chaque sous-score sans tenir compte des deux autres critères.
+    
+    Voici les profils à analyser (au format JSON, chacun précédé de son identifiant):
+{profiles_block}
+    
+    {gemini_detail_instructions(detail_level)}
+    
+    Réponds uniquement avec un tableau JSON contenant exactement un objet par profil, avec son identifiant,
+    selon ce format (en remplaçant les exemples par tes vraies valeurs):
+    [
+        {{
+            "id": "p0",
+            "sous_scores": {{
+                "experience": 7.50,
+                "education": 8.00,
+                "secteur": 6.25
+            }},
+            "justification": "Explication des sous-scores...",
+            "details": {{
+                "experience_annees": 8,
+                "niveau_education": "Master",
+                "secteur_activite": "Technologie"
+            }}
+        }}
+    ]
+    """
+    return prompt
+
+def parse_gemini_batch_response(gemini_response, profile_ids):
+    """
+    Extrait les résultats individuels de la réponse à un prompt multi-profils
+    
+    Le tableau JSON est d'abord décodé en une fois; s'il est invalide, chaque objet
+    est décodé séparément afin de conserver les résultats lisibles.
+    
+    Args:
+        gemini_response (str): Réponse textuelle de Gemini
+        profile_ids (list): Identifiants attendus
+    
+    Returns:
+        dict: Résultats valides indexés par identifiant (les profils manquants sont absents)
+    """
+    expected = set(profile_ids)
+    items = []
+    
+    # 1. Décodage du tableau complet
+    array_start = gemini_response.find('[')
+    array_end = gemini_response.rfind(']') + 1
+    try:
+        if array_start < 0 or array_end <= array_start:
+            raise json.JSONDecodeError("Tableau JSON introuvable", gemini_response, 0)
+        decoded = json.loads(gemini_response[array_start:array_end])
+        items = decoded if isinstance(decoded, list) else []
+    except json.JSONDecodeError:
+        # 2. Décodage objet par objet
+        decoder = json.JSONDecoder()
+        position = gemini_response.find('{')
+        while position != -1:
+            try:
+                item, position = decoder.raw_decode(gemini_response, position)
+                items.append(item)
+            except json.JSONDecodeError:
+                position += 1
+            position = gemini_response.find('{', position)
+    
+    results = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get("id") not in expected or item["id"] in results:
+            continue
+        profile_id = item.pop("id")
+        try:
+            results[profile_id] = GeminiAnalysis.model_validate(item).model_dump()
+        except ValidationError:
+            continue
+    
+    return results
+
+def is_transport_error(error):
+    """
+    Indique si une erreur d'appel à Gemini tient à l'acheminement de la requête (réseau,
+    délai dépassé, limite de débit, erreur serveur) plutôt qu'au contenu du prompt
+    """
+    if isinstance(error, (ConnectionError, TimeoutError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    try:
+        # Exceptions du SDK Gemini (google-api-core), sans import si le SDK n'est pas installé
+        from google.api_core import exceptions as google_exceptions
+    except ImportError:
+        return False
+    return isinstance(error, (google_exceptions.ServerError, google_exceptions.TooManyRequests, google_exceptions.RetryError))
+
+async def analyze_profiles_batch_async(profiles, detail_level="standard"):
+    """
+    Analyse plusieurs profils avec un seul appel à Gemini (sans passer par le cache)
+    
+    Les profils dont le résultat est absent ou illisible sont réanalysés: en lot réduit
+    si une partie du lot a réussi, en deux moitiés si tout le lot a échoué, et
+    individuellement en dernier recours. Une erreur d'acheminement (réseau, délai,
+    service indisponible) ne dépend pas du lot: elle est propagée sans le découper.
+    
+    Args:
+        profiles (list): Données des profils LinkedIn
+        detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+    
+    Returns:
+        list: Résultats d'analyse, dans l'ordre des profils
+    """
+    if len(profiles) == 1:
+        return [await _generate_gemini_analysis_async(profiles[0], detail_level)]
+    
+    profile_ids = [f"p{i}" for i in range(len(profiles))]
+    
+    # Réponse JSON sans raisonnement: environ un quart du budget d'une analyse individuelle par profil
+    base_max_tokens = gemini_generation_config(detail_level)["max_output_tokens"]
+    model = gemini_model(
+        detail_level,
+        structured=structured_output_enabled(),
+        max_output_tokens=min(8192, base_max_tokens // 4 * len(profiles))
+    )
+    
+    try:
+        with metrics.stage("prompt"):
+            prompt = build_gemini_batch_prompt(dict(zip(profile_ids, profiles)), detail_level)
+        
+        with metrics.stage("limite_debit"):
+            await gemini_limiter.acquire()
+        with metrics.stage("gemini"):
+            response = await model.generate_content_async(prompt)
+        record_gemini_usage(getattr(response, "usage_metadata", None))
+        
+        with metrics.stage("parsing"):
+            parsed = parse_gemini_batch_response(response.text, profile_ids)
+    except Exception as e:
+        if is_transport_error(e):
+            # Des lots plus petits échoueraient de la même façon: chaque appelant reçoit l'erreur
+            logger.error(f"Erreur d'acheminement lors de l'analyse par lot avec Gemini: {e}")
+            raise
+        logger.error(f"Erreur lors de l'analyse par lot avec Gemini: {e}")
+        parsed = {}
+    
+    results = [parsed.get(profile_id) for profile_id in profile_ids]
+    failed = [i for i, result in enumerate(results) if result is None]
+    
+    if failed:
+        retry_profiles = [profiles[i] for i in failed]
+        if len(failed) < len(profiles):
+            retried = await analyze_profiles_batch_async(retry_profiles, detail_level)
+        else:
+            middle = len(retry_profiles) // 2
+            halves = await asyncio.gather(
+                analyze_profiles_batch_async(retry_profiles[:middle], detail_level),
+                analyze_profiles_batch_async(retry_profiles[middle:], detail_level)
+            )
+            retried = halves[0] + halves[1]
+        for i, result in zip(failed, retried):
+            results[i] = result
+    
+    return results
+
+def create_gemini_batcher(detail_level="standard", batch_size=8, max_wait=0.5):
+    """
+    Crée un regroupeur qui mutualise les analyses Gemini concurrentes en prompts multi-profils
+    
+    À transmettre à analyze_with_gemini_async / process_linkedin_profile_async
+    (paramètre batcher), pour un même niveau de détail.
+    """
+    return AsyncMicroBatcher(
+        lambda profiles: analyze_profiles_batch_async(profiles, detail_level),
+        max_batch_size=batch_size,
+        max_wait=max_wait
+    )
+
+def local_analysis(profile_data, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", confidence_threshold=LOCAL_CONFIDENCE_THRESHOLD):
+    """
+    Premier niveau du scoring hiérarchisé: scoring local (ProfileScorer), sans appel réseau
+    
+    Returns:
+        dict: Résultat au format de analyze_with_gemini si le scoring local est suffisamment
+        fiable, None si l'analyse doit être confiée à Gemini (confiance insuffisante
+        ou analyse "approfondi" demandée)
+    """
+    if detail_level == "approfondi":
+        return None
+    
+    local = ProfileScorer(exp_weight, edu_weight, sector_weight).calculate_score(profile_data)
+    return _local_result(local, confidence_threshold)
+
+def local_analyses(profiles, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", confidence_threshold=LOCAL_CONFIDENCE_THRESHOLD):
+    """
+    Variante par lot de local_analysis: les années d'expérience de tous les profils sont
+    calculées en une seule passe vectorisée (ProfileScorer.calculate_scores)
+    
+    Returns:
+        list: Résultat de local_analysis pour chaque profil, dans l'ordre des profils
+    """
+    if detail_level == "approfondi":
+        return [None] * len(profiles)
+    
+    scores = ProfileScorer(exp_weight, edu_weight, sector_weight).calculate_scores(profiles)
+    return [_local_result(local, confidence_threshold) for local in scores]
+
+def create_local_batcher(exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", confidence_threshold=LOCAL_CONFIDENCE_THRESHOLD, batch_size=64, max_wait=0.05):
+    """
+    Crée un regroupeur qui mutualise le scoring local des profils extraits simultanément
+    (une passe vectorisée par lot, voir local_analyses)
+    
+    À transmettre à process_linkedin_profile_async (paramètre local_batcher), pour les mêmes
+    pondérations, niveau de détail et seuil de confiance.
+    """
+    async def score_batch(profiles):
+        return local_analyses(profiles, exp_weight, edu_weight, sector_weight, detail_level, confidence_threshold)
+    
+    return AsyncMicroBatcher(score_batch, max_batch_size=batch_size, max_wait=max_wait)
+
+def _local_result(local, confidence_threshold):
+    """
+    Convertit un résultat de ProfileScorer au format de analyze_with_gemini, ou retourne
+    None si sa confiance est insuffisante
+    """
+    confidence = local["confidence"]["global"]
+    if confidence < confidence_threshold:
+        logger.info(f"Confiance du scoring local insuffisante ({confidence:.2f} < {confidence_threshold}), analyse avec Gemini")
+        return None
+    
+    details = local["details"]
+    sous_scores = {key: value for key, value in local["scores"].items() if key != "global"}
+    return {
+        "sous_scores": sous_scores,
+        "justification": (
+            f"Score calculé localement (confiance {confidence:.0%}): {details['experience_annees']} années d'expérience, "
+            f"niveau d'éducation {details['niveau_education']}, secteur {details['secteur_activite']}."
+        ),
+        "details": dict(details),
+        "moteur_scoring": "local",
+        "confiance_locale": confidence
+    }
+
+def process_linkedin_profile(linkedin_url, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", use_cache=True, tiered=False, confidence_threshold=LOCAL_CONFIDENCE_THRESHOLD):
     """
     Traite un profil LinkedIn complet et retourne les résultats formatés
     pour l'interface utilisateur
@@ -276,21 +1177,116 @@ def process_linkedin_profile(linkedin_url, exp_weight=0.4, edu_weight=0.3, secto
         edu_weight (float): Poids pour le niveau d'éducation (0-1)
         sector_weight (float): Poids pour le secteur d'activité (0-1)
         detail_level (str): Niveau de détail de l'analyse ("standard" ou "approfondi")
+        use_cache (bool): Utiliser les caches Proxycurl et Gemini (False pour forcer une nouvelle analyse)
+        tiered (bool): Scoring hiérarchisé: scoring local d'abord, Gemini seulement si nécessaire
+        confidence_threshold (float): Confiance minimale (0-1) pour retenir le scoring local
     
     Returns:
-        dict: Résultats formatés de l'analyse
+        dict: Résultats formatés de l'analyse (champ "moteur_scoring": "local" ou "gemini",
+        durée de chaque étape en millisecondes dans "timings")
     """
-    # Extraction des données via Proxycurl
-    profile_data = extract_linkedin_data(linkedin_url)
+    timings = metrics.StageTimings()
+    with metrics.track_stages(timings):
+        # Extraction des données via Proxycurl
+        with metrics.stage("proxycurl"):
+            profile_data = extract_linkedin_data(linkedin_url, use_cache=use_cache)
+        
+        if not profile_data:
+            raise Exception("Impossible d'extraire les données du profil LinkedIn")
+        
+        results = None
+        if tiered:
+            with metrics.stage("scoring_local"):
+                results = local_analysis(profile_data, exp_weight, edu_weight, sector_weight, detail_level, confidence_threshold)
+        
+        # Analyse avec Gemini
+        if results is None:
+            results = analyze_with_gemini(profile_data, exp_weight, edu_weight, sector_weight, detail_level, use_cache=use_cache)
+        
+        with metrics.stage("formatage"):
+            results = _format_profile_results(results, profile_data, linkedin_url, exp_weight, edu_weight, sector_weight)
+    
+    results["timings"] = timings.finish()
+    return results
+
+def process_linkedin_profile_stream(linkedin_url, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", use_cache=True, tiered=False, confidence_threshold=LOCAL_CONFIDENCE_THRESHOLD):
+    """
+    Variante de process_linkedin_profile en mode flux, pour un affichage progressif
+    
+    Générateur d'événements (type, valeur): ("text", fragment), ("score", score global)
+    puis ("result", résultats formatés), voir stream_gemini_analysis.
+    
+    Les durées des étapes ("timings") excluent le temps passé par l'appelant à traiter les événements.
+    """
+    timings = metrics.StageTimings()
+    with timings.stage("proxycurl"):
+        profile_data = extract_linkedin_data(linkedin_url, use_cache=use_cache)
     
     if not profile_data:
         raise Exception("Impossible d'extraire les données du profil LinkedIn")
     
-    # Analyse avec Gemini
-    results = analyze_with_gemini(profile_data, exp_weight, edu_weight, sector_weight, detail_level)
+    if tiered:
+        with timings.stage("scoring_local"):
+            results = local_analysis(profile_data, exp_weight, edu_weight, sector_weight, detail_level, confidence_threshold)
+        if results is not None:
+            with timings.stage("formatage"):
+                results = _format_profile_results(results, profile_data, linkedin_url, exp_weight, edu_weight, sector_weight)
+            results["timings"] = timings.finish()
+            yield "result", results
+            return
+    
+    analysis = stream_gemini_analysis(profile_data, exp_weight, edu_weight, sector_weight, detail_level, use_cache=use_cache)
+    for event, value in metrics.iterate_tracked(analysis, timings):
+        if event == "result":
+            with timings.stage("formatage"):
+                value = _format_profile_results(value, profile_data, linkedin_url, exp_weight, edu_weight, sector_weight)
+            value["timings"] = timings.finish()
+        yield event, value
+
+async def process_linkedin_profile_async(linkedin_url, exp_weight=0.4, edu_weight=0.3, sector_weight=0.3, detail_level="standard", use_cache=True, batcher=None, tiered=False, confidence_threshold=LOCAL_CONFIDENCE_THRESHOLD, local_batcher=None):
+    """
+    Variante asynchrone de process_linkedin_profile: Proxycurl via aiohttp et
+    Gemini via son API asynchrone, pour traiter de nombreux profils en parallèle
+    sur une seule boucle d'événements (mode lot de main.py)
+    
+    En scoring hiérarchisé, un regroupeur local_batcher (create_local_batcher) remplace
+    le scoring local profil par profil: ses pondérations et son seuil s'appliquent alors.
+    
+    Returns:
+        dict: Résultats formatés de l'analyse (durée de chaque étape dans "timings")
+    """
+    timings = metrics.StageTimings()
+    with metrics.track_stages(timings):
+        with metrics.stage("proxycurl"):
+            profile_data = await extract_linkedin_data_async(linkedin_url, use_cache=use_cache)
+        
+        if not profile_data:
+            raise Exception("Impossible d'extraire les données du profil LinkedIn")
+        
+        results = None
+        if tiered and local_batcher is not None:
+            # Attente du lot comprise, comme pour les lots Gemini
+            with metrics.stage("scoring_local"), metrics.track_stages(None):
+                results = await local_batcher.submit(profile_data)
+        elif tiered:
+            with metrics.stage("scoring_local"):
+                results = local_analysis(profile_data, exp_weight, edu_weight, sector_weight, detail_level, confidence_threshold)
+        if results is None:
+            results = await analyze_with_gemini_async(profile_data, exp_weight, edu_weight, sector_weight, detail_level, use_cache=use_cache, batcher=batcher)
+        
+        with metrics.stage("formatage"):
+            results = _format_profile_results(results, profile_data, linkedin_url, exp_weight, edu_weight, sector_weight)
     
+    results["timings"] = timings.finish()
+    return results
+
+def _format_profile_results(results, profile_data, linkedin_url, exp_weight, edu_weight, sector_weight):
+    """
+    Enrichit le résultat de l'analyse (nom, titre, pondérations, URL) pour l'affichage
+    """
     # Préparation des résultats pour l'affichage
     if "error" in results:
+        metrics.ANALYSES.inc(engine=results.get("moteur_scoring", "gemini"), status="error")
         error_message = results["error"]
         raise Exception(f"Erreur lors de l'analyse: {error_message}")
         
@@ -328,12 +1324,12 @@ def process_linkedin_profile(linkedin_url, exp_weight=0.4, edu_weight=0.3, secto
             if "titre" not in details:
                 details["titre"] = "Non spécifié"
     
-    # Ajouter les pondérations utilisées pour le calcul du score
-    results["ponderations"] = {
-        "experience": int(exp_weight * 100),
-        "education": int(edu_weight * 100),
-        "secteur": int(sector_weight * 100)
-    }
+    # Score global et pondérations utilisées (recalculables localement via reweight_result)
+    reweight_result(results, exp_weight, edu_weight, sector_weight)
+    
+    # Niveau de scoring ayant produit le résultat
+    results.setdefault("moteur_scoring", "gemini")
+    metrics.ANALYSES.inc(engine=results["moteur_scoring"], status="success")
     
     # Ajouter l'URL pour référence
     results["url"] = linkedin_url
@@ -348,6 +1344,9 @@ def main():
         print("Usage: python scrape_linkedin.py <url_profil_linkedin>")
         sys.exit(1)
     
+    # Messages de progression sur stderr, résultats sur stdout
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    
     linkedin_url = sys.argv[1]
     
     try:
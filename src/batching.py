@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class AsyncMicroBatcher:
+    """
+    Regroupe des requêtes individuelles concurrentes en lots
+
+    Chaque appel à submit() met un élément en attente; le lot est traité dès qu'il
+    atteint `max_batch_size` éléments ou après `max_wait` secondes, par un seul appel
+    à `process_batch`. Chaque appelant reçoit ensuite le résultat correspondant à son élément.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.5
+    ):
+        """
+        Args:
+            process_batch (Callable): Coroutine traitant une liste d'éléments et
+                retournant la liste des résultats, dans le même ordre
+            max_batch_size (int): Taille maximale d'un lot
+            max_wait (float): Délai maximal (secondes) avant l'envoi d'un lot incomplet
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Ajoute un élément au prochain lot et attend son résultat"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Envoie les éléments en attente sous forme d'un lot"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,257 @@
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class PersistentCache:
+    """
+    Cache clé/valeur persistant sur disque (SQLite) avec expiration (TTL)
+    et éviction LRU bornée en nombre d'entrées.
+
+    Les valeurs sont sérialisées en JSON. Chaque instance travaille sur sa
+    propre table, ce qui permet de partager un même fichier entre plusieurs caches.
+
+    La date de dernier accès (ordre LRU) n'est réécrite que si elle date de plus de
+    `touch_interval` secondes: une lecture fréquente n'entraîne pas une écriture à chaque fois.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        ttl: Optional[float] = None,
+        max_entries: int = 1000,
+        touch_interval: float = 60.0
+    ):
+        """
+        Args:
+            path (str): Chemin du fichier SQLite
+            table (str): Nom de la table utilisée par ce cache
+            ttl (float, optional): Durée de validité d'une entrée en secondes (None = illimitée)
+            max_entries (int): Nombre maximal d'entrées conservées (0 = illimité)
+            touch_interval (float): Délai minimal (secondes) entre deux mises à jour de la date d'accès d'une entrée
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Nom de table invalide: {table}")
+
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # En mode WAL, NORMAL reste cohérent après un arrêt brutal et évite une synchronisation disque par écriture
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la valeur associée à la clé, ou None si absente ou expirée"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at, accessed_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at, accessed_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            if now - accessed_at >= self.touch_interval:
+                self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Enregistre une valeur puis applique l'éviction LRU si nécessaire"""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            if self.max_entries:
+                count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+                overflow = count - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN "
+                        f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                        (overflow,)
+                    )
+                    self.evictions += overflow
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Supprime une entrée du cache"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Supprime toutes les entrées dont la clé commence par le préfixe donné"""
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key LIKE ? ESCAPE '\\'", (pattern,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Vide entièrement le cache"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de hits/misses/évictions et la taille actuelle"""
+        with self._lock:
+            size = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size
+        }
+
+
+class MemoryCache:
+    """
+    Cache clé/valeur en mémoire, partagé entre threads, avec éviction LRU bornée
+    en nombre d'entrées.
+
+    Les valeurs sont copiées à l'écriture et à la lecture: un appelant peut modifier
+    la valeur obtenue sans altérer celle du cache.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries (int): Nombre maximal d'entrées conservées (0 = illimité)
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne une copie de la valeur associée à la clé, ou None si absente"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key]
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Enregistre une copie de la valeur, en évinçant les entrées les moins récemment utilisées"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Supprime une entrée du cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide entièrement le cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de hits/misses/évictions et la taille actuelle"""
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size
+        }
+
+
+class SingleFlight:
+    """
+    Regroupement des calculs concurrents d'une même clé: seul le premier appelant effectue
+    le calcul, les suivants attendent son résultat au lieu de le recalculer.
+
+    Les résultats sont transmis par des concurrent.futures.Future, utilisables aussi bien
+    depuis des threads (future.result()) que depuis asyncio (asyncio.wrap_future).
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Inscrit un calcul pour la clé, ou rejoint celui déjà en cours
+
+        Returns:
+            Tuple[Future, bool]: Future du calcul, et True si l'appelant doit l'effectuer
+            (il doit alors appeler finish), False s'il doit attendre son résultat
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future, False
+            future = self._futures[key] = Future()
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+        """Publie le résultat (ou l'exception) du calcul aux appelants en attente"""
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._futures)
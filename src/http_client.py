@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src import metrics
+from src.rate_limit import AsyncTokenBucket
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# Paramètres du client HTTP partagé (surchargeables via .env)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", 0.5))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", 20))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 20))
+
+# Codes HTTP pour lesquels une nouvelle tentative est pertinente
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_session: Optional["aiohttp.ClientSession"] = None
+
+
+def get_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Retourne la session HTTP partagée (keep-alive), créée au premier appel
+
+    Args:
+        pool_size (int, optional): Nombre de connexions conservées par hôte
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                size = pool_size or HTTP_POOL_SIZE
+                session = requests.Session()
+                # Les nouvelles tentatives sont gérées par get() pour appliquer un backoff avec jitter
+                adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    """Ferme la session partagée et libère les connexions du pool"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Calcule le délai avant la prochaine tentative: backoff exponentiel avec
+    « full jitter », en respectant l'en-tête Retry-After s'il est fourni
+    """
+    delay = random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+    if retry_after:
+        try:
+            delay = max(delay, min(HTTP_BACKOFF_MAX, float(retry_after)))
+        except ValueError:
+            pass
+    return delay
+
+
+def record_retry(url: str, reason: Any) -> None:
+    """Comptabilise une nouvelle tentative (métrique linkedin_http_retries_total)"""
+    metrics.HTTP_RETRIES.inc(host=urlparse(url).hostname or "", reason=reason)
+
+
+def get(url: str, max_retries: Optional[int] = None, **kwargs) -> requests.Response:
+    """
+    Requête GET via la session partagée, avec timeouts et nouvelles tentatives
+    sur les erreurs réseau et les réponses 429/5xx
+
+    Args:
+        url (str): URL à appeler
+        max_retries (int, optional): Nombre maximal de nouvelles tentatives
+        **kwargs: Arguments transmis à requests.Session.get (params, headers, timeout...)
+
+    Returns:
+        requests.Response: Dernière réponse obtenue
+    """
+    retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+    kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    session = get_session()
+
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt >= retries:
+                raise
+            record_retry(url, "network")
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+            record_retry(url, response.status_code)
+            time.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+            continue
+
+        return response
+
+
+async def get_async_session(pool_size: Optional[int] = None) -> "aiohttp.ClientSession":
+    """
+    Retourne la session aiohttp partagée (keep-alive), créée au premier appel
+    dans la boucle d'événements courante
+
+    Args:
+        pool_size (int, optional): Nombre maximal de connexions simultanées
+    """
+    global _async_session
+    if _async_session is None or _async_session.closed:
+        # Import différé: aiohttp n'est chargé que par les traitements asynchrones
+        import aiohttp
+
+        size = pool_size or HTTP_POOL_SIZE
+        _async_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=size, limit_per_host=size),
+            timeout=aiohttp.ClientTimeout(sock_connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_READ_TIMEOUT)
+        )
+    return _async_session
+
+
+async def close_async_session() -> None:
+    """Ferme la session aiohttp partagée"""
+    global _async_session
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+    _async_session = None
+
+
+async def get_json_async(
+    url: str,
+    max_retries: Optional[int] = None,
+    limiter: Optional[AsyncTokenBucket] = None,
+    **kwargs
+) -> Tuple[int, Optional[Any]]:
+    """
+    Requête GET asynchrone via la session partagée, avec les mêmes règles de
+    nouvelles tentatives que get()
+
+    Args:
+        url (str): URL à appeler
+        max_retries (int, optional): Nombre maximal de nouvelles tentatives
+        limiter (AsyncTokenBucket, optional): Limiteur de débit appliqué à chaque tentative
+        **kwargs: Arguments transmis à aiohttp.ClientSession.get (params, headers...)
+
+    Returns:
+        Tuple[int, Any]: Code HTTP et contenu JSON décodé (None si la réponse n'est pas du JSON)
+    """
+    import aiohttp
+
+    retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+    session = await get_async_session()
+
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            await limiter.acquire()
+        try:
+            async with session.get(url, **kwargs) as response:
+                if response.status in RETRY_STATUS_CODES and attempt < retries:
+                    record_retry(url, response.status)
+                    await asyncio.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+                    continue
+                try:
+                    data = await response.json(content_type=None)
+                except (json.JSONDecodeError, aiohttp.ContentTypeError):
+                    data = None
+                return response.status, data
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= retries:
+                raise
+            record_retry(url, "network")
+            await asyncio.sleep(backoff_delay(attempt))
@@ -0,0 +1,162 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+# États successifs d'une tâche
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Signature d'un traitement: handler(params, report_progress) -> résultat (sérialisable en JSON)
+JobHandler = Callable[[Dict[str, Any], Callable[[int, int], None]], Any]
+
+
+class JobQueue:
+    """
+    File de tâches persistante (SQLite) exécutée par un pool de threads en arrière-plan
+
+    Les tâches, leur état, leur progression et leur résultat sont conservés dans la base:
+    un client peut soumettre une tâche, puis en suivre l'avancement par son identifiant
+    depuis n'importe quelle exécution ultérieure (rechargement de page, autre session).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        handlers: Dict[str, JobHandler],
+        workers: int = 2,
+        poll_interval: float = 1.0
+    ):
+        """
+        Args:
+            path (str): Chemin du fichier SQLite
+            handlers (dict): Traitement associé à chaque type de tâche
+            workers (int): Nombre de tâches exécutées simultanément
+            poll_interval (float): Délai maximal (secondes) avant qu'un worker inactif ne relise la file
+        """
+        self.path = path
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress_done INTEGER NOT NULL DEFAULT 0,
+                progress_total INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def start(self) -> None:
+        """
+        Démarre les workers (sans effet s'ils sont déjà démarrés)
+
+        Les tâches restées "running" après un arrêt du processus sont remises en file.
+        """
+        with self._lock:
+            if self._threads:
+                return
+            self._conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (PENDING, RUNNING))
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> str:
+        """
+        Ajoute une tâche à la file
+
+        Returns:
+            str: Identifiant de la tâche
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Type de tâche inconnu: {kind}")
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, params, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(params, ensure_ascii=False), PENDING, time.time())
+            )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne l'état complet d'une tâche, ou None si elle n'existe pas"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        job = dict(zip((column[0] for column in cursor.description), row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def _claim(self) -> Optional[tuple]:
+        """Passe la plus ancienne tâche en attente à l'état "running" et la retourne"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, kind, params FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (PENDING,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, time.time(), row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _worker(self) -> None:
+        while True:
+            job = self._claim()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            job_id, kind, params = job
+
+            def report_progress(done: int, total: int) -> None:
+                self._update(job_id, progress_done=done, progress_total=total)
+
+            try:
+                result = self.handlers[kind](json.loads(params), report_progress)
+                self._update(
+                    job_id, status=DONE, result=json.dumps(result, ensure_ascii=False), finished_at=time.time()
+                )
+            except Exception as e:
+                self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
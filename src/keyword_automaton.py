@@ -0,0 +1,72 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Automate d'Aho-Corasick: recherche simultanée de nombreux mots-clés en un seul
+    parcours du texte (temps linéaire en la longueur du texte, quel que soit le nombre de mots-clés)
+
+    Seules les occurrences de mots entiers sont retenues ("ia" ne correspond pas à "media").
+    Les textes et mots-clés doivent être normalisés au préalable (voir scoring_system.fold_text).
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]]):
+        """
+        Args:
+            keywords: Couples (mot-clé, étiquette), par exemple ("logiciel", "Technologie")
+        """
+        # Transitions, lien d'échec et sorties (longueur du mot-clé, étiquette) de chaque état
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, str]]] = [[]]
+
+        for keyword, label in keywords:
+            self._add(keyword, label)
+        self._build_failure_links()
+
+    def _add(self, keyword: str, label: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(keyword), label))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Recherche tous les mots-clés présents dans le texte
+
+        Returns:
+            List[Tuple[int, str]]: (position de début, étiquette) de chaque occurrence, dans l'ordre du texte
+        """
+        matches = []
+        state = 0
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, label in outputs[state]:
+                start = end - length + 1
+                # Mot entier uniquement: pas de caractère alphanumérique de part et d'autre
+                if (start == 0 or not text[start - 1].isalnum()) and (end + 1 == len(text) or not text[end + 1].isalnum()):
+                    matches.append((start, label))
+        return matches
@@ -0,0 +1,69 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+# URL de profil: schéma, sous-domaine (www, fr, m...) et paramètres optionnels
+PROFILE_URL_PATTERN = re.compile(
+    r'^\s*(?:https?://)?(?:[a-z]{1,3}\.)?linkedin\.com/in/([^/?#\s]+)',
+    re.IGNORECASE
+)
+
+
+def profile_slug(url: str) -> Optional[str]:
+    """
+    Extrait l'identifiant (slug) d'une URL de profil LinkedIn
+
+    Ex: "fr.linkedin.com/in/Jean-Dupont?originalSubdomain=fr" -> "jean-dupont"
+
+    Returns:
+        str: Slug en minuscules, ou None si l'URL n'est pas une URL de profil
+    """
+    match = PROFILE_URL_PATTERN.match(url or "")
+    if not match:
+        return None
+    return unquote(match.group(1)).strip().lower() or None
+
+
+def is_profile_url(url: str) -> bool:
+    """Indique si l'URL désigne un profil LinkedIn public (linkedin.com/in/...)"""
+    return profile_slug(url) is not None
+
+
+def canonical_profile_url(url: str) -> Optional[str]:
+    """
+    Retourne la forme canonique d'une URL de profil LinkedIn
+    (https://www.linkedin.com/in/<slug>/), ou None si l'URL n'est pas reconnue
+    """
+    slug = profile_slug(url)
+    if slug is None:
+        return None
+    return f"https://www.linkedin.com/in/{slug}/"
+
+
+def profile_key(url: str) -> str:
+    """
+    Clé de déduplication d'une URL: le slug du profil, ou l'URL nettoyée
+    si elle n'est pas reconnue comme une URL de profil
+    """
+    return profile_slug(url) or (url or "").strip()
+
+
+def dedupe_profile_urls(urls: List[str]) -> List[Tuple[str, List[int]]]:
+    """
+    Regroupe les variantes d'une même URL de profil avant tout appel réseau
+
+    Args:
+        urls (List[str]): URLs d'entrée, éventuellement en double sous différentes formes
+
+    Returns:
+        List[Tuple[str, List[int]]]: Pour chaque profil distinct (dans l'ordre de première
+        apparition), l'URL à traiter (canonique si possible) et les positions des URLs
+        d'origine correspondantes
+    """
+    groups: Dict[str, Tuple[str, List[int]]] = {}
+    for index, url in enumerate(urls):
+        key = profile_key(url)
+        if key not in groups:
+            groups[key] = (canonical_profile_url(url) or url.strip(), [])
+        groups[key][1].append(index)
+    return list(groups.values())
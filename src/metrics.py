@@ -0,0 +1,330 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Point d'exposition des métriques au format texte Prometheus (METRICS_PORT=0: désactivé)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+
+# Bornes (secondes) des histogrammes de durée: de l'accès au cache à l'appel Gemini le plus long
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+# Échantillon: (nom, étiquettes, valeur)
+Sample = Tuple[str, Labels, float]
+# Famille de métriques produite par un collecteur: (nom, type, description, échantillons)
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_sample(name: str, labels: Labels, value: float) -> str:
+    if labels:
+        formatted = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+        return f"{name}{{{formatted}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class Counter:
+    """Compteur cumulatif, décliné par combinaison d'étiquettes"""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> Family:
+        with self._lock:
+            samples = [(self.name, labels, value) for labels, value in self._values.items()]
+        return self.name, "counter", self.description, samples
+
+
+class Histogram:
+    """Histogramme cumulatif (bornes fixes, somme et nombre d'observations), décliné par étiquettes"""
+
+    def __init__(self, name: str, description: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        # Par combinaison d'étiquettes: [effectif de chaque borne (+ dépassement), somme]
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def collect(self) -> Family:
+        samples = []
+        with self._lock:
+            values = [(labels, list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", labels + (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return self.name, "histogram", self.description, samples
+
+
+class MetricsRegistry:
+    """
+    Ensemble des métriques du processus, exposées au format texte Prometheus
+
+    Outre les compteurs et histogrammes, des collecteurs peuvent fournir des valeurs
+    lues au moment de l'exposition (statistiques des caches, par exemple).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, description))
+
+    def histogram(self, name: str, description: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, description, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> List[Family]:
+        """Retourne toutes les familles de métriques, celles de même nom étant fusionnées"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        families: Dict[str, Family] = {}
+        for family in [metric.collect() for metric in metrics] + [family for collector in collectors for family in collector()]:
+            name, kind, description, samples = family
+            if name in families:
+                families[name][3].extend(samples)
+            else:
+                families[name] = (name, kind, description, list(samples))
+        return list(families.values())
+
+    def render(self) -> str:
+        """Exposition au format texte Prometheus (version 0.0.4)"""
+        lines = []
+        for name, kind, description, samples in self.collect():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(_format_sample(sample_name, labels, value) for sample_name, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_DURATION = REGISTRY.histogram(
+    "linkedin_stage_duration_seconds",
+    "Durée de chaque étape du traitement d'un profil (proxycurl, prompt, gemini, parsing...)"
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "linkedin_http_retries_total",
+    "Nouvelles tentatives du client HTTP partagé, par hôte et motif (code HTTP ou erreur réseau)"
+)
+GEMINI_TOKENS = REGISTRY.counter(
+    "linkedin_gemini_tokens_total",
+    "Tokens consommés par les appels Gemini (type: prompt ou sortie)"
+)
+GEMINI_TOKENS_SAVED = REGISTRY.counter(
+    "linkedin_gemini_tokens_saved_total",
+    "Tokens de prompt économisés par la compaction des profils (estimation)"
+)
+ANALYSES = REGISTRY.counter(
+    "linkedin_analyses_total",
+    "Analyses de profils terminées, par moteur de scoring et statut"
+)
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Expose les statistiques d'un cache (PersistentCache ou MemoryCache): hits, misses,
+    évictions et nombre d'entrées, lues au moment de l'exposition
+    """
+    labels = (("cache", name),)
+
+    def collect() -> List[Family]:
+        stats = cache.stats()
+        return [
+            ("linkedin_cache_hits_total", "counter", "Lectures servies par le cache", [("linkedin_cache_hits_total", labels, stats["hits"])]),
+            ("linkedin_cache_misses_total", "counter", "Lectures absentes du cache ou expirées", [("linkedin_cache_misses_total", labels, stats["misses"])]),
+            ("linkedin_cache_evictions_total", "counter", "Entrées évincées du cache", [("linkedin_cache_evictions_total", labels, stats["evictions"])]),
+            ("linkedin_cache_entries", "gauge", "Nombre d'entrées dans le cache", [("linkedin_cache_entries", labels, stats["size"])])
+        ]
+
+    REGISTRY.register_collector(collect)
+
+
+class StageTimings:
+    """
+    Durées des étapes du traitement d'un profil, mesurées avec une horloge monotone
+
+    Chaque étape est aussi enregistrée dans l'histogramme linkedin_stage_duration_seconds.
+    Une étape exécutée plusieurs fois (nouvelles tentatives, par exemple) cumule ses durées.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        STAGE_DURATION.observe(seconds, stage=name)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mesure la durée du bloc sous le nom d'étape donné"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def finish(self) -> Dict[str, float]:
+        """
+        Termine la mesure (durée totale depuis la création)
+
+        Returns:
+            dict: Durée de chaque étape et durée totale, en millisecondes ("proxycurl_ms", ..., "total_ms")
+        """
+        total = time.perf_counter() - self.started
+        STAGE_DURATION.observe(total, stage="total")
+        timings = {f"{name}_ms": round(seconds * 1000, 1) for name, seconds in self.stages.items()}
+        timings["total_ms"] = round(total * 1000, 1)
+        return timings
+
+
+# Mesure des étapes du profil en cours de traitement (propre à chaque thread et à chaque tâche asyncio)
+_current_timings: ContextVar[Optional[StageTimings]] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def track_stages(timings: Optional[StageTimings]) -> Iterator[Optional[StageTimings]]:
+    """
+    Attribue à `timings` les étapes mesurées par stage() dans le bloc, y compris
+    dans les fonctions appelées (None: étapes enregistrées dans l'histogramme uniquement)
+    """
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mesure une étape du profil en cours de traitement (voir track_stages)"""
+    timings = _current_timings.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if timings is not None:
+            timings.add(name, elapsed)
+        else:
+            STAGE_DURATION.observe(elapsed, stage=name)
+
+
+def iterate_stage(iterable: Iterable[Any], name: str) -> Iterator[Any]:
+    """
+    Parcourt un itérable (réponse en flux) en attribuant à l'étape `name` le seul temps
+    d'attente de chaque élément, hors traitement de ces éléments par l'appelant
+    """
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def iterate_tracked(iterable: Iterable[Any], timings: StageTimings) -> Iterator[Any]:
+    """
+    Parcourt un générateur en lui attribuant `timings` (track_stages) pendant son
+    exécution seulement: le contexte de l'appelant n'est pas modifié entre deux éléments
+    """
+    iterator = iter(iterable)
+    while True:
+        with track_stages(timings):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+    """
+    Démarre (une seule fois par processus) le serveur HTTP exposant GET /metrics,
+    dans un thread en arrière-plan
+
+    Args:
+        port (int): Port d'écoute (0 = pas de serveur)
+        host (str): Adresse d'écoute (locale par défaut)
+
+    Returns:
+        ThreadingHTTPServer: Serveur démarré, ou None si désactivé
+    """
+    global _server
+    with _server_lock:
+        if _server is None and port:
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.split("?", 1)[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = REGISTRY.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args: Any) -> None:
+                    pass
+
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _server = server
+    return _server
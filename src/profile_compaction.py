@@ -0,0 +1,155 @@
+import json
+import math
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from src.scoring_system import years_of_experience
+
+# Budget de tokens alloué au profil dans le prompt Gemini (surchargeable via .env)
+PROMPT_TOKEN_BUDGET = int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", 3000))
+MAX_DESCRIPTION_CHARS = int(os.getenv("GEMINI_MAX_DESCRIPTION_CHARS", 300))
+
+# Approximation usuelle pour les modèles Gemini: ~4 caractères par token
+CHARS_PER_TOKEN = 4
+
+# Champs Proxycurl utiles au scoring (expérience, éducation, secteur)
+PROFILE_FIELDS = ("full_name", "headline", "occupation", "summary", "industry", "country_full_name", "city")
+EXPERIENCE_FIELDS = ("title", "company", "starts_at", "ends_at", "location", "description")
+EDUCATION_FIELDS = ("school", "degree_name", "field_of_study", "starts_at", "ends_at")
+CERTIFICATION_FIELDS = ("name", "authority")
+MAX_SKILLS = 30
+
+# Réductions successives appliquées tant que le budget est dépassé:
+# (longueur maximale des descriptions, nombre maximal d'expériences/formations)
+REDUCTION_STEPS = ((None, None), (150, None), (0, None), (0, 10), (0, 5))
+
+# Champs ajoutés au profil compacté et calculés par rapport à la date du jour (postes en cours):
+# ils changent sans que le profil change, et sont exclus des clés de cache
+DATE_DERIVED_FIELDS = ("experience_annees_calculee",)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estime le nombre de tokens d'un texte"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _compact_date(date: Any) -> Optional[str]:
+    """Convertit une date Proxycurl {"day", "month", "year"} en "AAAA-MM" """
+    if not isinstance(date, dict) or not date.get("year"):
+        return None
+    if date.get("month"):
+        return f"{date['year']:04d}-{date['month']:02d}"
+    return str(date["year"])
+
+
+def _truncate(text: Any, limit: int) -> Optional[str]:
+    """Tronque un texte à `limit` caractères (None si vide ou limite nulle)"""
+    if not text or not isinstance(text, str) or limit <= 0:
+        return None
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def _compact_item(item: Dict[str, Any], fields: Tuple[str, ...], description_limit: int) -> Dict[str, Any]:
+    """Ne conserve que les champs utiles d'une expérience ou d'une formation"""
+    compacted = {}
+    for field in fields:
+        value = item.get(field)
+        if field in ("starts_at", "ends_at"):
+            value = _compact_date(value)
+        elif field == "description":
+            value = _truncate(value, description_limit)
+        if value not in (None, "", []):
+            compacted[field] = value
+    return compacted
+
+
+def _compact(profile_data: Dict[str, Any], description_limit: int, max_items: Optional[int]) -> Dict[str, Any]:
+    compacted: Dict[str, Any] = {}
+    for field in PROFILE_FIELDS:
+        value = profile_data.get(field)
+        if field == "summary":
+            value = _truncate(value, description_limit)
+        if value:
+            compacted[field] = value
+
+    experiences = [
+        _compact_item(exp, EXPERIENCE_FIELDS, description_limit)
+        for exp in (profile_data.get("experiences") or [])[:max_items]
+    ]
+    for experience in experiences:
+        # Un poste sans date de fin est le poste actuel
+        if "starts_at" in experience and "ends_at" not in experience:
+            experience["ends_at"] = "présent"
+    education = [
+        _compact_item(edu, EDUCATION_FIELDS, description_limit)
+        for edu in (profile_data.get("education") or [])[:max_items]
+    ]
+    certifications = [
+        _compact_item(cert, CERTIFICATION_FIELDS, 0)
+        for cert in (profile_data.get("certifications") or [])[:max_items]
+    ]
+
+    if experiences:
+        compacted["experiences"] = experiences
+    if education:
+        compacted["education"] = education
+    if certifications:
+        compacted["certifications"] = certifications
+    if profile_data.get("languages"):
+        compacted["languages"] = profile_data["languages"]
+    if profile_data.get("skills"):
+        compacted["skills"] = profile_data["skills"][:MAX_SKILLS]
+
+    return compacted
+
+
+def compact_profile(
+    profile_data: Dict[str, Any],
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+    max_description_chars: int = MAX_DESCRIPTION_CHARS
+) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Réduit un profil Proxycurl aux champs utiles au scoring, dans la limite d'un budget de tokens
+
+    Les champs sans intérêt pour le scoring (photos, "people also viewed", activités,
+    homonymes...) sont supprimés, les dates simplifiées et les descriptions tronquées.
+    Si le budget est encore dépassé, les descriptions sont raccourcies puis retirées,
+    et enfin seules les expériences/formations les plus récentes sont conservées.
+
+    Le nombre d'années d'expérience, calculé localement sur toutes les expériences
+    (chevauchements fusionnés), est ajouté sous "experience_annees_calculee".
+
+    Args:
+        profile_data (dict): Données brutes du profil LinkedIn (Proxycurl)
+        token_budget (int): Nombre maximal de tokens estimés pour le profil compacté
+        max_description_chars (int): Longueur maximale initiale des descriptions
+
+    Returns:
+        Tuple[dict, dict]: Profil compacté et statistiques (octets/tokens avant, après et économisés)
+    """
+    original = json.dumps(profile_data, indent=2, ensure_ascii=False)
+    years = years_of_experience(profile_data.get("experiences") or [])
+
+    for description_limit, max_items in REDUCTION_STEPS:
+        if description_limit is None:
+            description_limit = max_description_chars
+        compacted = _compact(profile_data, description_limit, max_items)
+        compacted["experience_annees_calculee"] = years
+        serialized = json.dumps(compacted, ensure_ascii=False, separators=(",", ":"))
+        if estimate_tokens(serialized) <= token_budget:
+            break
+
+    bytes_before = len(original.encode("utf-8"))
+    bytes_after = len(serialized.encode("utf-8"))
+    tokens_before = estimate_tokens(original)
+    tokens_after = estimate_tokens(serialized)
+
+    return compacted, {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_saved": bytes_before - bytes_after,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after
+    }
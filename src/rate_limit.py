@@ -0,0 +1,46 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """
+    Limiteur de débit asynchrone (seau à jetons)
+
+    Le seau se remplit de `rate` jetons par seconde, jusqu'à `capacity` jetons.
+    Chaque requête consomme un jeton; en l'absence de jeton disponible, acquire()
+    attend le temps nécessaire. Les appelants sont servis dans l'ordre d'arrivée.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate (float): Nombre de requêtes autorisées par seconde (0 = illimité)
+            capacity (float, optional): Rafale maximale (par défaut: une seconde de débit, au moins 1)
+        """
+        self._lock = asyncio.Lock()
+        self.set_rate(rate, capacity)
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Modifie le débit autorisé (et la rafale maximale)"""
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Attend qu'un jeton soit disponible puis le consomme"""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -0,0 +1,145 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+class JsonlResultsWriter:
+    """
+    Écriture incrémentale des résultats au format JSON Lines (un objet JSON compact par ligne)
+
+    Chaque ligne est écrite dès que le résultat est disponible, puis les données sont
+    synchronisées sur disque (fsync) toutes les `fsync_every` lignes ou toutes les
+    `fsync_interval` secondes: un arrêt brutal ne fait perdre que les derniers résultats.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 50, fsync_interval: float = 5.0, append: bool = False):
+        """
+        Args:
+            path (str): Chemin du fichier .jsonl
+            fsync_every (int): Nombre de lignes entre deux synchronisations disque
+            fsync_interval (float): Délai maximal (secondes) entre deux synchronisations disque
+            append (bool): Compléter un fichier existant (reprise) au lieu de l'écraser
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.count = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+        # Une ligne tronquée par un arrêt brutal ne doit pas absorber le prochain résultat
+        if append and self._file.tell() > 0:
+            with open(path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Ajoute un résultat au fichier"""
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.count += 1
+        self._unsynced += 1
+
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Force l'écriture des données sur disque"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Ferme le fichier, après avoir ajouté un enregistrement de synthèse si fourni
+
+        Args:
+            summary (dict, optional): Bilan du lot, écrit sous la forme {"summary": {...}}
+        """
+        if self._file.closed:
+            return
+        if summary is not None:
+            self._file.write(json.dumps({"summary": summary}, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "JsonlResultsWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def validate_jsonl_file(path: str) -> None:
+    """
+    Vérifie qu'un fichier existant est au format JSON Lines (un objet JSON par ligne)
+    avant d'y ajouter des résultats
+
+    Seule la dernière ligne peut être invalide (ligne tronquée par un arrêt brutal).
+    Un fichier absent ou vide est accepté.
+
+    Raises:
+        ValueError: Si le fichier n'est pas au format JSON Lines
+    """
+    if not os.path.exists(path):
+        return
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+    except UnicodeDecodeError:
+        raise ValueError(f"{path} n'est pas un fichier texte UTF-8")
+
+    for number, line in enumerate(lines, start=1):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            if number == len(lines) and number > 1:
+                continue
+            raise ValueError(f"{path} n'est pas un fichier JSON Lines (ligne {number} invalide)")
+        if not isinstance(record, dict):
+            raise ValueError(f"{path} n'est pas un fichier JSON Lines (ligne {number}: objet JSON attendu)")
+
+
+def load_checkpoint(path: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Lit un fichier de résultats JSON Lines existant et indexe les URLs déjà traitées
+
+    Les lignes invalides (ex: dernière ligne tronquée) et les enregistrements de
+    synthèse sont ignorés. Une URL ayant réussi au moins une fois est considérée
+    comme traitée, même si elle a aussi échoué lors d'une exécution précédente.
+
+    Args:
+        path (str): Chemin du fichier .jsonl
+
+    Returns:
+        Tuple[Set[str], Set[str]]: URLs traitées avec succès, URLs uniquement en échec
+    """
+    succeeded: Set[str] = set()
+    failed: Set[str] = set()
+
+    if not os.path.exists(path):
+        return succeeded, failed
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict) or "summary" in record or not record.get("url"):
+                continue
+            if record.get("success", False):
+                succeeded.add(record["url"])
+            else:
+                failed.add(record["url"])
+
+    return succeeded, failed - succeeded
@@ -0,0 +1,43 @@
+import json
+from typing import Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class SousScores(BaseModel):
+    """Sous-scores indépendants (0-10) attribués par Gemini"""
+
+    experience: float
+    education: float
+    secteur: float
+
+    @field_validator("experience", "education", "secteur")
+    @classmethod
+    def clamp_score(cls, value: float) -> float:
+        # Un sous-score hors bornes est ramené dans l'intervalle 0-10 plutôt que rejeté
+        return min(10.0, max(0.0, value))
+
+
+class AnalysisDetails(BaseModel):
+    """Éléments du profil identifiés lors de l'analyse"""
+
+    model_config = ConfigDict(extra="allow")
+
+    experience_annees: Union[int, float, str] = "Non déterminé"
+    niveau_education: str = "Non déterminé"
+    secteur_activite: str = "Non déterminé"
+
+
+class GeminiAnalysis(BaseModel):
+    """Résultat d'analyse attendu de Gemini pour un profil"""
+
+    model_config = ConfigDict(extra="allow")
+
+    sous_scores: SousScores
+    justification: str = ""
+    details: AnalysisDetails = Field(default_factory=AnalysisDetails)
+    raisonnement: str = Field(default="", description="Raisonnement étape par étape ayant conduit aux sous-scores")
+
+
+# Schéma JSON transmis à Gemini en mode de sortie structurée (calculé une seule fois)
+GEMINI_ANALYSIS_SCHEMA = json.dumps(GeminiAnalysis.model_json_schema(), ensure_ascii=False, separators=(",", ":"))
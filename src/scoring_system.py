@@ -0,0 +1,414 @@
+import unicodedata
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.keyword_automaton import KeywordAutomaton
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Sous-score (0-10) associé à chaque niveau d'éducation de l'échelle utilisée par le prompt Gemini
+EDUCATION_SCORES = {
+    "Doctorat": 10.0,
+    "Master": 9.0,
+    "Licence": 7.0,
+    "BTS/DUT": 5.5,
+    "Baccalauréat": 4.0,
+    "Aucun": 2.0
+}
+
+# Sous-score (0-10) associé à chaque secteur d'activité
+SECTOR_SCORES = {
+    "Technologie": 9.0,
+    "Finance": 8.5,
+    "Santé": 8.0,
+    "Production": 6.5,
+    "Commerce": 6.0,
+    "Éducation": 6.0,
+    "Autre": 5.0
+}
+
+# Nombre d'années d'expérience correspondant au sous-score maximal
+YEARS_FOR_MAX_SCORE = 15.0
+
+
+def fold_text(text: str) -> str:
+    """Met un texte en minuscules et retire les accents (comparaisons insensibles à la casse et aux accents)"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+# Alias des diplômes (français et anglais, sans accents) de chaque niveau d'éducation
+EDUCATION_ALIASES = {
+    "Doctorat": ["phd", "ph.d", "ph. d", "doctorat", "doctorate", "docteur", "doctor of philosophy", "dphil",
+                 "these de doctorat", "doctoral degree"],
+    "Master": ["master", "masters", "mastere", "mastere specialise", "ms", "msc", "m.sc", "m.s", "mba", "emba",
+               "m2", "m1", "meng", "master of science", "master of arts", "master of engineering", "ingenieur",
+               "diplome d'ingenieur", "engineer", "engineer's degree", "engineering degree", "dea", "dess",
+               "grande ecole", "programme grande ecole", "bac+5", "bac +5", "bac+4", "bac +4"],
+    "Licence": ["licence", "licence professionnelle", "license", "bachelor", "bachelors", "bachelor of science",
+                "bachelor of arts", "bachelor of engineering", "bsc", "b.sc", "ba", "bs", "b.s", "beng", "l3", "but",
+                "bac+3", "bac +3"],
+    "BTS/DUT": ["bts", "dut", "deust", "deug", "associate", "associate degree", "associate's degree", "hnd",
+                "bac+2", "bac +2"],
+    "Baccalauréat": ["baccalaureat", "bac", "bac s", "bac es", "bac pro", "high school", "high school diploma",
+                     "lycee", "a-levels", "a levels"]
+}
+
+# Rang de chaque niveau (plus il est élevé, plus le diplôme l'est)
+EDUCATION_RANKS = {level: rank for rank, level in enumerate(reversed(list(EDUCATION_SCORES)))}
+EDUCATION_LEVELS_BY_RANK = {rank: level for level, rank in EDUCATION_RANKS.items()}
+
+# Table des alias compilée une seule fois à l'import
+EDUCATION_AUTOMATON = KeywordAutomaton(
+    (alias, level) for level, aliases in EDUCATION_ALIASES.items() for alias in aliases
+)
+
+# Nombre d'intitulés de diplômes bruts dont le niveau est mémorisé
+DEGREE_CACHE_SIZE = 8192
+
+
+# Mots-clés (français et anglais, sans accents) de chaque secteur d'activité
+SECTOR_KEYWORDS = {
+    "Technologie": ["software", "logiciel", "logiciels", "informatique", "computer", "computer software", "internet",
+                    "tech", "technology", "technologies", "technologie", "information technology", "developer",
+                    "developpeur", "developpeuse", "software engineer", "ingenieur logiciel", "data", "data scientist",
+                    "data engineer", "cloud", "ai", "ia", "machine learning", "intelligence artificielle", "saas",
+                    "it", "cto", "devops", "cybersecurity", "cybersecurite", "telecommunications", "telecom",
+                    "numerique", "digital", "esn", "ssii", "startup", "full stack", "fullstack", "backend", "frontend"],
+    "Finance": ["finance", "financial", "financial services", "services financiers", "bank", "banque", "banking",
+                "investment", "investment banking", "investissement", "insurance", "assurance", "assurances",
+                "fintech", "audit", "auditeur", "accounting", "comptabilite", "comptable", "trading", "trader",
+                "asset management", "gestion d'actifs", "private equity", "venture capital", "capital risque",
+                "credit", "bourse", "controleur de gestion"],
+    "Santé": ["health", "healthcare", "sante", "hospital", "hopital", "medical", "medecin", "medecine", "pharma",
+              "pharmaceutical", "pharmaceutique", "pharmaceuticals", "biotech", "biotechnology", "biotechnologie",
+              "clinical", "clinique", "infirmier", "infirmiere", "nurse", "laboratoire", "dentiste", "medtech"],
+    "Production": ["manufacturing", "production", "industrie", "industry", "industrial", "industriel",
+                   "industrielle", "automotive", "automobile", "usine", "factory", "aerospace", "aeronautique",
+                   "aviation", "energy", "energie", "oil & gas", "petrole", "chimie", "chemicals", "btp",
+                   "construction", "mechanical", "mecanique", "supply chain", "logistique", "logistics"],
+    "Commerce": ["retail", "commerce", "sales", "vente", "ventes", "commercial", "commerciale", "e-commerce",
+                 "ecommerce", "marketing", "distribution", "consumer goods", "biens de consommation", "consumer",
+                 "business development", "grande distribution", "luxury", "luxe", "account manager",
+                 "key account manager", "responsable commercial"],
+    "Éducation": ["education", "teacher", "enseignant", "enseignante", "professeur", "professor", "university",
+                  "universite", "school", "ecole", "teaching", "enseignement", "formation", "formateur",
+                  "formatrice", "edtech", "higher education", "enseignement superieur", "e-learning", "academie"]
+}
+
+# Automate construit une seule fois à l'import: un seul parcours du texte pour tous les secteurs
+SECTOR_AUTOMATON = KeywordAutomaton(
+    (keyword, sector) for sector, keywords in SECTOR_KEYWORDS.items() for keyword in keywords
+)
+
+# Poids de chaque source dans la détermination du secteur (le secteur déclaré prime sur les intitulés)
+SECTOR_SOURCE_WEIGHTS = {"industry": 3.0, "company": 2.0, "headline": 1.0, "title": 1.0}
+
+# Nombre d'entreprises dont le secteur est mémorisé
+COMPANY_SECTOR_CACHE_SIZE = 4096
+
+
+def _month_index(value: Any) -> Optional[int]:
+    """Convertit une date Proxycurl {"day", "month", "year"} en nombre de mois depuis l'an 0"""
+    if not isinstance(value, dict) or not value.get("year"):
+        return None
+    return int(value["year"]) * 12 + int(value.get("month") or 1) - 1
+
+
+def _current_month(today: Optional[date] = None) -> int:
+    """Mois courant (ou de la date de référence) en nombre de mois depuis l'an 0"""
+    today = today or date.today()
+    return today.year * 12 + today.month - 1
+
+
+def experience_intervals(experiences: List[Dict[str, Any]], today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """
+    Convertit les expériences en intervalles [début, fin[ exprimés en mois
+
+    Les postes sans date de fin sont considérés comme en cours; ceux sans date de début sont ignorés.
+    """
+    current_month = _current_month(today)
+    intervals = []
+    for experience in experiences or []:
+        start = _month_index(experience.get("starts_at"))
+        if start is None:
+            continue
+        end = _month_index(experience.get("ends_at"))
+        end = current_month if end is None else end
+        intervals.append((start, max(start, end) + 1))
+    return intervals
+
+
+def batch_years_of_experience(
+    profiles_experiences: Sequence[List[Dict[str, Any]]],
+    today: Optional[date] = None
+) -> "np.ndarray":
+    """
+    Calcule en une passe vectorisée le nombre total d'années d'expérience de plusieurs profils
+
+    Les intervalles de tous les profils sont rassemblés dans des tableaux NumPy, triés par
+    profil puis par date de début; les périodes où plusieurs postes se chevauchent ne sont
+    comptées qu'une fois.
+
+    Args:
+        profiles_experiences: Liste des expériences (schéma Proxycurl) de chaque profil
+        today (date, optional): Date de référence pour les postes en cours
+
+    Returns:
+        np.ndarray: Années d'expérience de chaque profil (une décimale), dans l'ordre d'entrée
+    """
+    import numpy as np
+
+    count = len(profiles_experiences)
+    rows = [
+        (index, start, end)
+        for index, experiences in enumerate(profiles_experiences)
+        for start, end in experience_intervals(experiences, today)
+    ]
+    if not rows:
+        return np.zeros(count)
+
+    profile_ids, starts, ends = np.array(rows, dtype=np.int64).T
+
+    # Décalage de chaque profil sur sa propre plage de mois: le maximum cumulé des fins
+    # ne déborde ainsi jamais d'un profil sur le suivant
+    offset = int(ends.max()) + 1
+    starts = starts + profile_ids * offset
+    ends = ends + profile_ids * offset
+
+    order = np.lexsort((starts, profile_ids))
+    starts, ends, profile_ids = starts[order], ends[order], profile_ids[order]
+
+    # Fin la plus tardive des intervalles précédents: seule la partie au-delà est nouvelle
+    covered_until = np.empty_like(ends)
+    covered_until[0] = starts[0]
+    covered_until[1:] = np.maximum.accumulate(ends)[:-1]
+    new_months = np.clip(ends - np.maximum(starts, covered_until), 0, None)
+
+    total_months = np.bincount(profile_ids, weights=new_months, minlength=count)
+    return np.round(total_months / 12, 1)
+
+
+def years_of_experience(experiences: List[Dict[str, Any]], today: Optional[date] = None) -> float:
+    """
+    Calcule le nombre total d'années d'expérience, sans compter deux fois les périodes
+    où plusieurs postes se chevauchent
+
+    Variante pour un seul profil de batch_years_of_experience (même résultat, sans NumPy)
+    """
+    total_months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(experience_intervals(experiences, today)):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total_months += current_end - current_start
+    return round(total_months / 12, 1)
+
+
+def experience_confidence(experiences: List[Dict[str, Any]]) -> float:
+    """Confiance (0-1) dans le calcul de l'expérience: part des postes correctement datés"""
+    if not experiences:
+        return 0.2
+    dated = sum(1 for exp in experiences if _month_index(exp.get("starts_at")) is not None)
+    return round(dated / len(experiences), 2)
+
+
+def highest_education_level(levels: Iterable[str]) -> str:
+    """Retourne le plus haut niveau d'une liste de niveaux (échelle Doctorat ... Aucun)"""
+    return max(levels, key=EDUCATION_RANKS.__getitem__, default="Aucun")
+
+
+@lru_cache(maxsize=DEGREE_CACHE_SIZE)
+def normalize_degree(degree: str) -> str:
+    """
+    Ramène un intitulé de diplôme brut ("MSc Computer Science", "Diplôme d'ingénieur", "M2"...)
+    à l'échelle Doctorat, Master, Licence, BTS/DUT, Baccalauréat, Aucun
+
+    Insensible à la casse et aux accents; le résultat est mémorisé par intitulé brut.
+    """
+    return highest_education_level(level for _, level in EDUCATION_AUTOMATON.find(fold_text(degree)))
+
+
+def education_level(education: List[Dict[str, Any]]) -> str:
+    """Détermine le plus haut niveau d'éducation d'un profil (échelle Doctorat ... Aucun)"""
+    return highest_education_level(
+        normalize_degree(item.get(field) or "")
+        for item in education or []
+        for field in ("degree_name", "field_of_study")
+    )
+
+
+def normalize_degree_column(degrees: "pd.Series", by: Optional["pd.Series"] = None) -> "pd.Series":
+    """
+    Normalise une colonne pandas d'intitulés de diplômes
+
+    Chaque intitulé distinct n'est analysé qu'une fois, puis le résultat est diffusé sur la colonne.
+
+    Args:
+        degrees (pd.Series): Intitulés bruts (valeurs manquantes acceptées)
+        by (pd.Series, optional): Identifiant du profil de chaque ligne; si fourni, seul
+            le plus haut niveau de chaque profil est retourné
+
+    Returns:
+        pd.Series: Niveau de chaque ligne, ou de chaque profil si by est fourni
+    """
+    mapping = {degree: normalize_degree(str(degree)) for degree in degrees.dropna().unique()}
+    levels = degrees.map(mapping).fillna("Aucun")
+    if by is None:
+        return levels
+    return levels.map(EDUCATION_RANKS).groupby(by).max().map(EDUCATION_LEVELS_BY_RANK)
+
+
+def current_positions(experiences: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Retourne les postes en cours (sans date de fin), ou à défaut le plus récent"""
+    current = [exp for exp in experiences or [] if exp.get("starts_at") and not exp.get("ends_at")]
+    if current or not experiences:
+        return current
+    return sorted(experiences, key=lambda exp: _month_index(exp.get("starts_at")) or 0)[-1:]
+
+
+def sector_votes(text: str) -> Dict[str, int]:
+    """Compte les mots-clés de chaque secteur présents dans un texte (parcours linéaire unique)"""
+    votes: Dict[str, int] = {}
+    for _, sector in SECTOR_AUTOMATON.find(fold_text(text)):
+        votes[sector] = votes.get(sector, 0) + 1
+    return votes
+
+
+def _best_sector(votes: Dict[str, float]) -> Optional[str]:
+    """Secteur le plus représenté; à égalité, l'ordre de SECTOR_KEYWORDS départage"""
+    if not votes:
+        return None
+    return max(SECTOR_KEYWORDS, key=lambda sector: votes.get(sector, 0))
+
+
+@lru_cache(maxsize=COMPANY_SECTOR_CACHE_SIZE)
+def company_sector(company: str) -> Optional[str]:
+    """Secteur suggéré par le nom d'une entreprise (mémorisé par entreprise), None si aucun indice"""
+    return _best_sector(sector_votes(company))
+
+
+def sector_of_activity(profile_data: Dict[str, Any]) -> str:
+    """
+    Détermine le secteur d'activité à partir du secteur déclaré, du titre, des postes actuels
+    et de leurs entreprises, chaque source votant avec son poids (SECTOR_SOURCE_WEIGHTS)
+    """
+    votes: Dict[str, float] = {}
+
+    def vote(sector_counts: Dict[str, int], weight: float) -> None:
+        for sector, count in sector_counts.items():
+            votes[sector] = votes.get(sector, 0.0) + count * weight
+
+    vote(sector_votes(profile_data.get("industry") or ""), SECTOR_SOURCE_WEIGHTS["industry"])
+    vote(sector_votes(f"{profile_data.get('headline') or ''} | {profile_data.get('occupation') or ''}"),
+         SECTOR_SOURCE_WEIGHTS["headline"])
+    for position in current_positions(profile_data.get("experiences") or []):
+        vote(sector_votes(position.get("title") or ""), SECTOR_SOURCE_WEIGHTS["title"])
+        sector = company_sector(position.get("company") or "")
+        if sector:
+            vote({sector: 1}, SECTOR_SOURCE_WEIGHTS["company"])
+
+    return _best_sector(votes) or "Autre"
+
+
+class ProfileScorer:
+    """
+    Moteur de scoring local et déterministe, basé sur des règles appliquées au schéma Proxycurl
+
+    Aucun appel réseau: le score d'un profil est calculé en bien moins d'une milliseconde.
+    """
+
+    def __init__(self, exp_weight: float = 0.4, edu_weight: float = 0.3, sector_weight: float = 0.3):
+        """
+        Args:
+            exp_weight (float): Poids pour l'expérience professionnelle (0-1)
+            edu_weight (float): Poids pour le niveau d'éducation (0-1)
+            sector_weight (float): Poids pour le secteur d'activité (0-1)
+        """
+        self.exp_weight = exp_weight
+        self.edu_weight = edu_weight
+        self.sector_weight = sector_weight
+
+    def calculate_score(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calcule les sous-scores et le score global d'un profil
+
+        Args:
+            profile_data (dict): Données du profil LinkedIn (schéma Proxycurl)
+
+        Returns:
+            dict: {"scores": {"global", "experience", "education", "secteur"}, "confidence": {...},
+            "details": {...}, "ponderations": {...}}
+        """
+        experiences = profile_data.get("experiences") or []
+        return self._score(profile_data, years_of_experience(experiences))
+
+    def calculate_scores(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Calcule les scores d'un lot de profils (années d'expérience calculées en une passe vectorisée)
+
+        Args:
+            profiles (list): Données des profils LinkedIn (schéma Proxycurl)
+
+        Returns:
+            list: Résultats de calculate_score, dans l'ordre des profils
+        """
+        years = batch_years_of_experience([profile.get("experiences") or [] for profile in profiles])
+        return [self._score(profile, float(profile_years)) for profile, profile_years in zip(profiles, years)]
+
+    def _score(self, profile_data: Dict[str, Any], years: float) -> Dict[str, Any]:
+        """Calcule les sous-scores d'un profil à partir de ses années d'expérience déjà calculées"""
+        experiences = profile_data.get("experiences") or []
+        education = profile_data.get("education") or []
+        level = education_level(education)
+        sector = sector_of_activity(profile_data)
+
+        scores = {
+            "experience": round(min(10.0, years * 10.0 / YEARS_FOR_MAX_SCORE), 2),
+            "education": EDUCATION_SCORES[level],
+            "secteur": SECTOR_SCORES[sector]
+        }
+        scores["global"] = self.global_score(scores)
+
+        # Confiance (0-1) dans chaque sous-score: un critère non reconnu est peu fiable
+        confidence = {
+            "experience": experience_confidence(experiences),
+            "education": 1.0 if level != "Aucun" else (0.3 if education else 0.6),
+            "secteur": 1.0 if sector != "Autre" else 0.4
+        }
+        confidence["global"] = self.global_score(confidence)
+
+        return {
+            "scores": scores,
+            "confidence": confidence,
+            "details": {
+                "experience_annees": years,
+                "niveau_education": level,
+                "secteur_activite": sector
+            },
+            "ponderations": {
+                "experience": int(round(self.exp_weight * 100)),
+                "education": int(round(self.edu_weight * 100)),
+                "secteur": int(round(self.sector_weight * 100))
+            }
+        }
+
+    def global_score(self, scores: Dict[str, float]) -> float:
+        """Moyenne pondérée des sous-scores (ou des confiances), avec deux décimales"""
+        total_weight = self.exp_weight + self.edu_weight + self.sector_weight
+        if total_weight <= 0:
+            return 0.0
+        weighted = (
+            scores["experience"] * self.exp_weight
+            + scores["education"] * self.edu_weight
+            + scores["secteur"] * self.sector_weight
+        )
+        return round(weighted / total_weight, 2)
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Caches des modules importés par les tests (scrape_linkedin) isolés dans un dossier temporaire
+_CACHE_DIR = tempfile.TemporaryDirectory(prefix="linkedin-tests-")
+os.environ["CACHE_PATH"] = os.path.join(_CACHE_DIR.name, "cache.sqlite3")
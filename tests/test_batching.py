@@ -0,0 +1,185 @@
+import asyncio
+import json
+import re
+
+import pytest
+
+import scrape_linkedin
+from src.batching import AsyncMicroBatcher
+
+ANALYSIS = {
+    "sous_scores": {"experience": 7.5, "education": 9.0, "secteur": 8.5},
+    "justification": "Analyse de test.",
+    "details": {"experience_annees": 9, "niveau_education": "Master", "secteur_activite": "Technologie"}
+}
+
+
+def test_batcher_groups_concurrent_submissions():
+    batches = []
+
+    async def process(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    async def run():
+        batcher = AsyncMicroBatcher(process, max_batch_size=3, max_wait=0.05)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(run()) == [0, 10, 20, 30, 40]
+    # Un lot complet dès 3 éléments, le reste à l'expiration du délai
+    assert batches == [[0, 1, 2], [3, 4]]
+
+
+def test_batcher_propagates_batch_errors_to_every_caller():
+    async def process(items):
+        raise RuntimeError("lot en échec")
+
+    async def run():
+        batcher = AsyncMicroBatcher(process, max_batch_size=2, max_wait=0.01)
+        return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class FakeGeminiModel:
+    """
+    Répond aux prompts multi-profils en omettant les identifiants de `drop`, par un texte
+    illisible, ou en levant `batch_error` pour les lots d'au moins `failing_size` profils
+    """
+
+    def __init__(self, drop=(), unreadable_batches=0, batch_error=None, failing_size=2):
+        self.drop = set(drop)
+        self.unreadable_batches = unreadable_batches
+        self.batch_error = batch_error
+        self.failing_size = failing_size
+        self.prompts = []
+
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        profile_ids = re.findall(r"### Profil (p\d+)", prompt)
+        if not profile_ids:
+            return type("Response", (), {"text": json.dumps(ANALYSIS)})()
+        if self.batch_error is not None and len(profile_ids) >= self.failing_size:
+            raise self.batch_error
+        if self.unreadable_batches:
+            self.unreadable_batches -= 1
+            return type("Response", (), {"text": "Désolé, je ne peux pas répondre."})()
+        items = [{"id": profile_id, **ANALYSIS} for profile_id in profile_ids if profile_id not in self.drop]
+        # Un identifiant omis n'est omis qu'une fois
+        self.drop.clear()
+        return type("Response", (), {"text": json.dumps(items)})()
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    def install(model):
+        monkeypatch.setattr(scrape_linkedin, "gemini_model", lambda *args, **kwargs: model)
+        monkeypatch.setattr(scrape_linkedin.gemini_limiter, "rate", 0)
+        return model
+    return install
+
+
+def test_batch_retries_only_missing_profiles(fake_model):
+    model = fake_model(FakeGeminiModel(drop={"p1", "p3"}))
+    profiles = [{"full_name": f"Profil {i}"} for i in range(4)]
+
+    results = asyncio.run(scrape_linkedin.analyze_profiles_batch_async(profiles))
+
+    assert all(result["sous_scores"]["experience"] == 7.5 for result in results)
+    # Un lot de 4 puis un lot réduit aux 2 profils manquants
+    assert [len(re.findall(r"### Profil ", prompt)) for prompt in model.prompts] == [4, 2]
+
+
+def test_unreadable_batch_is_split_in_halves(fake_model):
+    model = fake_model(FakeGeminiModel(unreadable_batches=1))
+    profiles = [{"full_name": f"Profil {i}"} for i in range(4)]
+
+    results = asyncio.run(scrape_linkedin.analyze_profiles_batch_async(profiles))
+
+    assert len(results) == 4 and all("error" not in result for result in results)
+    assert sorted(len(re.findall(r"### Profil ", prompt)) for prompt in model.prompts) == [2, 2, 4]
+
+
+def test_transport_error_reaches_every_caller_without_splitting(fake_model):
+    model = fake_model(FakeGeminiModel(batch_error=ConnectionError("connexion réinitialisée")))
+
+    async def run():
+        batcher = scrape_linkedin.create_gemini_batcher(batch_size=4, max_wait=0.01)
+        return await asyncio.gather(
+            *(batcher.submit({"full_name": f"Profil {i}"}) for i in range(4)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert len(model.prompts) == 1
+
+
+def test_service_errors_are_transport_errors():
+    exceptions = pytest.importorskip("google.api_core.exceptions")
+    assert scrape_linkedin.is_transport_error(exceptions.ServiceUnavailable("indisponible"))
+    assert scrape_linkedin.is_transport_error(exceptions.TooManyRequests("quota"))
+    assert scrape_linkedin.is_transport_error(TimeoutError())
+    # Requête refusée pour son contenu (prompt trop long): un lot plus petit peut réussir
+    assert not scrape_linkedin.is_transport_error(exceptions.InvalidArgument("prompt trop long"))
+    assert not scrape_linkedin.is_transport_error(ValueError("réponse invalide"))
+
+
+def test_oversized_batch_is_split(fake_model):
+    model = fake_model(FakeGeminiModel(batch_error=ValueError("prompt trop long"), failing_size=3))
+    profiles = [{"full_name": f"Profil {i}"} for i in range(4)]
+
+    results = asyncio.run(scrape_linkedin.analyze_profiles_batch_async(profiles))
+
+    assert len(results) == 4 and all("error" not in result for result in results)
+    assert sorted(len(re.findall(r"### Profil ", prompt)) for prompt in model.prompts) == [2, 2, 4]
+
+
+def test_local_batcher_scores_concurrent_profiles_in_one_vectorized_pass(monkeypatch):
+    profiles = {
+        f"https://www.linkedin.com/in/local-{index}/": {
+            "full_name": f"Profil {index}",
+            "experiences": [{"title": "Data engineer", "starts_at": {"year": 2010 + index, "month": 1}, "ends_at": None}],
+            "education": [{"degree_name": "MSc Computer Science"}],
+            "industry": "Computer Software"
+        }
+        for index in range(6)
+    }
+
+    async def fake_extract(url, use_cache=True):
+        return profiles[url]
+
+    passes = []
+    calculate_scores = scrape_linkedin.ProfileScorer.calculate_scores
+
+    def recording_calculate_scores(self, batch):
+        passes.append(len(batch))
+        return calculate_scores(self, batch)
+
+    monkeypatch.setattr(scrape_linkedin, "extract_linkedin_data_async", fake_extract)
+    monkeypatch.setattr(scrape_linkedin.ProfileScorer, "calculate_scores", recording_calculate_scores)
+
+    async def run():
+        local_batcher = scrape_linkedin.create_local_batcher(confidence_threshold=0.0, batch_size=len(profiles))
+        return await asyncio.gather(*(
+            scrape_linkedin.process_linkedin_profile_async(url, tiered=True, local_batcher=local_batcher)
+            for url in profiles
+        ))
+
+    results = asyncio.run(run())
+    assert passes == [len(profiles)]
+    assert [result["moteur_scoring"] for result in results] == ["local"] * len(profiles)
+    expected = [scrape_linkedin.local_analysis(profile, confidence_threshold=0.0) for profile in profiles.values()]
+    assert [result["sous_scores"] for result in results] == [analysis["sous_scores"] for analysis in expected]
+
+
+def test_local_analyses_escalate_low_confidence_profiles():
+    confident = {
+        "experiences": [{"title": "Dev", "starts_at": {"year": 2015, "month": 1}}],
+        "education": [{"degree_name": "Master"}],
+        "industry": "Computer Software"
+    }
+    results = scrape_linkedin.local_analyses([confident, {}], confidence_threshold=0.8)
+    assert results[0]["moteur_scoring"] == "local"
+    assert results[1] is None
+    assert scrape_linkedin.local_analyses([confident], detail_level="approfondi") == [None]
@@ -0,0 +1,107 @@
+import pytest
+
+from src import cache as cache_module
+from src.cache import MemoryCache, PersistentCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake.time)
+    return fake
+
+
+def make_cache(tmp_path, **options):
+    return PersistentCache(str(tmp_path / "cache.sqlite3"), "test", **options)
+
+
+def test_set_get_roundtrip(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("profil", {"nom": "Jeanne", "scores": [1, 2.5]})
+    assert cache.get("profil") == {"nom": "Jeanne", "scores": [1, 2.5]}
+    assert cache.get("absent") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_entries_persist_across_instances(tmp_path):
+    make_cache(tmp_path).set("cle", "valeur")
+    assert make_cache(tmp_path).get("cle") == "valeur"
+
+
+def test_expired_entry_is_a_miss_and_removed(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl=60)
+    cache.set("cle", "valeur")
+
+    clock.now += 59
+    assert cache.get("cle") == "valeur"
+
+    clock.now += 2
+    assert cache.get("cle") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2, touch_interval=0)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    # "a" est relu: "b" devient l'entrée la moins récemment utilisée
+    assert cache.get("a") == 1
+    clock.now += 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_access_time_is_not_rewritten_within_touch_interval(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2, touch_interval=60)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    # Lecture trop proche de l'écriture: l'ordre LRU n'est pas modifié
+    assert cache.get("a") == 1
+    clock.now += 1
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_delete_prefix(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("gemini-a:1", 1)
+    cache.set("gemini-a:2", 2)
+    cache.set("gemini-b:1", 3)
+    assert cache.delete_prefix("gemini-a:") == 2
+    assert cache.get("gemini-b:1") == 3
+
+
+def test_invalid_table_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        PersistentCache(str(tmp_path / "cache.sqlite3"), "drop table")
+
+
+def test_memory_cache_returns_copies_and_evicts_lru():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", {"score": 1})
+    cache.get("a")["score"] = 99
+    assert cache.get("a") == {"score": 1}
+
+    cache.set("b", {"score": 2})
+    cache.get("a")
+    cache.set("c", {"score": 3})
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,27 @@
+from scrape_linkedin import gemini_cache_key
+from src.profile_compaction import compact_profile
+
+PROFILE = {
+    "full_name": "Jeanne Martin",
+    "headline": "Data engineer",
+    "experiences": [
+        {"title": "Data engineer", "company": "Acme", "starts_at": {"year": 2019, "month": 3, "day": 1}, "ends_at": None}
+    ]
+}
+
+
+def test_key_ignores_fields_computed_from_todays_date():
+    compacted, _ = compact_profile(PROFILE)
+    next_month = {**compacted, "experience_annees_calculee": compacted["experience_annees_calculee"] + 0.1}
+    assert gemini_cache_key(compacted, "standard") == gemini_cache_key(next_month, "standard")
+
+
+def test_key_changes_with_experiences_detail_level_and_model():
+    compacted, _ = compact_profile(PROFILE)
+    changed_profile = {**PROFILE, "experiences": [{**PROFILE["experiences"][0], "ends_at": {"year": 2024, "month": 1, "day": 1}}]}
+    changed, _ = compact_profile(changed_profile)
+
+    key = gemini_cache_key(compacted, "standard")
+    assert key != gemini_cache_key(changed, "standard")
+    assert key != gemini_cache_key(compacted, "approfondi")
+    assert gemini_cache_key(compacted, "standard", model_name="autre-modele").startswith("autre-modele:")
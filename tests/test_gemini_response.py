@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+import scrape_linkedin
+from scrape_linkedin import gemini_generation_config, parse_gemini_response
+
+ANALYSIS = {
+    "sous_scores": {"experience": 7.5, "education": 8.0, "secteur": 6.25},
+    "justification": "Profil solide.",
+    "details": {"experience_annees": 8, "niveau_education": "Master", "secteur_activite": "Technologie"}
+}
+
+
+def test_structured_json_response():
+    result = parse_gemini_response(json.dumps({**ANALYSIS, "raisonnement": "Étapes..."}))
+    assert result["sous_scores"] == ANALYSIS["sous_scores"]
+    assert result["raisonnement"] == "Étapes..."
+
+
+def test_json_embedded_in_text_keeps_full_text_as_reasoning():
+    text = "Raisonnement:\n1. Expérience solide.\n\n```json\n" + json.dumps(ANALYSIS) + "\n```"
+    result = parse_gemini_response(text)
+    assert result["sous_scores"]["secteur"] == 6.25
+    assert result["details"]["niveau_education"] == "Master"
+    assert result["raisonnement"] == text
+
+
+def test_invalid_json_candidates_are_skipped():
+    text = 'Exemple: {"a": 1} puis {pas du json} et enfin ' + json.dumps(ANALYSIS)
+    assert parse_gemini_response(text)["sous_scores"]["experience"] == 7.5
+
+
+def test_out_of_range_sub_scores_are_clamped():
+    analysis = {**ANALYSIS, "sous_scores": {"experience": 12, "education": -1, "secteur": 5}}
+    assert parse_gemini_response(json.dumps(analysis))["sous_scores"] == {"experience": 10.0, "education": 0.0, "secteur": 5.0}
+
+
+def test_sub_score_lines_are_used_without_json():
+    text = (
+        "Score expérience: 7,5/10\nScore éducation : 8/10\nScore secteur: 6.25 / 10\n"
+        "experience_annees: 8\nniveau_education: Master\n"
+    )
+    result = parse_gemini_response(text)
+    assert result["sous_scores"] == {"experience": 7.5, "education": 8.0, "secteur": 6.25}
+    assert result["details"]["niveau_education"] == "Master"
+    assert result["details"]["secteur_activite"] == "Non déterminé"
+
+
+def test_unparseable_response_is_an_error():
+    result = parse_gemini_response("Score expérience: 7/10 seulement")
+    assert "error" in result and result["raw_response"] == "Score expérience: 7/10 seulement"
+
+
+@pytest.fixture
+def structured_setting(monkeypatch):
+    def configure(enabled):
+        monkeypatch.setattr(scrape_linkedin, "GEMINI_STRUCTURED_OUTPUT", enabled)
+        scrape_linkedin.structured_output_enabled.cache_clear()
+    yield configure
+    scrape_linkedin.structured_output_enabled.cache_clear()
+
+
+def test_structured_output_is_disabled_by_default(structured_setting):
+    structured_setting(False)
+    assert scrape_linkedin.structured_output_enabled() is False
+    assert "response_mime_type" not in gemini_generation_config("standard", structured=False)
+
+
+def test_structured_output_requires_sdk_support(structured_setting):
+    glm = pytest.importorskip("google.ai.generativelanguage")
+    structured_setting(True)
+    supported = "response_mime_type" in glm.GenerationConfig.meta.fields
+    assert scrape_linkedin.structured_output_enabled() is supported
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import http_client
+
+
+class StubServer:
+    """Serveur HTTP local rejouant une suite de réponses (statut, en-têtes), puis 200 avec un corps JSON"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.requests += 1
+                status, headers = stub.responses.pop(0) if stub.responses else (200, {})
+                body = json.dumps({"tentative": stub.requests}).encode("utf-8") if status == 200 else b"indisponible"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json" if status == 200 else "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        self.url = "http://127.0.0.1:%d/profil" % self._server.server_address[1]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(*responses):
+        servers.append(StubServer(responses))
+        return servers[-1]
+
+    yield start
+    http_client.close_session()
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    """Délais de backoff calculés, sans réelle attente entre les tentatives"""
+    computed = []
+    backoff_delay = http_client.backoff_delay
+
+    def record(attempt, retry_after=None):
+        computed.append((attempt, retry_after, backoff_delay(attempt, retry_after)))
+        return 0
+
+    monkeypatch.setattr(http_client, "backoff_delay", record)
+    return computed
+
+
+def test_retry_after_is_respected_before_retrying(stub_server, delays):
+    server = stub_server((429, {"Retry-After": "7"}))
+    response = http_client.get(server.url)
+
+    assert response.status_code == 200 and response.json() == {"tentative": 2}
+    [(attempt, retry_after, delay)] = delays
+    assert (attempt, retry_after) == (0, "7") and delay >= 7
+
+
+def test_server_error_is_retried(stub_server, delays):
+    server = stub_server((503, {}))
+    assert http_client.get(server.url).status_code == 200
+    assert server.requests == 2
+    assert [(attempt, retry_after) for attempt, retry_after, _ in delays] == [(0, None)]
+
+
+def test_exhausted_retries_return_the_last_response(stub_server, delays):
+    server = stub_server(*[(503, {})] * 5)
+    response = http_client.get(server.url, max_retries=2)
+
+    assert response.status_code == 503
+    assert server.requests == 3
+    assert [attempt for attempt, _, _ in delays] == [0, 1]
+
+
+def test_backoff_delay_is_capped(monkeypatch):
+    monkeypatch.setattr(http_client, "HTTP_BACKOFF_MAX", 2.0)
+    assert all(0 <= http_client.backoff_delay(10) <= 2.0 for _ in range(50))
+    assert http_client.backoff_delay(0, "3600") == 2.0
+    assert http_client.backoff_delay(0, "Wed, 21 Oct 2026 07:28:00 GMT") <= 2.0
+
+
+def _get_json(url, **kwargs):
+    async def run():
+        try:
+            return await http_client.get_json_async(url, **kwargs)
+        finally:
+            await http_client.close_async_session()
+
+    return asyncio.run(run())
+
+
+def test_async_retry_after_is_respected_before_retrying(stub_server, delays):
+    server = stub_server((429, {"Retry-After": "7"}))
+    assert _get_json(server.url) == (200, {"tentative": 2})
+    [(attempt, retry_after, delay)] = delays
+    assert (attempt, retry_after) == (0, "7") and delay >= 7
+
+
+def test_async_server_error_is_retried(stub_server, delays):
+    server = stub_server((503, {}))
+    assert _get_json(server.url) == (200, {"tentative": 2})
+    assert len(delays) == 1
+
+
+def test_async_exhausted_retries_return_the_last_response(stub_server, delays):
+    server = stub_server(*[(503, {})] * 5)
+    # Corps non JSON de la dernière réponse: contenu None
+    assert _get_json(server.url, max_retries=2) == (503, None)
+    assert server.requests == 3
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from src.job_queue import DONE, FAILED, PENDING, RUNNING, JobQueue
+
+
+def wait_for(queue, job_id, statuses=(DONE, FAILED), timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Tâche {job_id} toujours à l'état {queue.get(job_id)['status']}")
+
+
+def test_job_result_and_progress_are_stored(tmp_path):
+    def handler(params, report_progress):
+        for done in range(1, params["count"] + 1):
+            report_progress(done, params["count"])
+        return {"total": params["count"] * 2}
+
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {"double": handler}, workers=1, poll_interval=0.05)
+    queue.start()
+    job_id = queue.submit("double", {"count": 3})
+
+    job = wait_for(queue, job_id)
+    assert job["status"] == DONE
+    assert job["result"] == {"total": 6}
+    assert job["params"] == {"count": 3}
+    assert (job["progress_done"], job["progress_total"]) == (3, 3)
+    assert job["started_at"] <= job["finished_at"]
+
+
+def test_handler_exception_marks_the_job_failed(tmp_path):
+    def handler(params, report_progress):
+        raise RuntimeError("profil introuvable")
+
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {"profile": handler}, workers=1, poll_interval=0.05)
+    queue.start()
+    job = wait_for(queue, queue.submit("profile", {}))
+    assert job["status"] == FAILED
+    assert job["error"] == "profil introuvable"
+    assert job["result"] is None
+
+
+def test_unknown_kind_and_unknown_id(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {"profile": lambda params, report: None})
+    with pytest.raises(ValueError):
+        queue.submit("bulk", {})
+    assert queue.get("absent") is None
+
+
+def test_jobs_run_in_submission_order(tmp_path):
+    order = []
+    queue = JobQueue(
+        str(tmp_path / "jobs.sqlite3"),
+        {"record": lambda params, report: order.append(params["index"])},
+        workers=1,
+        poll_interval=0.05
+    )
+    job_ids = [queue.submit("record", {"index": index}) for index in range(5)]
+    assert queue.get(job_ids[0])["status"] == PENDING
+
+    queue.start()
+    wait_for(queue, job_ids[-1])
+    assert order == list(range(5))
+
+
+def test_restart_requeues_jobs_left_running(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    crashed = JobQueue(path, {"profile": lambda params, report: None})
+    job_id = crashed.submit("profile", {"url": "https://www.linkedin.com/in/jeanne"})
+    # Tâche prise en charge par un worker puis interrompue par l'arrêt du processus
+    crashed._claim()
+    assert crashed.get(job_id)["status"] == RUNNING
+
+    finished = threading.Event()
+
+    def handler(params, report_progress):
+        finished.set()
+        return params["url"]
+
+    restarted = JobQueue(path, {"profile": handler}, workers=1, poll_interval=0.05)
+    restarted.start()
+    job = wait_for(restarted, job_id)
+    assert finished.is_set()
+    assert job["status"] == DONE
+    assert job["result"] == "https://www.linkedin.com/in/jeanne"
@@ -0,0 +1,56 @@
+import random
+import re
+
+from src.keyword_automaton import KeywordAutomaton
+from src.scoring_system import fold_text, normalize_degree, sector_votes
+
+
+def naive_find(keywords, text):
+    """Recherche de référence: chaque mot-clé, mot entier, par expression régulière"""
+    return sorted(
+        (match.start(), label)
+        for keyword, label in keywords
+        for match in re.finditer(rf"(?<![^\W_])(?={re.escape(keyword)}(?![^\W_]))", text)
+    )
+
+
+def test_overlapping_keywords_with_shared_suffixes():
+    keywords = [("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers")]
+    automaton = KeywordAutomaton(keywords)
+    # Les sorties via les liens d'échec ("he" dans "she") ne sont retenues que pour des mots entiers
+    assert automaton.find("she said hers, not his; he agreed") == [(0, "she"), (9, "hers"), (19, "his"), (24, "he")]
+    assert automaton.find("ushers") == []
+
+
+def test_whole_words_only():
+    automaton = KeywordAutomaton([("ia", "Technologie"), ("it", "Technologie")])
+    assert automaton.find("media and digital") == []
+    assert automaton.find("ia/it") == [(0, "Technologie"), (3, "Technologie")]
+
+
+def test_nested_multi_word_keywords_are_all_reported_in_text_order():
+    automaton = KeywordAutomaton([("data", "data"), ("data engineer", "data engineer"), ("engineer", "engineer")])
+    # Occurrences triées par position de fin; à fin égale, le mot-clé le plus long d'abord
+    assert automaton.find("senior data engineer") == [(7, "data"), (7, "data engineer"), (12, "engineer")]
+
+
+def test_matches_naive_search_on_random_texts():
+    rng = random.Random(0)
+    alphabet = "abh e"
+    keywords = [("".join(rng.choice("abh") for _ in range(rng.randint(1, 4))), f"k{i}") for i in range(30)]
+    automaton = KeywordAutomaton(keywords)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert sorted(automaton.find(text)) == naive_find(keywords, text)
+
+
+def test_empty_automaton_and_text():
+    assert KeywordAutomaton([]).find("anything") == []
+    assert KeywordAutomaton([("bac", "Baccalauréat")]).find("") == []
+
+
+def test_scoring_tables_use_folded_text():
+    assert normalize_degree("Diplôme d'Ingénieur") == "Master"
+    assert normalize_degree("Doctorat en Médecine") == "Doctorat"
+    assert normalize_degree("Formation continue") == "Aucun"
+    assert sector_votes(fold_text("Ingénieur logiciel, Banque"))["Technologie"] >= 1
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import scrape_linkedin
+from conftest import ROOT
+
+
+@pytest.mark.parametrize("module", ["scrape_linkedin", "main"])
+def test_import_creates_no_files(module, tmp_path):
+    env = {key: value for key, value in os.environ.items() if key != "CACHE_PATH"}
+    env.update(PYTHONDONTWRITEBYTECODE="1", PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=tmp_path, env=env, check=True)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_caches_are_created_once():
+    assert scrape_linkedin.gemini_cache() is scrape_linkedin.gemini_cache()
+    assert scrape_linkedin.proxycurl_cache() is not scrape_linkedin.gemini_cache()
+    assert scrape_linkedin.gemini_cache().path == scrape_linkedin.CACHE_PATH
@@ -0,0 +1,48 @@
+import pytest
+
+from src.linkedin_url import canonical_profile_url, dedupe_profile_urls, is_profile_url, profile_key, profile_slug
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.linkedin.com/in/jean-dupont/",
+    "http://linkedin.com/in/Jean-Dupont",
+    "fr.linkedin.com/in/jean-dupont?originalSubdomain=fr",
+    "  https://m.linkedin.com/in/jean-dupont/details/experience/  ",
+    "https://www.linkedin.com/in/jean-dupont#about"
+])
+def test_variants_share_the_canonical_url(url):
+    assert canonical_profile_url(url) == "https://www.linkedin.com/in/jean-dupont/"
+
+
+def test_percent_encoded_slug_is_decoded():
+    assert profile_slug("https://www.linkedin.com/in/b%C3%A9atrice-martin/") == "béatrice-martin"
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    None,
+    "https://www.linkedin.com/company/openai/",
+    "https://example.com/in/jean-dupont",
+    "https://www.linkedin.com/in/"
+])
+def test_non_profile_urls_are_rejected(url):
+    assert not is_profile_url(url)
+    assert canonical_profile_url(url) is None
+
+
+def test_profile_key_falls_back_to_stripped_url():
+    assert profile_key("  https://example.com/x ") == "https://example.com/x"
+
+
+def test_dedupe_groups_variants_in_first_seen_order():
+    urls = [
+        "https://fr.linkedin.com/in/Jean-Dupont",
+        "https://www.linkedin.com/in/paul-martin/",
+        "linkedin.com/in/jean-dupont?trk=abc",
+        "https://example.com/other"
+    ]
+    assert dedupe_profile_urls(urls) == [
+        ("https://www.linkedin.com/in/jean-dupont/", [0, 2]),
+        ("https://www.linkedin.com/in/paul-martin/", [1]),
+        ("https://example.com/other", [3])
+    ]
@@ -0,0 +1,46 @@
+import pytest
+
+main = pytest.importorskip("main")
+
+
+def test_resume_requires_batch_input(tmp_path):
+    with pytest.raises(SystemExit):
+        main.parse_args(["https://www.linkedin.com/in/jean-dupont/", "--resume", str(tmp_path / "r.jsonl")])
+
+
+def test_retry_failed_requires_resume(tmp_path):
+    with pytest.raises(SystemExit):
+        main.parse_args(["--file", "urls.txt", "--retry-failed"])
+
+
+def test_resume_rejects_non_jsonl_file(tmp_path):
+    results = tmp_path / "results.json"
+    results.write_text('[\n  {"url": "a", "success": true}\n]\n', encoding="utf-8")
+    with pytest.raises(SystemExit):
+        main.parse_args(["--file", "urls.txt", "--resume", str(results)])
+
+
+def test_resume_accepts_jsonl_file(tmp_path):
+    results = tmp_path / "results.jsonl"
+    results.write_text('{"url": "a", "success": true}\n', encoding="utf-8")
+    args = main.parse_args(["--file", "urls.txt", "--resume", str(results), "--retry-failed"])
+    assert args.resume == str(results) and args.retry_failed
+
+
+def test_tiered_requires_proxycurl_engine():
+    with pytest.raises(SystemExit):
+        main.parse_args(["--file", "urls.txt", "--tiered"])
+    args = main.parse_args(["--file", "urls.txt", "--engine", "proxycurl", "--tiered", "0.7"])
+    assert args.tiered == 0.7
+
+
+def test_tier_counts_count_each_profile_once():
+    local = {"success": True, "analysis": {"moteur_scoring": "local"}}
+    gemini = {"success": True, "analysis": {"moteur_scoring": "gemini"}}
+    results = [
+        {**local, "url": "https://www.linkedin.com/in/jean-dupont/"},
+        {**local, "url": "linkedin.com/in/Jean-Dupont?trk=public_profile"},
+        {**gemini, "url": "https://www.linkedin.com/in/marie-curie/"},
+        {"success": False, "url": "https://www.linkedin.com/in/inconnu/"},
+    ]
+    assert main._tier_counts(results) == {"local": 1, "gemini": 1, "escalation_rate": 0.5}
@@ -0,0 +1,128 @@
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src import metrics
+from src.metrics import MetricsRegistry, StageTimings
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("duree_seconds", "Durée", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, stage="gemini")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP duree_seconds Durée", "# TYPE duree_seconds histogram"]
+    assert lines[2:] == [
+        'duree_seconds_bucket{stage="gemini",le="0.1"} 1',
+        'duree_seconds_bucket{stage="gemini",le="1"} 3',
+        'duree_seconds_bucket{stage="gemini",le="+Inf"} 4',
+        'duree_seconds_sum{stage="gemini"} 4.25',
+        'duree_seconds_count{stage="gemini"} 4',
+    ]
+
+
+def test_counter_labels_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("erreurs_total", "Erreurs")
+    counter.inc(reason='chemin "C:\\tmp"\nsuite')
+    counter.inc(2, reason='chemin "C:\\tmp"\nsuite')
+
+    assert registry.render().splitlines()[-1] == 'erreurs_total{reason="chemin \\"C:\\\\tmp\\"\\nsuite"} 3'
+
+
+def test_collectors_with_the_same_name_are_merged():
+    registry = MetricsRegistry()
+    for name in ("proxycurl", "gemini"):
+        registry.register_collector(lambda name=name: [("entrees", "gauge", "Entrées", [("entrees", (("cache", name),), 1)])])
+
+    assert registry.render().count("# TYPE entrees gauge") == 1
+    assert 'entrees{cache="gemini"} 1' in registry.render()
+
+
+def test_stages_are_attributed_to_the_profile_of_each_thread():
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def process(name):
+        timings = StageTimings()
+        with metrics.track_stages(timings):
+            # Les deux threads mesurent leurs étapes en même temps
+            barrier.wait()
+            with metrics.stage(name):
+                pass
+            with metrics.stage("parsing"):
+                pass
+        results[name] = timings
+
+    threads = [threading.Thread(target=process, args=(name,)) for name in ("proxycurl", "gemini")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(results["proxycurl"].stages) == {"proxycurl", "parsing"}
+    assert set(results["gemini"].stages) == {"gemini", "parsing"}
+
+
+def test_stage_outside_tracking_is_only_recorded_in_the_histogram():
+    timings = StageTimings()
+    with metrics.track_stages(timings):
+        with metrics.track_stages(None):
+            with metrics.stage("gemini_lot"):
+                pass
+        with metrics.stage("cache"):
+            pass
+
+    assert set(timings.stages) == {"cache"}
+    assert 'linkedin_stage_duration_seconds_count{stage="gemini_lot"}' in metrics.REGISTRY.render()
+
+
+def test_iterate_tracked_restores_the_caller_context():
+    timings = StageTimings()
+
+    def stream():
+        with metrics.stage("gemini"):
+            yield "fragment"
+
+    for _ in metrics.iterate_tracked(stream(), timings):
+        with metrics.stage("affichage"):
+            pass
+
+    assert set(timings.stages) == {"gemini"}
+
+
+@pytest.fixture
+def metrics_server(monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = metrics.start_metrics_server(port, "127.0.0.1")
+    yield f"http://127.0.0.1:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_metrics_server_exposes_the_registry(metrics_server):
+    metrics.HTTP_RETRIES.inc(host="exemple.test", reason=503)
+    with urllib.request.urlopen(metrics_server + "/metrics?format=text", timeout=5) as response:
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.read().decode("utf-8")
+    assert 'linkedin_http_retries_total{host="exemple.test",reason="503"}' in body
+
+
+def test_metrics_server_rejects_other_paths(metrics_server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(metrics_server + "/", timeout=5)
+    assert error.value.code == 404
+
+
+def test_metrics_server_is_disabled_without_port(monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    assert metrics.start_metrics_server(0) is None
@@ -0,0 +1,60 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+import scrape_linkedin
+
+PROFILE = {"full_name": "Jeanne Martin", "experiences": []}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+        self.headers = {}
+        self.request = type("Request", (), {"url": "https://proxycurl.test"})()
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+@pytest.fixture
+def url():
+    # URL propre à chaque test: les réponses valides sont mises en cache
+    return f"https://www.linkedin.com/in/extraction-{uuid.uuid4().hex}/"
+
+
+@pytest.mark.parametrize("status", [404, 429, 503])
+def test_sync_extraction_rejects_error_responses(monkeypatch, url, status):
+    monkeypatch.setattr(scrape_linkedin.http_client, "get", lambda *args, **kwargs: FakeResponse(status, {"code": status, "description": "Erreur"}))
+    assert scrape_linkedin.extract_linkedin_data(url) is None
+    assert scrape_linkedin.proxycurl_cache().get(scrape_linkedin.profile_key(url)) is None
+
+
+def test_sync_extraction_returns_and_caches_profiles(monkeypatch, url):
+    monkeypatch.setattr(scrape_linkedin.http_client, "get", lambda *args, **kwargs: FakeResponse(200, PROFILE))
+    assert scrape_linkedin.extract_linkedin_data(url) == PROFILE
+    assert scrape_linkedin.proxycurl_cache().get(scrape_linkedin.profile_key(url)) == PROFILE
+
+
+@pytest.mark.parametrize("status", [404, 429, 503])
+def test_async_extraction_rejects_error_responses(monkeypatch, url, status):
+    async def fake_get_json_async(*args, **kwargs):
+        return status, {"code": status, "description": "Erreur"}
+
+    monkeypatch.setattr(scrape_linkedin.http_client, "get_json_async", fake_get_json_async)
+    assert asyncio.run(scrape_linkedin.extract_linkedin_data_async(url)) is None
+    assert scrape_linkedin.proxycurl_cache().get(scrape_linkedin.profile_key(url)) is None
+
+
+def test_async_pipeline_fails_on_not_found(monkeypatch, url):
+    async def fake_get_json_async(*args, **kwargs):
+        return 404, {"code": 404, "description": "Person not found"}
+
+    monkeypatch.setattr(scrape_linkedin.http_client, "get_json_async", fake_get_json_async)
+    # Le profil n'est ni analysé ni compté comme réussi (main.py: success=False, repris par --resume)
+    with pytest.raises(Exception, match="Impossible d'extraire"):
+        asyncio.run(scrape_linkedin.process_linkedin_profile_async(url))
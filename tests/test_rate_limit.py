@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+from src.rate_limit import AsyncTokenBucket
+
+
+def run_acquires(bucket: AsyncTokenBucket, count: int) -> float:
+    async def acquire_all() -> None:
+        await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+
+    started = time.monotonic()
+    asyncio.run(acquire_all())
+    return time.monotonic() - started
+
+
+def test_burst_up_to_capacity_is_immediate():
+    assert run_acquires(AsyncTokenBucket(rate=10, capacity=5), 5) < 0.05
+
+
+def test_requests_beyond_capacity_wait_for_refill():
+    # 1 jeton disponible puis 20 jetons/seconde: 4 requêtes supplémentaires ≈ 0.2 s
+    elapsed = run_acquires(AsyncTokenBucket(rate=20, capacity=1), 5)
+    assert 0.18 <= elapsed < 0.5
+
+
+def test_zero_rate_is_unlimited():
+    assert run_acquires(AsyncTokenBucket(rate=0), 100) < 0.05
+
+
+def test_set_rate_changes_throughput():
+    bucket = AsyncTokenBucket(rate=1, capacity=1)
+    bucket.set_rate(0)
+    assert run_acquires(bucket, 10) < 0.05
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from src.results_writer import JsonlResultsWriter, load_checkpoint, validate_jsonl_file
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_writer_appends_one_line_per_result_and_summary(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    with JsonlResultsWriter(path, fsync_every=1) as writer:
+        writer.write({"url": "a", "success": True})
+        writer.write({"url": "b", "success": False})
+        writer.close(summary={"total": 2})
+
+    assert read_lines(path) == [
+        {"url": "a", "success": True},
+        {"url": "b", "success": False},
+        {"summary": {"total": 2}}
+    ]
+
+
+def test_append_after_truncated_line_starts_a_new_line(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"url": "a", "success": true}\n{"url": "b", "succ', encoding="utf-8")
+
+    with JsonlResultsWriter(str(path), append=True) as writer:
+        writer.write({"url": "c", "success": True})
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1]) == {"url": "c", "success": True}
+
+
+def test_load_checkpoint_indexes_successes_and_failures(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        "\n".join([
+            '{"url": "a", "success": true}',
+            '{"url": "b", "success": false}',
+            '{"url": "c", "success": false}',
+            '{"url": "c", "success": true}',
+            '{"summary": {"total": 3}}',
+            '{"url": "d", "succ'
+        ]),
+        encoding="utf-8"
+    )
+
+    succeeded, failed = load_checkpoint(str(path))
+    assert succeeded == {"a", "c"}
+    assert failed == {"b"}
+
+
+def test_load_checkpoint_missing_file(tmp_path):
+    assert load_checkpoint(str(tmp_path / "absent.jsonl")) == (set(), set())
+
+
+def test_validate_jsonl_accepts_missing_empty_and_truncated_files(tmp_path):
+    validate_jsonl_file(str(tmp_path / "absent.jsonl"))
+
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text("", encoding="utf-8")
+    validate_jsonl_file(str(empty))
+
+    truncated = tmp_path / "truncated.jsonl"
+    truncated.write_text('{"url": "a", "success": true}\n{"url": "b", "succ', encoding="utf-8")
+    validate_jsonl_file(str(truncated))
+
+
+@pytest.mark.parametrize("content", [
+    '[\n  {"url": "a", "success": true}\n]\n',
+    "https://www.linkedin.com/in/jean-dupont/\n",
+    '{"url": "a"}\nnot json\n{"url": "b"}\n',
+    '["a", "b"]\n'
+])
+def test_validate_jsonl_rejects_other_formats(tmp_path, content):
+    path = tmp_path / "results.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        validate_jsonl_file(str(path))
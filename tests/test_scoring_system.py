@@ -0,0 +1,126 @@
+import random
+from datetime import date
+
+import pytest
+
+from src.scoring_system import (
+    ProfileScorer,
+    batch_years_of_experience,
+    experience_intervals,
+    normalize_degree_column,
+    years_of_experience
+)
+
+TODAY = date(2024, 6, 15)
+
+
+def role(start, end=None):
+    """Poste Proxycurl daté au mois: start/end = (année, mois), end=None pour un poste en cours"""
+    dated = lambda value: {"year": value[0], "month": value[1], "day": 1} if value else None
+    return {"title": "Poste", "starts_at": dated(start), "ends_at": dated(end)}
+
+
+def test_intervals_are_half_open_months_and_skip_undated_roles():
+    experiences = [role((2020, 1), (2020, 12)), {"title": "Sans date", "starts_at": None}]
+    assert experience_intervals(experiences, TODAY) == [(2020 * 12, 2020 * 12 + 12)]
+
+
+def test_disjoint_roles_add_up():
+    experiences = [role((2010, 1), (2011, 12)), role((2015, 1), (2015, 12))]
+    assert years_of_experience(experiences, TODAY) == 3.0
+
+
+def test_overlapping_roles_are_counted_once():
+    experiences = [role((2018, 1), (2020, 12)), role((2019, 1), (2019, 12)), role((2020, 7), (2021, 12))]
+    assert years_of_experience(experiences, TODAY) == 4.0
+
+
+def test_open_ended_role_runs_to_the_reference_month():
+    experiences = [role((2022, 7)), role((2023, 1), (2023, 6))]
+    assert years_of_experience(experiences, TODAY) == 2.0
+
+
+def test_end_before_start_counts_a_single_month():
+    assert years_of_experience([role((2020, 6), (2019, 1))], TODAY) == 0.1
+
+
+def test_no_dated_roles():
+    assert years_of_experience([], TODAY) == 0.0
+    assert years_of_experience([{"title": "Stage"}], TODAY) == 0.0
+
+
+def test_scorer_uses_merged_experience():
+    profile = {
+        "experiences": [role((2000, 1), (2009, 12)), role((2005, 1), (2014, 12))],
+        "education": [{"degree_name": "MSc Computer Science"}],
+        "industry": "Computer Software"
+    }
+    result = ProfileScorer().calculate_score(profile)
+    assert result["details"]["experience_annees"] == 15.0
+    assert result["scores"]["experience"] == 10.0
+    assert result["details"]["niveau_education"] == "Master"
+
+
+def random_experiences(rng):
+    experiences = []
+    for _ in range(rng.randint(0, 6)):
+        start = (rng.randint(1995, 2024), rng.randint(1, 12))
+        # Postes en cours, terminés, ou datés à l'envers
+        end = rng.choice([None, (start[0] + rng.randint(-1, 8), rng.randint(1, 12))])
+        experiences.append(role(start, end) if rng.random() > 0.1 else {"title": "Sans date"})
+    return experiences
+
+
+def test_batch_pass_matches_scalar_on_overlapping_and_open_ended_roles():
+    profiles = [
+        [role((2018, 1), (2020, 12)), role((2019, 1), (2019, 12)), role((2020, 7), (2021, 12))],
+        [role((2022, 7)), role((2023, 1), (2023, 6))],
+        [],
+        [role((2010, 1), (2011, 12)), role((2015, 1))],
+        [role((2020, 6), (2019, 1))]
+    ]
+    rng = random.Random(0)
+    profiles += [random_experiences(rng) for _ in range(500)]
+
+    batch = batch_years_of_experience(profiles, TODAY)
+    assert list(batch[:5]) == [4.0, 2.0, 0.0, 11.5, 0.1]
+    assert [float(years) for years in batch] == [years_of_experience(experiences, TODAY) for experiences in profiles]
+
+
+def test_batch_pass_without_dated_roles():
+    assert list(batch_years_of_experience([[], [{"title": "Stage"}]], TODAY)) == [0.0, 0.0]
+    assert len(batch_years_of_experience([], TODAY)) == 0
+
+
+def test_calculate_scores_matches_calculate_score():
+    rng = random.Random(1)
+    profiles = [
+        {"experiences": random_experiences(rng), "education": [{"degree_name": "Licence"}], "industry": "Banking"}
+        for _ in range(50)
+    ]
+    scorer = ProfileScorer(0.5, 0.25, 0.25)
+    assert scorer.calculate_scores(profiles) == [scorer.calculate_score(profile) for profile in profiles]
+
+
+def test_normalize_degree_column_per_row_and_per_profile():
+    pd = pytest.importorskip("pandas")
+    degrees = pd.Series(["MSc Computer Science", "Baccalauréat S", None, "PhD Physics", "Diplôme d'Ingénieur", "Stage"])
+    profiles = pd.Series(["a", "a", "b", "c", "c", "d"])
+
+    assert list(normalize_degree_column(degrees)) == ["Master", "Baccalauréat", "Aucun", "Doctorat", "Master", "Aucun"]
+    assert normalize_degree_column(degrees, by=profiles).to_dict() == {
+        "a": "Master", "b": "Aucun", "c": "Doctorat", "d": "Aucun"
+    }
+
+
+def test_normalize_degree_column_parses_each_distinct_degree_once(monkeypatch):
+    pd = pytest.importorskip("pandas")
+    from src import scoring_system
+
+    parsed = []
+    normalize_degree = scoring_system.normalize_degree
+    monkeypatch.setattr(scoring_system, "normalize_degree", lambda degree: parsed.append(degree) or normalize_degree(degree))
+
+    levels = normalize_degree_column(pd.Series(["Master", "Licence", "Master"] * 100))
+    assert sorted(parsed) == ["Licence", "Master"]
+    assert list(levels[:3]) == ["Master", "Licence", "Master"]
@@ -0,0 +1,165 @@
+import asyncio
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import scrape_linkedin
+from src.cache import SingleFlight
+
+PROFILE = {"full_name": "Jeanne Martin", "headline": "Data engineer", "experiences": []}
+
+ANALYSIS = {
+    "sous_scores": {"experience": 6.0, "education": 9.0, "secteur": 9.0},
+    "justification": "Analyse de test.",
+    "details": {"experience_annees": 6, "niveau_education": "Master", "secteur_activite": "Technologie"}
+}
+
+
+def test_followers_share_the_leader_result():
+    flight = SingleFlight()
+    future, leader = flight.begin("clé")
+    joined, follower = flight.begin("clé")
+    assert leader and not follower and joined is future
+
+    flight.finish("clé", future, 42)
+    assert joined.result() == 42
+    # Calcul terminé: un nouvel appel redevient meneur
+    assert flight.begin("clé")[1] and len(flight) == 1
+
+
+def test_leader_exception_reaches_followers():
+    flight = SingleFlight()
+    future, _ = flight.begin("clé")
+    joined, _ = flight.begin("clé")
+    flight.finish("clé", future, exception=RuntimeError("échec"))
+    with pytest.raises(RuntimeError):
+        joined.result()
+    assert len(flight) == 0
+
+
+def test_concurrent_threads_call_gemini_once(monkeypatch):
+    calls = []
+
+    def fake_generate(profile_data, detail_level):
+        calls.append(profile_data)
+        time.sleep(0.2)
+        return copy.deepcopy(ANALYSIS)
+
+    monkeypatch.setattr(scrape_linkedin, "_generate_gemini_analysis", fake_generate)
+    weights = [(0.4, 0.3, 0.3), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)]
+    with ThreadPoolExecutor(max_workers=len(weights)) as executor:
+        results = list(executor.map(
+            lambda w: scrape_linkedin.analyze_with_gemini(PROFILE, *w, use_cache=False), weights
+        ))
+
+    assert len(calls) == 1
+    # Chaque appelant reçoit sa propre copie, pondérée selon ses paramètres
+    assert [result["score"] for result in results[1:]] == [6.0, 9.0, 9.0]
+    assert len({id(result) for result in results}) == len(results)
+    assert len(scrape_linkedin.gemini_in_flight) == 0
+
+
+def test_concurrent_tasks_call_gemini_once(monkeypatch):
+    calls = []
+
+    async def fake_generate(profile_data, detail_level):
+        calls.append(profile_data)
+        await asyncio.sleep(0.05)
+        return copy.deepcopy(ANALYSIS)
+
+    monkeypatch.setattr(scrape_linkedin, "_generate_gemini_analysis_async", fake_generate)
+
+    async def run():
+        return await asyncio.gather(*(
+            scrape_linkedin.analyze_with_gemini_async(PROFILE, use_cache=False) for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert {result["score"] for result in results} == {results[0]["score"]}
+    assert len(scrape_linkedin.gemini_in_flight) == 0
+
+
+def test_cancelled_follower_does_not_cancel_the_shared_analysis(monkeypatch):
+    release = threading.Event()
+
+    async def fake_generate(profile_data, detail_level):
+        await asyncio.to_thread(release.wait, 1)
+        return copy.deepcopy(ANALYSIS)
+
+    monkeypatch.setattr(scrape_linkedin, "_generate_gemini_analysis_async", fake_generate)
+
+    async def run():
+        leader = asyncio.create_task(scrape_linkedin.analyze_with_gemini_async(PROFILE, use_cache=False))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(scrape_linkedin.analyze_with_gemini_async(PROFILE, use_cache=False))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        release.set()
+        return await leader
+
+    assert asyncio.run(run())["sous_scores"] == ANALYSIS["sous_scores"]
+
+
+STREAMED_TEXT = "Score expérience: 6/10\nScore éducation: 9/10\nScore secteur: 9/10\nniveau_education: Master\n"
+
+
+class FakeStreamingModel:
+    """Modèle Gemini simulé renvoyant sa réponse en fragments successifs"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        return (SimpleNamespace(text=line, usage_metadata=None) for line in STREAMED_TEXT.splitlines(keepends=True))
+
+
+@pytest.fixture
+def streaming_model(monkeypatch):
+    model = FakeStreamingModel()
+    monkeypatch.setattr(scrape_linkedin, "gemini_model", lambda *args, **kwargs: model)
+    return model
+
+
+def _wait_for_follower():
+    # Laisse au second appel le temps de rejoindre l'analyse en cours
+    time.sleep(0.1)
+
+
+def test_streaming_follower_receives_a_single_result(streaming_model):
+    leader = scrape_linkedin.stream_gemini_analysis(PROFILE, use_cache=False)
+    assert next(leader)[0] == "text"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        follower = executor.submit(lambda: list(scrape_linkedin.stream_gemini_analysis(PROFILE, 1.0, 0.0, 0.0, use_cache=False)))
+        _wait_for_follower()
+        leader_events = list(leader)
+        follower_events = follower.result(timeout=5)
+
+    assert streaming_model.calls == 1
+    assert leader_events[-1][0] == "result"
+    assert [kind for kind, _ in follower_events] == ["result"]
+    assert follower_events[0][1]["score"] == 6.0
+    assert len(scrape_linkedin.gemini_in_flight) == 0
+
+
+def test_abandoned_stream_is_taken_over_by_a_follower(streaming_model):
+    leader = scrape_linkedin.stream_gemini_analysis(PROFILE, use_cache=False)
+    next(leader)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        follower = executor.submit(lambda: list(scrape_linkedin.stream_gemini_analysis(PROFILE, use_cache=False)))
+        _wait_for_follower()
+        leader.close()
+        follower_events = follower.result(timeout=5)
+
+    # Le second appel relance l'analyse et la diffuse lui-même
+    assert streaming_model.calls == 2
+    assert follower_events[0][0] == "text"
+    assert follower_events[-1][1]["sous_scores"] == ANALYSIS["sous_scores"]
+    assert len(scrape_linkedin.gemini_in_flight) == 0
@@ -0,0 +1,25 @@
+import logging
+
+import scrape_linkedin
+
+
+def test_local_analysis_escalation_is_logged_not_printed(capsys, caplog):
+    with caplog.at_level(logging.INFO, logger="scrape_linkedin"):
+        assert scrape_linkedin.local_analysis({}, confidence_threshold=1.0) is None
+
+    assert capsys.readouterr().out == ""
+    assert "Confiance du scoring local insuffisante" in caplog.text
+
+
+def test_cached_gemini_analysis_keeps_stdout_clean(capsys, caplog):
+    profile = {"full_name": "Jeanne Martin", "experiences": []}
+    compacted, _ = scrape_linkedin.compact_profile(profile)
+    cache_key = scrape_linkedin.gemini_cache_key(compacted, "standard")
+    scrape_linkedin.gemini_cache().set(cache_key, {"score": 6, "sous_scores": {"experience": 6, "education": 6, "secteur": 6}})
+
+    with caplog.at_level(logging.INFO, logger="scrape_linkedin"):
+        result = scrape_linkedin.analyze_with_gemini(profile)
+
+    assert result["score"] == 6
+    assert capsys.readouterr().out == ""
+    assert "Analyse trouvée dans le cache" in caplog.text